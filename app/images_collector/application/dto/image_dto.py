@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, List, Optional
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, TypeAdapter
+
+from ...domain.models.image import Image
 
 
 class ImageDTO(BaseModel):
@@ -11,4 +13,50 @@ class ImageDTO(BaseModel):
     file_name: Optional[str] = None
     content_type: Optional[str] = None
     size: Optional[int] = None
-    created_at: Optional[datetime] = None
\ No newline at end of file
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_entity(cls, image: Image) -> "ImageDTO":
+        """
+        Construye el DTO a partir de una entidad ya persistida.
+
+        Los datos del repositorio ya fueron validados al entrar al sistema,
+        por lo que se omite la validación (en especial la de `HttpUrl`).
+        """
+        return cls.model_construct(
+            id=image.id,
+            url=image.url,
+            file_name=image.file_name,
+            content_type=image.content_type,
+            size=image.size,
+            created_at=image.created_at
+        )
+
+
+class ImagePageDTO(BaseModel):
+    """DTO para una página de resultados paginada por cursor."""
+    items: List[ImageDTO]
+    next_cursor: Optional[str] = None
+
+
+# Adaptadores precompilados para serializar DTOs sin revalidarlos
+image_adapter = TypeAdapter(ImageDTO)
+image_list_adapter = TypeAdapter(List[ImageDTO])
+image_page_adapter = TypeAdapter(ImagePageDTO)
+
+
+def dump_image_json(image: ImageDTO) -> bytes:
+    """Serializa un DTO directamente a bytes JSON."""
+    return image_adapter.dump_json(image, warnings=False)
+
+
+def dump_images_json(images: Iterable[ImageDTO]) -> bytes:
+    """Serializa una lista de DTOs directamente a bytes JSON."""
+    # Los DTOs creados con `from_entity` guardan la URL como `str`;
+    # se silencian los avisos del serializador porque el valor es el esperado
+    return image_list_adapter.dump_json(list(images), warnings=False)
+
+
+def dump_image_page_json(page: ImagePageDTO) -> bytes:
+    """Serializa una página de resultados directamente a bytes JSON."""
+    return image_page_adapter.dump_json(page, warnings=False)
\ No newline at end of file
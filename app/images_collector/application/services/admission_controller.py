@@ -0,0 +1,93 @@
+import asyncio
+import contextlib
+import math
+import time
+from typing import Any, AsyncIterator, Dict
+
+
+class AdmissionRejected(Exception):
+    """La operación no se admitió: el límite de concurrencia y la cola están llenos."""
+    
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        # Segundos sugeridos al cliente antes de reintentar
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Acota las recolecciones simultáneas del proceso y la cola de espera.
+    
+    Hasta `max_in_flight` operaciones corren a la vez; las siguientes esperan
+    en una cola FIFO de hasta `max_queue` posiciones durante `queue_timeout`
+    segundos como máximo. Con la cola llena (o al agotar la espera) se rechaza
+    de inmediato: rechazar temprano mantiene el servicio en su throughput
+    máximo en lugar de acumular imágenes en memoria hasta que todas las
+    solicitudes expiren.
+    """
+    
+    def __init__(self, max_in_flight: int, max_queue: int = 0, queue_timeout: float = 5.0):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        # Media móvil de la duración de una operación, para estimar Retry-After
+        self._average_seconds = 0.0
+    
+    def retry_after(self) -> int:
+        """Segundos estimados hasta que se libere capacidad para la cola actual."""
+        backlog = self.in_flight + self.waiting
+        return max(1, math.ceil(self._average_seconds * backlog / self.max_in_flight))
+    
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.rejected += 1
+        return AdmissionRejected(reason, self.retry_after())
+    
+    @contextlib.asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Ocupa una posición durante el bloque, esperando en la cola si hace falta.
+        
+        Raises:
+            AdmissionRejected: Si la cola está llena o la espera supera `queue_timeout`
+        """
+        if self._slots.locked():
+            if self.waiting >= self.max_queue:
+                raise self._reject("Capacidad agotada: demasiadas recolecciones en curso")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject("Capacidad agotada: tiempo de espera en cola superado") from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+        
+        self.in_flight += 1
+        self.admitted += 1
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+            elapsed = time.monotonic() - start
+            self._average_seconds = (
+                elapsed if not self._average_seconds else 0.9 * self._average_seconds + 0.1 * elapsed
+            )
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "max_queue": self.max_queue,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "average_ms": round(self._average_seconds * 1000, 3)
+        }
\ No newline at end of file
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Set
+
+from pydantic import ValidationError
+
+from ...domain.models.received_message import ReceivedMessage
+from ...domain.ports.message_consumer import MessageConsumer
+from ..dto.image_dto import ImageDTO
+from ..use_cases.image_collector import ImageCollectorUseCase
+
+logger = logging.getLogger(__name__)
+
+
+class CollectWorker:
+    """
+    Procesa solicitudes de recolección recibidas desde el broker.
+    
+    Cada mensaje es un JSON con los campos de `ImageDTO` (como mínimo `url`).
+    Los mensajes se reciben por lotes y se procesan en paralelo con un límite
+    de concurrencia: cuando todas las posiciones están ocupadas no se recibe
+    el siguiente lote, de modo que el broker reparte el trabajo entre los demás
+    workers. Un mensaje procesado se confirma; si la recolección falla se
+    confirma negativamente para que el broker lo reenvíe más tarde. Los mensajes
+    inválidos se confirman y descartan, ya que reenviarlos no los corregiría.
+    """
+    
+    def __init__(
+        self,
+        consumer: MessageConsumer,
+        use_case: ImageCollectorUseCase,
+        concurrency: int = 32
+    ):
+        self.consumer = consumer
+        self.use_case = use_case
+        self.concurrency = concurrency
+        self._slots = asyncio.Semaphore(concurrency)
+        self._in_flight: Set[asyncio.Task] = set()
+        self._stop_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+    
+    async def handle(self, message: ReceivedMessage) -> None:
+        """Procesa un mensaje y lo confirma según el resultado."""
+        try:
+            image_dto = ImageDTO.model_validate(json.loads(message.data))
+        except (ValueError, ValidationError) as e:
+            self.rejected += 1
+            logger.warning("Solicitud de recolección inválida descartada: %s", e)
+            await self.consumer.acknowledge(message)
+            return
+        
+        try:
+            await self.use_case.collect_image(image_dto)
+        except Exception as e:
+            self.failed += 1
+            logger.error("Error recolectando %s (reenvío %s): %s", image_dto.url, message.redelivery_count, e)
+            await self.consumer.negative_acknowledge(message)
+            return
+        
+        self.processed += 1
+        await self.consumer.acknowledge(message)
+    
+    async def _run_one(self, message: ReceivedMessage) -> None:
+        try:
+            await self.handle(message)
+        except Exception as e:
+            logger.error("Error confirmando mensaje: %s", e)
+        finally:
+            self._slots.release()
+    
+    async def run(self) -> None:
+        """Bucle principal: recibe lotes y los procesa con concurrencia acotada."""
+        while not self._stop_event.is_set():
+            # Esperar a tener al menos una posición libre antes de pedir más trabajo
+            await self._slots.acquire()
+            self._slots.release()
+            
+            try:
+                batch = await self.consumer.receive_batch()
+            except Exception as e:
+                logger.error("Error recibiendo solicitudes de recolección: %s", e)
+                await asyncio.sleep(1.0)
+                continue
+            
+            for message in batch:
+                await self._slots.acquire()
+                task = asyncio.create_task(self._run_one(message))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+        
+        # Terminar el trabajo en curso antes de salir
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+    
+    def start(self) -> asyncio.Task:
+        """Inicia el worker como tarea en segundo plano."""
+        if self._task is None or self._task.done():
+            self._stop_event.clear()
+            self._task = asyncio.create_task(self.run())
+        return self._task
+    
+    async def stop(self) -> None:
+        """Deja de recibir mensajes y espera a que terminen los que están en curso."""
+        self._stop_event.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
\ No newline at end of file
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Una comprobación retorna detalles opcionales y lanza una excepción si falla
+HealthCheck = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class HealthProber:
+    """
+    Ejecuta comprobaciones de salud en segundo plano y guarda el último resultado.
+    
+    Los endpoints de salud leen la caché en lugar de tocar la base de datos o
+    el broker en cada solicitud, de modo que un balanceador que consulta cada
+    segundo no añade trabajo ni bloquea el event loop. Cada resultado lleva la
+    hora de la comprobación; si deja de actualizarse se reporta como `stale`.
+    """
+    
+    def __init__(
+        self,
+        checks: Dict[str, HealthCheck],
+        interval: float = 5.0,
+        timeout: float = 2.0
+    ):
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._stop_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run_check(self, name: str, check: HealthCheck) -> None:
+        start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), timeout=self.timeout)
+            result = {"status": "ok", **(details or {})}
+        except asyncio.TimeoutError:
+            result = {"status": "error", "error": f"timeout after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        result["checked_at"] = datetime.now(timezone.utc).isoformat()
+        result["_monotonic"] = time.monotonic()
+        self._results[name] = result
+    
+    async def probe_once(self) -> None:
+        """Ejecuta todas las comprobaciones en paralelo y actualiza la caché."""
+        await asyncio.gather(
+            *(self._run_check(name, check) for name, check in self.checks.items())
+        )
+    
+    def result(self, name: str) -> Dict[str, Any]:
+        """Último resultado de una comprobación, con su antigüedad en segundos."""
+        cached = self._results.get(name)
+        if cached is None:
+            return {"status": "unknown"}
+        
+        result = {key: value for key, value in cached.items() if key != "_monotonic"}
+        age = time.monotonic() - cached["_monotonic"]
+        result["age_s"] = round(age, 3)
+        # Sin actualizar durante varios intervalos el resultado ya no es confiable
+        if age > self.interval * 3 + self.timeout:
+            result["status"] = "stale"
+        return result
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado global (el peor de todas las comprobaciones) y el detalle de cada una."""
+        results = {name: self.result(name) for name in self.checks}
+        statuses = {result["status"] for result in results.values()}
+        if "error" in statuses:
+            status = "error"
+        elif statuses - {"ok"}:
+            status = "degraded"
+        else:
+            status = "ok"
+        return {"status": status, "checks": results}
+    
+    async def run(self) -> None:
+        """Bucle principal: comprueba y espera el siguiente intervalo."""
+        while not self._stop_event.is_set():
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error("Error en las comprobaciones de salud: %s", e)
+            
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    def start(self) -> asyncio.Task:
+        """Inicia las comprobaciones como tarea en segundo plano."""
+        if self._task is None or self._task.done():
+            self._stop_event.clear()
+            self._task = asyncio.create_task(self.run())
+        return self._task
+    
+    async def stop(self) -> None:
+        """Detiene las comprobaciones esperando a que termine la ronda en curso."""
+        self._stop_event.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
\ No newline at end of file
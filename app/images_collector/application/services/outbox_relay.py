@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from ...domain.ports.message_publisher import MessagePublisher
+from ...domain.ports.outbox_repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Publica en el broker los eventos pendientes del outbox transaccional.
+    
+    Reclama el outbox por lotes en orden de inserción, publica los eventos en lote
+    y marca como enviados los que el broker confirmó. Si una publicación falla,
+    el lote se detiene para conservar el orden, el resto se libera y se
+    reintenta en el siguiente ciclo, lo que da una entrega al-menos-una-vez.
+    
+    Reclamar los eventos (en lugar de solo leerlos) permite ejecutar un relay
+    por réplica o proceso sobre la misma base de datos sin que cada uno publique
+    todas las filas. Periódicamente elimina los eventos ya publicados para que
+    la tabla no crezca sin límite.
+    """
+    
+    def __init__(
+        self,
+        outbox: OutboxRepository,
+        message_publisher: MessagePublisher,
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+        claim_lease: float = 30.0,
+        retention_seconds: float = 3600.0,
+        prune_interval: float = 60.0
+    ):
+        self.outbox = outbox
+        self.message_publisher = message_publisher
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.claim_lease = claim_lease
+        self.retention_seconds = retention_seconds
+        self.prune_interval = prune_interval
+        self._next_prune = 0.0
+        self._stop_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def relay_once(self) -> int:
+        """Publica un lote de eventos pendientes y retorna cuántos se enviaron."""
+        messages = await self.outbox.claim_pending(self.batch_size, self.claim_lease)
+        sent_ids = []
+        
+        # Publicar por tramos consecutivos del mismo tópico con una sola llamada por tramo
+        start = 0
+        while start < len(messages):
+            topic = messages[start].topic
+            end = start
+            while end < len(messages) and messages[end].topic == topic:
+                end += 1
+            
+            chunk = messages[start:end]
+            results = await self.message_publisher.publish_many(
+                topic, [message.payload for message in chunk]
+            )
+            
+            # Solo se marca el prefijo publicado para conservar el orden
+            for message, published in zip(chunk, results):
+                if not published:
+                    break
+                sent_ids.append(message.id)
+            if len(sent_ids) < end:
+                break
+            start = end
+        
+        if sent_ids:
+            await self.outbox.mark_sent(sent_ids)
+        
+        # Lo no publicado vuelve a quedar disponible sin esperar a que venza la reserva
+        unsent_ids = [message.id for message in messages[len(sent_ids):]]
+        if unsent_ids:
+            await self.outbox.release(unsent_ids)
+        return len(sent_ids)
+    
+    async def prune_once(self) -> int:
+        """Elimina los eventos publicados que superan el tiempo de retención."""
+        pruned = await self.outbox.prune_sent(self.retention_seconds)
+        if pruned:
+            logger.debug("Eventos publicados eliminados del outbox: %d", pruned)
+        return pruned
+    
+    async def run(self) -> None:
+        """Bucle principal: vacía el outbox y espera nuevos eventos."""
+        while not self._stop_event.is_set():
+            try:
+                sent = await self.relay_once()
+            except Exception as e:
+                logger.error("Error en el relay del outbox: %s", e)
+                sent = 0
+            
+            if time.monotonic() >= self._next_prune:
+                self._next_prune = time.monotonic() + self.prune_interval
+                try:
+                    await self.prune_once()
+                except Exception as e:
+                    logger.warning("No se pudo depurar el outbox: %s", e)
+            
+            # Si el lote vino lleno probablemente hay más pendientes: seguir sin esperar
+            if sent < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+    
+    def start(self) -> asyncio.Task:
+        """Inicia el relay como tarea en segundo plano."""
+        if self._task is None or self._task.done():
+            self._stop_event.clear()
+            self._task = asyncio.create_task(self.run())
+        return self._task
+    
+    async def stop(self) -> None:
+        """Detiene el relay esperando a que termine el lote en curso."""
+        self._stop_event.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
\ No newline at end of file
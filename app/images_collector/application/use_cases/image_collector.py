@@ -1,10 +1,19 @@
-import uuid
 from typing import List, Optional
 
+from ...domain.events.image_events import image_created_event
 from ...domain.models.image import Image
+from ...domain.models.image_id import new_image_id
+from ...domain.ports.collect_instrumentation import CollectInstrumentation, NullCollectInstrumentation
 from ...domain.ports.image_repository import ImageRepository
 from ...domain.ports.message_publisher import MessagePublisher
-from ..dto.image_dto import ImageDTO
+from ...domain.ports.outbox_repository import OutboxRepository
+from ..dto.image_dto import ImageDTO, ImagePageDTO
+from ..services.admission_controller import AdmissionController, AdmissionRejected
+
+# Longitud mínima de una búsqueda (los índices de trigramas requieren 3 caracteres)
+MIN_SEARCH_QUERY_LENGTH = 3
+MAX_SEARCH_LIMIT = 500
+MAX_PAGE_SIZE = 1000
 
 
 class ImageCollectorUseCase:
@@ -13,71 +22,131 @@ class ImageCollectorUseCase:
     def __init__(
         self, 
         image_repository: ImageRepository, 
-        message_publisher: Optional[MessagePublisher] = None
+        message_publisher: Optional[MessagePublisher] = None,
+        admission: Optional[AdmissionController] = None,
+        instrumentation: Optional[CollectInstrumentation] = None
     ):
         self.image_repository = image_repository
         self.message_publisher = message_publisher
+        self.admission = admission
+        self.instrumentation = instrumentation or NullCollectInstrumentation()
     
     async def collect_image(self, image_dto: ImageDTO) -> ImageDTO:
-        """Recolecta y almacena una imagen desde la URL proporcionada."""
+        """
+        Recolecta y almacena una imagen desde la URL proporcionada.
+        
+        Raises:
+            AdmissionRejected: Si hay control de admisión y no queda capacidad
+        """
+        if self.admission is None:
+            return await self._collect_in_flight(image_dto)
+        try:
+            async with self.admission.admit():
+                return await self._collect_in_flight(image_dto)
+        except AdmissionRejected:
+            self.instrumentation.collect_rejected()
+            raise
+    
+    async def _collect_in_flight(self, image_dto: ImageDTO) -> ImageDTO:
+        self.instrumentation.collect_started()
+        try:
+            return await self._collect_image(image_dto)
+        finally:
+            self.instrumentation.collect_finished()
+    
+    async def _collect_image(self, image_dto: ImageDTO) -> ImageDTO:
         # Crear modelo de dominio desde el DTO
         image = Image(
-            id=image_dto.id or str(uuid.uuid4()),
+            id=image_dto.id or new_image_id(),
             url=str(image_dto.url),
             file_name=image_dto.file_name,
             content_type=image_dto.content_type,
             size=image_dto.size
         )
         
+        # Con outbox transaccional el evento se guarda junto con la imagen y
+        # lo publica el relay; el broker queda fuera del camino de la solicitud
+        outbox_topic = self._outbox_topic()
+        
         # Guardar en el repositorio
-        saved_image = await self.image_repository.save(image)
+        saved_image = await self.image_repository.save(image, outbox_topic=outbox_topic)
         
-        # Convertir de nuevo a DTO
-        result_dto = ImageDTO(
-            id=saved_image.id,
-            url=saved_image.url,
-            file_name=saved_image.file_name,
-            content_type=saved_image.content_type,
-            size=saved_image.size,
-            created_at=saved_image.created_at
-        )
+        # Convertir de nuevo a DTO (datos confiables, sin revalidar)
+        result_dto = ImageDTO.from_entity(saved_image)
         
-        # Publicar evento si hay un publicador disponible
-        if self.message_publisher:
+        # Publicar evento directamente si hay publicador y no se usó el outbox
+        if self.message_publisher and outbox_topic is None:
             from ...infrastructure.settings.config import settings
             
-            # Creamos un payload para el evento
-            event_data = {
-                "event_type": "image_created",
-                "image": {
-                    "id": result_dto.id,
-                    "url": str(result_dto.url),
-                    "file_name": result_dto.file_name,
-                    "content_type": result_dto.content_type,
-                    "size": result_dto.size,
-                    "created_at": result_dto.created_at.isoformat() if result_dto.created_at else None
-                }
-            }
-            
             # Publicar de forma asíncrona
-            await self.message_publisher.publish(
-                settings.pulsar_image_topic,
-                event_data
-            )
+            with self.instrumentation.stage("publish"):
+                await self.message_publisher.publish(
+                    settings.pulsar_image_topic,
+                    image_created_event(saved_image)
+                )
         
         return result_dto
     
+    def _outbox_topic(self) -> Optional[str]:
+        """Tópico del evento si debe registrarse en el outbox, None en caso contrario."""
+        if not self.message_publisher or not isinstance(self.image_repository, OutboxRepository):
+            return None
+        
+        from ...infrastructure.settings.config import settings
+        return settings.pulsar_image_topic if settings.outbox_enabled else None
+    
     async def get_all_images(self) -> List[ImageDTO]:
         """Obtiene todas las imágenes almacenadas."""
         images = await self.image_repository.get_all()
-        return [
-            ImageDTO(
-                id=img.id,
-                url=img.url,
-                file_name=img.file_name,
-                content_type=img.content_type,
-                size=img.size,
-                created_at=img.created_at
+        return [ImageDTO.from_entity(img) for img in images]
+    
+    async def catalogue_version(self) -> Optional[str]:
+        """Versión del catálogo del repositorio, o None si no la mantiene."""
+        return await self.image_repository.catalogue_version()
+    
+    async def image_version(self, image_id: str) -> Optional[str]:
+        """Versión de la imagen en el repositorio, o None si no existe o no la mantiene."""
+        return await self.image_repository.image_version(image_id)
+    
+    async def get_image_by_id(self, image_id: str) -> Optional[ImageDTO]:
+        """Obtiene una imagen por su ID, o None si no existe."""
+        image = await self.image_repository.get_by_id(image_id)
+        return ImageDTO.from_entity(image) if image else None
+    
+    async def get_images_page(self, limit: int = 100, cursor: Optional[str] = None) -> ImagePageDTO:
+        """Obtiene una página del catálogo, de la imagen más reciente a la más antigua."""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        
+        # Pedir un elemento extra para saber si existe una página siguiente
+        images = await self.image_repository.get_page(limit + 1, cursor or None)
+        has_more = len(images) > limit
+        images = images[:limit]
+        
+        return ImagePageDTO.model_construct(
+            items=[ImageDTO.from_entity(img) for img in images],
+            next_cursor=images[-1].id if has_more else None
+        )
+    
+    async def search_images(
+        self,
+        query: str,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> ImagePageDTO:
+        """Busca imágenes por URL o nombre de archivo, paginando por cursor."""
+        query = query.strip()
+        if len(query) < MIN_SEARCH_QUERY_LENGTH:
+            raise ValueError(
+                f"La búsqueda debe tener al menos {MIN_SEARCH_QUERY_LENGTH} caracteres"
             )
-            for img in images
-        ]
\ No newline at end of file
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        
+        # Pedir un elemento extra para saber si existe una página siguiente
+        images = await self.image_repository.search(query, limit + 1, cursor or None)
+        has_more = len(images) > limit
+        images = images[:limit]
+        
+        return ImagePageDTO.model_construct(
+            items=[ImageDTO.from_entity(img) for img in images],
+            next_cursor=images[-1].id if has_more else None
+        )
\ No newline at end of file
@@ -0,0 +1,23 @@
+from typing import Any, Dict
+
+from ..models.image import Image
+
+IMAGE_CREATED = "image_created"
+# Versión del formato del evento; cambia solo ante cambios incompatibles
+IMAGE_CREATED_VERSION = 1
+
+
+def image_created_event(image: Image) -> Dict[str, Any]:
+    """Construye el evento de integración que notifica la creación de una imagen."""
+    return {
+        "version": IMAGE_CREATED_VERSION,
+        "event_type": IMAGE_CREATED,
+        "image": {
+            "id": image.id,
+            "url": image.url,
+            "file_name": image.file_name,
+            "content_type": image.content_type,
+            "size": image.size,
+            "created_at": image.created_at.isoformat() if image.created_at else None
+        }
+    }
\ No newline at end of file
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class FetchedImage:
+    """Contenido de una imagen descargada desde su URL de origen."""
+    content: bytes
+    content_type: str
\ No newline at end of file
@@ -1,9 +1,14 @@
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Optional
 
 
-@dataclass(frozen=True)
+def _utc_now() -> datetime:
+    """Instante actual en UTC, evaluado en cada instancia."""
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
 class Image:
     """Entidad principal que representa una imagen."""
     id: str
@@ -11,4 +16,4 @@ class Image:
     file_name: Optional[str] = None
     content_type: Optional[str] = None
     size: Optional[int] = None
-    created_at: datetime = datetime.now()
\ No newline at end of file
+    created_at: datetime = field(default_factory=_utc_now)
\ No newline at end of file
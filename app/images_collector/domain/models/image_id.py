@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+import uuid
+
+
+class ImageIdGenerator:
+    """
+    Generador de identificadores ordenados por tiempo (formato UUIDv7).
+
+    Los 48 bits más significativos contienen el instante de creación en
+    milisegundos, seguidos de un contador de 12 bits que garantiza que los
+    identificadores generados dentro de un mismo proceso sean estrictamente
+    crecientes aunque se creen en el mismo milisegundo.
+    """
+
+    _COUNTER_BITS = 12
+    _COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def _next_timestamp_and_counter(self):
+        """Calcula el par (milisegundos, contador) siguiente de forma monótona."""
+        now_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if now_ms > self._last_ms:
+                # Nuevo milisegundo: el contador arranca en un valor aleatorio
+                # de la mitad inferior para dejar margen a ráfagas
+                self._last_ms = now_ms
+                self._counter = int.from_bytes(os.urandom(2), "big") & (self._COUNTER_MAX >> 1)
+            else:
+                # Mismo milisegundo (o reloj que retrocede): incrementar contador
+                self._counter += 1
+                if self._counter > self._COUNTER_MAX:
+                    # Contador agotado: avanzar al siguiente milisegundo lógico
+                    self._last_ms += 1
+                    self._counter = 0
+            return self._last_ms, self._counter
+
+    def new_uuid(self) -> uuid.UUID:
+        """Genera un nuevo UUIDv7 monótono dentro del proceso."""
+        timestamp_ms, counter = self._next_timestamp_and_counter()
+        rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+
+        value = (timestamp_ms & ((1 << 48) - 1)) << 80
+        value |= 0x7 << 76            # versión 7
+        value |= counter << 64        # rand_a usado como contador
+        value |= 0b10 << 62           # variante RFC 4122
+        value |= rand_b
+        return uuid.UUID(int=value)
+
+    def new_id(self) -> str:
+        """Genera un nuevo identificador como cadena ordenable lexicográficamente."""
+        return str(self.new_uuid())
+
+
+_default_generator = ImageIdGenerator()
+
+
+def new_image_id() -> str:
+    """Genera un identificador de imagen ordenado por tiempo."""
+    return _default_generator.new_id()
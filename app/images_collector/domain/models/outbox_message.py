@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxMessage:
+    """Evento pendiente de publicar, registrado junto con el cambio que lo originó."""
+    id: int
+    topic: str
+    payload: Dict[str, Any]
+    created_at: Optional[datetime] = None
\ No newline at end of file
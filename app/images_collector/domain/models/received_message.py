@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class ReceivedMessage:
+    """Mensaje recibido desde el broker, pendiente de confirmar."""
+    data: bytes
+    key: Optional[str] = None
+    redelivery_count: int = 0
+    # Referencia al mensaje del adaptador, necesaria para confirmarlo
+    handle: Any = None
\ No newline at end of file
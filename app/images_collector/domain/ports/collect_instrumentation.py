@@ -0,0 +1,43 @@
+import contextlib
+from abc import ABC, abstractmethod
+from typing import ContextManager
+
+
+class CollectInstrumentation(ABC):
+    """Puerto para medir la recolección sin atar el caso de uso a un backend de métricas."""
+    
+    @abstractmethod
+    def collect_started(self) -> None:
+        """Una recolección obtuvo capacidad y empieza a ejecutarse."""
+        pass
+    
+    @abstractmethod
+    def collect_finished(self) -> None:
+        """Una recolección en curso terminó, con éxito o con error."""
+        pass
+    
+    @abstractmethod
+    def collect_rejected(self) -> None:
+        """El control de admisión rechazó una recolección."""
+        pass
+    
+    @abstractmethod
+    def stage(self, name: str) -> ContextManager[None]:
+        """Context manager que mide la duración de una etapa de la recolección."""
+        pass
+
+
+class NullCollectInstrumentation(CollectInstrumentation):
+    """Instrumentación que no registra nada; la usan los tests y benchmarks."""
+    
+    def collect_started(self) -> None:
+        pass
+    
+    def collect_finished(self) -> None:
+        pass
+    
+    def collect_rejected(self) -> None:
+        pass
+    
+    def stage(self, name: str) -> ContextManager[None]:
+        return contextlib.nullcontext()
\ No newline at end of file
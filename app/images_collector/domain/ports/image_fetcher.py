@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+from ..models.fetched_image import FetchedImage
+
+
+class ImageFetcher(ABC):
+    """Puerto para descargar imágenes desde su URL de origen."""
+    
+    @abstractmethod
+    async def fetch(self, url: str) -> FetchedImage:
+        """
+        Descarga la imagen.
+        
+        Raises:
+            Exception: Si la descarga falla o el origen responde con error
+        """
+        pass
+    
+    @abstractmethod
+    async def close(self) -> None:
+        """Libera las conexiones abiertas."""
+        pass
\ No newline at end of file
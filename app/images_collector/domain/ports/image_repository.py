@@ -4,12 +4,22 @@ from typing import List, Optional
 from ..models.image import Image
 
 
+class InvalidCursorError(ValueError):
+    """El cursor de paginación no corresponde a ninguna imagen del catálogo."""
+
+
 class ImageRepository(ABC):
     """Puerto para el repositorio de imágenes."""
     
     @abstractmethod
-    async def save(self, image: Image) -> Image:
-        """Guarda una imagen en el repositorio."""
+    async def save(self, image: Image, outbox_topic: Optional[str] = None) -> Image:
+        """
+        Guarda una imagen en el repositorio.
+        
+        Si se indica `outbox_topic` y el repositorio implementa `OutboxRepository`,
+        el evento `image_created` se registra en el outbox dentro de la misma
+        transacción que la imagen.
+        """
         pass
     
     @abstractmethod
@@ -20,4 +30,65 @@ class ImageRepository(ABC):
     @abstractmethod
     async def get_all(self) -> List[Image]:
         """Obtiene todas las imágenes."""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def get_page(self, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        """
+        Obtiene una página de imágenes, de la más reciente a la más antigua.
+        
+        Args:
+            limit: Número máximo de resultados
+            cursor: ID de la última imagen de la página anterior
+            
+        Raises:
+            InvalidCursorError: Si el cursor no existe (p. ej. la imagen se eliminó)
+        """
+        pass
+    
+    @abstractmethod
+    async def search(self, query: str, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        """
+        Busca imágenes cuya URL o nombre de archivo contenga el texto dado.
+        
+        Args:
+            query: Texto a buscar (sin distinguir mayúsculas)
+            limit: Número máximo de resultados
+            cursor: ID de la última imagen de la página anterior
+            
+        Returns:
+            List[Image]: Imágenes de la más reciente a la más antigua
+            
+        Raises:
+            InvalidCursorError: Si el cursor no existe (p. ej. la imagen se eliminó)
+        """
+        pass
+    
+    async def catalogue_version(self) -> Optional[str]:
+        """
+        Versión del catálogo: cambia cada vez que se guarda una imagen.
+        
+        Debe ser más barata que leer el catálogo y avanzar, como muy pronto,
+        cuando los datos nuevos ya son visibles para las lecturas; así lo leído
+        después de consultarla nunca es más antiguo que la versión. None indica
+        que el adaptador no la mantiene (sin ETags ni caché del listado).
+        """
+        return None
+    
+    async def image_version(self, image_id: str) -> Optional[str]:
+        """
+        Versión de una imagen: cambia cada vez que esa imagen se vuelve a guardar.
+        
+        Debe ser más barata que leer la fila completa. None indica que la imagen
+        no existe o que el adaptador no mantiene versiones por fila.
+        """
+        return None
+    
+    async def ping(self) -> None:
+        """
+        Comprueba que el almacenamiento responde; lanza una excepción si no.
+        
+        La implementación por defecto lee una página de un elemento; los
+        adaptadores pueden sobrescribirla con una consulta más barata.
+        """
+        await self.get_page(1)
\ No newline at end of file
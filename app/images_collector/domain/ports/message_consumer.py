@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from ..models.received_message import ReceivedMessage
+
+
+class MessageConsumer(ABC):
+    """Puerto para consumir mensajes de una suscripción compartida."""
+    
+    @abstractmethod
+    async def receive_batch(self) -> List[ReceivedMessage]:
+        """
+        Recibe el siguiente lote de mensajes.
+        
+        Returns:
+            List[ReceivedMessage]: Los mensajes recibidos; vacía si no llegó
+            ninguno dentro del tiempo de espera del adaptador
+        """
+        pass
+    
+    @abstractmethod
+    async def acknowledge(self, message: ReceivedMessage) -> None:
+        """Confirma que el mensaje fue procesado y no debe reenviarse."""
+        pass
+    
+    @abstractmethod
+    async def negative_acknowledge(self, message: ReceivedMessage) -> None:
+        """Indica que el mensaje falló y debe reenviarse más tarde."""
+        pass
+    
+    @abstractmethod
+    async def close(self) -> None:
+        """Cierra la suscripción."""
+        pass
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Sequence
 
 
 class MessagePublisher(ABC):
@@ -13,12 +13,28 @@ class MessagePublisher(ABC):
         Args:
             topic: El tópico donde publicar el mensaje
             message: El contenido del mensaje a publicar
-            
+        
         Returns:
             bool: True si el mensaje fue publicado correctamente, False en caso contrario
         """
         pass
     
+    async def publish_many(self, topic: str, messages: Sequence[Any]) -> List[bool]:
+        """
+        Publica varios mensajes en el tópico especificado, conservando el orden.
+        
+        La implementación por defecto publica uno a uno; los adaptadores pueden
+        sobrescribirla para enviar el lote completo sin esperar cada confirmación.
+        
+        Args:
+            topic: El tópico donde publicar los mensajes
+            messages: Los mensajes a publicar
+        
+        Returns:
+            List[bool]: El resultado de cada mensaje, en el mismo orden
+        """
+        return [await self.publish(topic, message) for message in messages]
+    
     @abstractmethod
     async def close(self) -> None:
         """Cierra las conexiones del publicador."""
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from ..models.outbox_message import OutboxMessage
+
+
+class OutboxRepository(ABC):
+    """Puerto para reclamar y confirmar los eventos del outbox transaccional."""
+    
+    @abstractmethod
+    async def claim_pending(self, limit: int, lease_seconds: float) -> List[OutboxMessage]:
+        """
+        Reclama de forma atómica los eventos pendientes más antiguos.
+        
+        Los eventos reclamados quedan reservados durante `lease_seconds`: otro
+        relay que comparta la base de datos no los recibe mientras la reserva
+        esté vigente. Si el relay termina sin confirmarlos ni liberarlos, la
+        reserva vence y vuelven a estar disponibles.
+        
+        Returns:
+            List[OutboxMessage]: Eventos reclamados, en orden de inserción
+        """
+        pass
+    
+    @abstractmethod
+    async def mark_sent(self, message_ids: List[int]) -> None:
+        """Marca los eventos indicados como publicados."""
+        pass
+    
+    @abstractmethod
+    async def release(self, message_ids: List[int]) -> None:
+        """Libera la reserva de eventos reclamados que no se llegaron a publicar."""
+        pass
+    
+    @abstractmethod
+    async def prune_sent(self, older_than_seconds: float) -> int:
+        """Elimina los eventos publicados hace más de `older_than_seconds` y retorna cuántos."""
+        pass
\ No newline at end of file
@@ -0,0 +1,134 @@
+import asyncio
+import functools
+import logging
+import signal
+import socket
+from typing import Callable, Optional
+
+import uvicorn
+
+from ..container import build_container
+from ..grpc.server import create_server, serve_multiprocess
+from ..observability.logging_setup import configure_logging
+from ..observability.metrics_server import start_metrics_server
+from ..http.routes import setup_routes
+from ..settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _loop_factory(loop: str) -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Fábrica del event loop con la misma elección que uvicorn en modo HTTP."""
+    if loop == "asyncio":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        if loop == "uvloop":
+            raise
+        return None
+    return uvloop.new_event_loop
+
+
+def _reuse_port_socket(host: str, port: int) -> socket.socket:
+    """Socket HTTP con SO_REUSEPORT para compartir el puerto entre procesos."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    return sock
+
+
+def run(http: str = "auto", loop: str = "auto", workers: int = 1) -> None:
+    """
+    Ejecuta el modo combinado con el event loop y el número de procesos indicados.
+    
+    Con varios workers cada proceso tiene su propio contenedor y ambos puertos
+    se comparten con SO_REUSEPORT; el proceso principal solo los supervisa,
+    igual que en el modo gRPC.
+    """
+    if workers > 1:
+        serve_multiprocess(
+            workers,
+            target=functools.partial(_run_worker, http=http, loop=loop),
+            name="HTTP+gRPC"
+        )
+        return
+    with asyncio.Runner(loop_factory=_loop_factory(loop)) as runner:
+        runner.run(serve(http))
+
+
+def _run_worker(worker_index: int, http: str, loop: str) -> None:
+    """Punto de entrada de cada proceso de `run` con varios workers."""
+    configure_logging()
+    with asyncio.Runner(loop_factory=_loop_factory(loop)) as runner:
+        runner.run(serve(http, worker_index=worker_index, reuse_port=True))
+
+
+async def serve(http: str = "auto", worker_index: int = 0, reuse_port: bool = False):
+    """
+    Inicia los servidores HTTP y gRPC en el mismo event loop.
+    
+    Ambos comparten un único contenedor: el mismo caso de uso, repositorio
+    (y pool de base de datos), fetcher y publicador, en lugar de uno por
+    servidor. El relay del outbox se ejecuta una sola vez para los dos.
+    
+    Args:
+        http: Implementación del protocolo HTTP de uvicorn
+        worker_index: Índice del proceso dentro de `run` con varios workers
+        reuse_port: Abrir los puertos con SO_REUSEPORT para compartirlos entre procesos
+    """
+    container = await build_container()
+    # Con varios procesos basta con el relay del primero (los relays reclaman
+    # las filas, así que más no duplicarían eventos, solo consultas)
+    if worker_index == 0:
+        container.start_outbox_relay()
+    
+    grpc_server = create_server(container.use_case, reuse_port=reuse_port)
+    http_server = uvicorn.Server(uvicorn.Config(
+        app=setup_routes(container),
+        host=settings.http_host,
+        port=settings.http_port,
+        http=http,
+        backlog=settings.http_backlog,
+        timeout_keep_alive=settings.http_keepalive_timeout,
+        log_config=None
+    ))
+    
+    # Métricas de cada proceso en un puerto propio: el de HTTP lo comparten
+    # todos los workers y cada scrape leería las de uno distinto
+    metrics_server = None
+    if settings.http_metrics_port:
+        metrics_server = await start_metrics_server(
+            settings.http_host, settings.http_metrics_port + worker_index
+        )
+    
+    # uvicorn maneja SIGTERM/SIGINT mientras sirve y, al terminar, restaura los
+    # manejadores previos y vuelve a emitir la señal. Con estos manejadores la
+    # señal solo pide la salida, y hay tiempo de detener gRPC y cerrar recursos.
+    def _request_exit(signum, frame):
+        http_server.should_exit = True
+    
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, _request_exit)
+    
+    sockets = None
+    if reuse_port:
+        sockets = [_reuse_port_socket(settings.http_host, settings.http_port)]
+    
+    await grpc_server.start()
+    logger.info(
+        "Starting HTTP server on %s:%s and gRPC server on %s:%s (worker %s)",
+        settings.http_host, settings.http_port, settings.grpc_host, settings.grpc_port, worker_index
+    )
+    
+    try:
+        # Sirve HTTP hasta recibir la señal de salida
+        await http_server.serve(sockets=sockets)
+    finally:
+        await grpc_server.stop(settings.grpc_shutdown_grace)
+        if metrics_server:
+            metrics_server.close()
+        await container.close()
+        logger.info("HTTP and gRPC servers stopped")
\ No newline at end of file
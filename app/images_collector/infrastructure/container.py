@@ -0,0 +1,143 @@
+import logging
+from typing import Optional
+
+from ..application.services.admission_controller import AdmissionController
+from ..application.services.health_prober import HealthProber
+from ..application.services.outbox_relay import OutboxRelay
+from ..application.use_cases.image_collector import ImageCollectorUseCase
+from ..domain.ports.image_fetcher import ImageFetcher
+from ..domain.ports.image_repository import ImageRepository
+from ..domain.ports.message_publisher import MessagePublisher
+from ..domain.ports.outbox_repository import OutboxRepository
+from .fetchers.httpx_image_fetcher import HttpxImageFetcher
+from .health.checks import build_health_checks
+from .messaging.factory import create_message_publisher
+from .observability.collect_instrumentation import PrometheusCollectInstrumentation
+from .observability.metrics import COLLECT_QUEUE_DEPTH, POOL_CONNECTIONS
+from .repositories.factory import create_image_repository
+from .settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    Dependencias de larga vida de un proceso: repositorio (y su pool de base
+    de datos), fetcher, publicador y caso de uso.
+    
+    Los servidores HTTP y gRPC reciben el mismo contenedor cuando corren en el
+    mismo proceso, de modo que comparten conexiones en lugar de duplicarlas.
+    """
+    
+    def __init__(
+        self,
+        repository: ImageRepository,
+        fetcher: ImageFetcher,
+        message_publisher: Optional[MessagePublisher] = None
+    ):
+        self.repository = repository
+        self.fetcher = fetcher
+        self.message_publisher = message_publisher
+        # Un solo límite por proceso, compartido por HTTP y gRPC en modo combinado
+        self.admission: Optional[AdmissionController] = None
+        if settings.admission_max_in_flight > 0:
+            self.admission = AdmissionController(
+                settings.admission_max_in_flight,
+                max_queue=settings.admission_max_queue,
+                queue_timeout=settings.admission_queue_timeout
+            )
+            COLLECT_QUEUE_DEPTH.labels().set_function(lambda: self.admission.waiting)
+        self.use_case = ImageCollectorUseCase(
+            repository,
+            message_publisher,
+            self.admission,
+            instrumentation=PrometheusCollectInstrumentation()
+        )
+        self.outbox_relay: Optional[OutboxRelay] = None
+        # Lo inicia el servidor que expone los endpoints de salud
+        self.health_prober = HealthProber(
+            build_health_checks(repository, fetcher, message_publisher),
+            interval=settings.health_probe_interval,
+            timeout=settings.health_probe_timeout
+        )
+        self._register_pool_metrics()
+    
+    def _register_pool_metrics(self) -> None:
+        """Exporta el uso de los pools como gauges calculados al leer /metrics."""
+        if hasattr(self.fetcher, "in_flight"):
+            POOL_CONNECTIONS.labels("fetcher", "in_use").set_function(lambda: self.fetcher.in_flight)
+            POOL_CONNECTIONS.labels("fetcher", "max").set(settings.fetch_max_connections)
+        
+        pool_stats = getattr(self.repository, "pool_stats", None)
+        if pool_stats is not None:
+            for state in ("open", "idle", "max"):
+                POOL_CONNECTIONS.labels("database", state).set_function(
+                    lambda state=state: pool_stats().get(state, 0)
+                )
+    
+    def start_outbox_relay(self) -> bool:
+        """
+        Inicia el relay del outbox si el publicador y el repositorio lo permiten.
+        
+        Returns:
+            bool: True si el relay quedó en ejecución
+        """
+        if self.outbox_relay is not None:
+            return True
+        if (
+            not self.message_publisher
+            or not settings.outbox_enabled
+            or not isinstance(self.repository, OutboxRepository)
+        ):
+            return False
+        
+        self.outbox_relay = OutboxRelay(
+            self.repository,
+            self.message_publisher,
+            batch_size=settings.outbox_batch_size,
+            poll_interval=settings.outbox_poll_interval,
+            claim_lease=settings.outbox_claim_lease,
+            retention_seconds=settings.outbox_retention_seconds,
+            prune_interval=settings.outbox_prune_interval
+        )
+        self.outbox_relay.start()
+        logger.info("Outbox relay started")
+        return True
+    
+    async def close(self) -> None:
+        """Detiene el relay y cierra publicador, conexiones y pool de descargas."""
+        await self.health_prober.stop()
+        
+        # Detener el relay antes de cerrar el publicador que utiliza
+        if self.outbox_relay:
+            await self.outbox_relay.stop()
+            self.outbox_relay = None
+        
+        if self.message_publisher:
+            try:
+                await self.message_publisher.close()
+            except Exception as e:
+                logger.error("Error closing message publisher: %s", e)
+        
+        close_repository = getattr(self.repository, "close", None)
+        if close_repository is not None:
+            await close_repository()
+        
+        await self.fetcher.close()
+
+
+async def build_container() -> ServiceContainer:
+    """Crea las dependencias del proceso según la configuración."""
+    fetcher = HttpxImageFetcher()
+    repository = create_image_repository(fetcher)
+    
+    # Publicador de eventos si está habilitado
+    try:
+        message_publisher = await create_message_publisher()
+        if message_publisher:
+            logger.info("Message publisher initialized. Backend: %s", settings.messaging_backend)
+    except Exception as e:
+        logger.error("Error initializing message publisher: %s", e)
+        message_publisher = None
+    
+    return ServiceContainer(repository, fetcher, message_publisher)
\ No newline at end of file
@@ -0,0 +1,57 @@
+from typing import Optional
+
+import httpx
+
+from ...domain.models.fetched_image import FetchedImage
+from ...domain.ports.image_fetcher import ImageFetcher
+from ..settings.config import settings
+
+
+class HttpxImageFetcher(ImageFetcher):
+    """
+    Descarga imágenes con un único `httpx.AsyncClient`.
+    
+    El cliente mantiene un pool de conexiones keep-alive que se reutiliza entre
+    descargas (y entre servidores cuando comparten el fetcher), en lugar de
+    abrir un cliente y una conexión TLS nuevos por cada imagen.
+    """
+    
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None
+    ):
+        self.timeout = timeout if timeout is not None else settings.fetch_timeout
+        self.max_connections = max_connections or settings.fetch_max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        # Descargas en curso (conexiones del pool en uso)
+        self.in_flight = 0
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Crea el cliente al primer uso, ya dentro del event loop."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+    
+    async def fetch(self, url: str) -> FetchedImage:
+        self.in_flight += 1
+        try:
+            response = await self._get_client().get(url)
+        finally:
+            self.in_flight -= 1
+        response.raise_for_status()
+        return FetchedImage(
+            content=response.content,
+            content_type=response.headers.get("content-type", "image/jpeg")
+        )
+    
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
\ No newline at end of file
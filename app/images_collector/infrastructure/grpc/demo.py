@@ -12,7 +12,7 @@ async def run_client():
     
     print(f"Conectando a servidor gRPC en {server_address}")
     
-    async with grpc.aio.insecure_channel(server_address) as channel:
+    async with grpc.aio.insecure_channel(server_address, compression=grpc.Compression.Gzip) as channel:
         stub = images_pb2_grpc.ImageCollectorStub(channel)
         
         # Ejemplo: Recolectar una imagen usando una URL que funcione
@@ -27,12 +27,12 @@ async def run_client():
             print(f"Imagen recolectada: {response}")
             
             print("Solicitando lista de imágenes...")
-            response = await stub.GetAllImages(images_pb2.EmptyRequest())
-            print(f"Imágenes obtenidas: {response}")
+            images = [image async for image in stub.GetAllImages(images_pb2.ListImagesRequest())]
+            print(f"Imágenes obtenidas: {len(images)}")
             
-            if response.images:
+            if images:
                 # Intentar obtener la primera imagen por ID
-                first_image_id = response.images[0].id
+                first_image_id = images[0].id
                 print(f"Solicitando imagen con ID: {first_image_id}")
                 image_response = await stub.GetImageById(
                     images_pb2.ImageIdRequest(id=first_image_id)
@@ -0,0 +1,112 @@
+import time
+
+import grpc
+
+from ..observability.metrics import GRPC_REQUESTS, GRPC_REQUEST_SECONDS
+from ..observability.request_timing import (
+    finish_request_timing,
+    format_server_timing,
+    start_request_timing
+)
+from ..settings.config import settings
+
+
+def _status_name(context, error: BaseException = None) -> str:
+    """Código de estado final de la llamada."""
+    code = context.code()
+    if code is None:
+        return "UNKNOWN" if error is not None else "OK"
+    # Según la versión, code() retorna el enum o su valor numérico
+    if isinstance(code, grpc.StatusCode):
+        return code.name
+    for status_code in grpc.StatusCode:
+        if status_code.value[0] == code:
+            return status_code.name
+    return str(code)
+
+
+def _start_timing():
+    """Empieza a medir las etapas de la llamada si Server-Timing está habilitado."""
+    return start_request_timing() if settings.server_timing_enabled else None
+
+
+class MetricsInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Registra cantidad, código de estado y duración de cada llamada en el mismo
+    registro que expone `/metrics`. En los flujos la duración abarca la
+    llamada completa, hasta el último mensaje.
+    
+    Las etapas de la recolección se envían en el metadata final (`server-timing`,
+    mismo formato que el encabezado HTTP); en los flujos se suman las de todas
+    las imágenes de la llamada.
+    """
+    
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        
+        method = handler_call_details.method
+        
+        def _record(start: float, context, timing_token, error: BaseException = None) -> None:
+            elapsed = time.perf_counter() - start
+            if timing_token is not None:
+                timings = finish_request_timing(timing_token)
+                # Se agrega al metadata que haya fijado el servicer (p. ej. retry-after-ms)
+                context.set_trailing_metadata((
+                    *(context.trailing_metadata() or ()),
+                    ("server-timing", format_server_timing(timings, elapsed)),
+                ))
+            GRPC_REQUEST_SECONDS.labels(method).observe(elapsed)
+            GRPC_REQUESTS.labels(method, _status_name(context, error)).inc()
+        
+        if handler.unary_unary or handler.stream_unary:
+            behavior = handler.unary_unary or handler.stream_unary
+            
+            async def unary_response(request_or_iterator, context):
+                start = time.perf_counter()
+                timing_token = _start_timing()
+                try:
+                    response = await behavior(request_or_iterator, context)
+                except BaseException as e:
+                    _record(start, context, timing_token, e)
+                    raise
+                _record(start, context, timing_token)
+                return response
+            
+            if handler.unary_unary:
+                return grpc.unary_unary_rpc_method_handler(
+                    unary_response,
+                    request_deserializer=handler.request_deserializer,
+                    response_serializer=handler.response_serializer
+                )
+            return grpc.stream_unary_rpc_method_handler(
+                unary_response,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
+        
+        behavior = handler.unary_stream or handler.stream_stream
+        
+        async def stream_response(request_or_iterator, context):
+            start = time.perf_counter()
+            timing_token = _start_timing()
+            try:
+                async for response in behavior(request_or_iterator, context):
+                    yield response
+            except BaseException as e:
+                _record(start, context, timing_token, e)
+                raise
+            _record(start, context, timing_token)
+        
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(
+                stream_response,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
+        return grpc.stream_stream_rpc_method_handler(
+            stream_response,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
\ No newline at end of file
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n<app/images_collector/infrastructure/grpc/protos/images.proto\x12\x06images\"\x0e\n\x0c\x45mptyRequest\"\x1c\n\x0eImageIdRequest\x12\n\n\x02id\x18\x01 \x01(\t\".\n\x0cImageRequest\x12\x0b\n\x03url\x18\x01 \x01(\t\x12\x11\n\tfile_name\x18\x02 \x01(\t\"s\n\rImageResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0b\n\x03url\x18\x02 \x01(\t\x12\x11\n\tfile_name\x18\x03 \x01(\t\x12\x14\n\x0c\x63ontent_type\x18\x04 \x01(\t\x12\x0c\n\x04size\x18\x05 \x01(\x05\x12\x12\n\ncreated_at\x18\x06 \x01(\t\"7\n\x0eImagesResponse\x12%\n\x06images\x18\x01 \x03(\x0b\x32\x15.images.ImageResponse2\xca\x01\n\x0eImageCollector\x12;\n\x0c\x43ollectImage\x12\x14.images.ImageRequest\x1a\x15.images.ImageResponse\x12<\n\x0cGetAllImages\x12\x14.images.EmptyRequest\x1a\x16.images.ImagesResponse\x12=\n\x0cGetImageById\x12\x16.images.ImageIdRequest\x1a\x15.images.ImageResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n<app/images_collector/infrastructure/grpc/protos/images.proto\x12\x06images\"\x0e\n\x0c\x45mptyRequest\"6\n\x11ListImagesRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\"\x1c\n\x0eImageIdRequest\x12\n\n\x02id\x18\x01 \x01(\t\"C\n\x13SearchImagesRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x03 \x01(\t\"B\n\x0cImageRequest\x12\x0b\n\x03url\x18\x01 \x01(\t\x12\x11\n\tfile_name\x18\x02 \x01(\t\x12\x12\n\nrequest_id\x18\x03 \x01(\t\"]\n\x12\x43ollectImageResult\x12\x12\n\nrequest_id\x18\x01 \x01(\t\x12$\n\x05image\x18\x02 \x01(\x0b\x32\x15.images.ImageResponse\x12\r\n\x05\x65rror\x18\x03 \x01(\t\"s\n\rImageResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0b\n\x03url\x18\x02 \x01(\t\x12\x11\n\tfile_name\x18\x03 \x01(\t\x12\x14\n\x0c\x63ontent_type\x18\x04 \x01(\t\x12\x0c\n\x04size\x18\x05 \x01(\x05\x12\x12\n\ncreated_at\x18\x06 \x01(\t\"L\n\x0eImagesResponse\x12%\n\x06images\x18\x01 \x03(\x0b\x32\x15.images.ImageResponse\x12\x13\n\x0bnext_cursor\x18\x02 \x01(\t\"^\n\x11ImageCreatedEvent\x12\x0f\n\x07version\x18\x01 \x01(\x05\x12\x12\n\nevent_type\x18\x02 \x01(\t\x12$\n\x05image\x18\x03 \x01(\x0b\x32\x15.images.ImageResponse2\xdc\x02\n\x0eImageCollector\x12;\n\x0c\x43ollectImage\x12\x14.images.ImageRequest\x1a\x15.images.ImageResponse\x12\x45\n\rCollectImages\x12\x14.images.ImageRequest\x1a\x1a.images.CollectImageResult(\x01\x30\x01\x12\x42\n\x0cGetAllImages\x12\x19.images.ListImagesRequest\x1a\x15.images.ImageResponse0\x01\x12=\n\x0cGetImageById\x12\x16.images.ImageIdRequest\x1a\x15.images.ImageResponse\x12\x43\n\x0cSearchImages\x12\x1b.images.SearchImagesRequest\x1a\x16.images.ImagesResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,14 +33,22 @@ if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_EMPTYREQUEST']._serialized_start=72
   _globals['_EMPTYREQUEST']._serialized_end=86
-  _globals['_IMAGEIDREQUEST']._serialized_start=88
-  _globals['_IMAGEIDREQUEST']._serialized_end=116
-  _globals['_IMAGEREQUEST']._serialized_start=118
-  _globals['_IMAGEREQUEST']._serialized_end=164
-  _globals['_IMAGERESPONSE']._serialized_start=166
-  _globals['_IMAGERESPONSE']._serialized_end=281
-  _globals['_IMAGESRESPONSE']._serialized_start=283
-  _globals['_IMAGESRESPONSE']._serialized_end=338
-  _globals['_IMAGECOLLECTOR']._serialized_start=341
-  _globals['_IMAGECOLLECTOR']._serialized_end=543
+  _globals['_LISTIMAGESREQUEST']._serialized_start=88
+  _globals['_LISTIMAGESREQUEST']._serialized_end=142
+  _globals['_IMAGEIDREQUEST']._serialized_start=144
+  _globals['_IMAGEIDREQUEST']._serialized_end=172
+  _globals['_SEARCHIMAGESREQUEST']._serialized_start=174
+  _globals['_SEARCHIMAGESREQUEST']._serialized_end=241
+  _globals['_IMAGEREQUEST']._serialized_start=243
+  _globals['_IMAGEREQUEST']._serialized_end=309
+  _globals['_COLLECTIMAGERESULT']._serialized_start=311
+  _globals['_COLLECTIMAGERESULT']._serialized_end=404
+  _globals['_IMAGERESPONSE']._serialized_start=406
+  _globals['_IMAGERESPONSE']._serialized_end=521
+  _globals['_IMAGESRESPONSE']._serialized_start=523
+  _globals['_IMAGESRESPONSE']._serialized_end=599
+  _globals['_IMAGECREATEDEVENT']._serialized_start=601
+  _globals['_IMAGECREATEDEVENT']._serialized_end=695
+  _globals['_IMAGECOLLECTOR']._serialized_start=698
+  _globals['_IMAGECOLLECTOR']._serialized_end=1046
 # @@protoc_insertion_point(module_scope)
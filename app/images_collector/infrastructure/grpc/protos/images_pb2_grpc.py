@@ -39,16 +39,26 @@ class ImageCollectorStub(object):
                 request_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageRequest.SerializeToString,
                 response_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageResponse.FromString,
                 _registered_method=True)
-        self.GetAllImages = channel.unary_unary(
+        self.CollectImages = channel.stream_stream(
+                '/images.ImageCollector/CollectImages',
+                request_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageRequest.SerializeToString,
+                response_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.CollectImageResult.FromString,
+                _registered_method=True)
+        self.GetAllImages = channel.unary_stream(
                 '/images.ImageCollector/GetAllImages',
-                request_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.EmptyRequest.SerializeToString,
-                response_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImagesResponse.FromString,
+                request_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ListImagesRequest.SerializeToString,
+                response_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageResponse.FromString,
                 _registered_method=True)
         self.GetImageById = channel.unary_unary(
                 '/images.ImageCollector/GetImageById',
                 request_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageIdRequest.SerializeToString,
                 response_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageResponse.FromString,
                 _registered_method=True)
+        self.SearchImages = channel.unary_unary(
+                '/images.ImageCollector/SearchImages',
+                request_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.SearchImagesRequest.SerializeToString,
+                response_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImagesResponse.FromString,
+                _registered_method=True)
 
 
 class ImageCollectorServicer(object):
@@ -60,8 +70,16 @@ class ImageCollectorServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CollectImages(self, request_iterator, context):
+        """Recolecta un flujo de imágenes; los resultados se envían a medida que terminan
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetAllImages(self, request, context):
-        """Missing associated documentation comment in .proto file."""
+        """Recorre el catálogo por páginas y envía las imágenes una a una
+        """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
@@ -72,6 +90,12 @@ class ImageCollectorServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SearchImages(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ImageCollectorServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -80,16 +104,26 @@ def add_ImageCollectorServicer_to_server(servicer, server):
                     request_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageRequest.FromString,
                     response_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageResponse.SerializeToString,
             ),
-            'GetAllImages': grpc.unary_unary_rpc_method_handler(
+            'CollectImages': grpc.stream_stream_rpc_method_handler(
+                    servicer.CollectImages,
+                    request_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageRequest.FromString,
+                    response_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.CollectImageResult.SerializeToString,
+            ),
+            'GetAllImages': grpc.unary_stream_rpc_method_handler(
                     servicer.GetAllImages,
-                    request_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.EmptyRequest.FromString,
-                    response_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImagesResponse.SerializeToString,
+                    request_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ListImagesRequest.FromString,
+                    response_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageResponse.SerializeToString,
             ),
             'GetImageById': grpc.unary_unary_rpc_method_handler(
                     servicer.GetImageById,
                     request_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageIdRequest.FromString,
                     response_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageResponse.SerializeToString,
             ),
+            'SearchImages': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchImages,
+                    request_deserializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.SearchImagesRequest.FromString,
+                    response_serializer=app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImagesResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'images.ImageCollector', rpc_method_handlers)
@@ -128,6 +162,33 @@ class ImageCollector(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def CollectImages(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/images.ImageCollector/CollectImages',
+            app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageRequest.SerializeToString,
+            app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.CollectImageResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetAllImages(request,
             target,
@@ -139,12 +200,12 @@ class ImageCollector(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(
+        return grpc.experimental.unary_stream(
             request,
             target,
             '/images.ImageCollector/GetAllImages',
-            app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.EmptyRequest.SerializeToString,
-            app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImagesResponse.FromString,
+            app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ListImagesRequest.SerializeToString,
+            app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImageResponse.FromString,
             options,
             channel_credentials,
             insecure,
@@ -181,3 +242,30 @@ class ImageCollector(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def SearchImages(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/images.ImageCollector/SearchImages',
+            app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.SearchImagesRequest.SerializeToString,
+            app_dot_images__collector_dot_infrastructure_dot_grpc_dot_protos_dot_images__pb2.ImagesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,44 +1,37 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
 import grpc
-from concurrent import futures
+from typing import Callable
+from pydantic import ValidationError
 from ...application.dto.image_dto import ImageDTO
+from ...application.services.admission_controller import AdmissionRejected
 from ...application.use_cases.image_collector import ImageCollectorUseCase
-from ..repositories.file_image_repository import FileImageRepository
-from ..repositories.sqlite_image_repository import SQLiteImageRepository
-from ..repositories.postgres_image_repository import PostgresImageRepository
-from ..messaging.pulsar_publisher import PulsarMessagePublisher
+from ...domain.ports.image_repository import InvalidCursorError
+from ..container import build_container
+from ..observability.logging_setup import configure_logging
+from ..observability.metrics_server import start_metrics_server
+from .interceptors import MetricsInterceptor
 from ..settings.config import settings
 from .protos import images_pb2, images_pb2_grpc
 
+logger = logging.getLogger(__name__)
+
+
+# Espera entre reinicios de un worker caído (segundos)
+_MIN_RESTART_DELAY = 1.0
+_MAX_RESTART_DELAY = 30.0
+# Un worker que vive menos que esto se considera un fallo de arranque
+_STABLE_UPTIME = 10.0
+
 
 class ImageCollectorServicer(images_pb2_grpc.ImageCollectorServicer):
     """Implementación del servicio gRPC para la recolección de imágenes."""
     
-    def __init__(self):
-        # Seleccionar el repositorio según la configuración
-        if settings.storage_type == "sqlite":
-            self.repository = SQLiteImageRepository()
-        elif settings.storage_type == "postgres":
-            self.repository = PostgresImageRepository()
-        else:
-            self.repository = FileImageRepository()
-        
-        # Crear publicador de mensajes si está habilitado
-        self.message_publisher = None
-        if settings.pulsar_enabled:
-            self.message_publisher = PulsarMessagePublisher()
-        
-        # Crear el caso de uso
-        self.use_case = ImageCollectorUseCase(self.repository, self.message_publisher)
-        
-    async def initialize(self):
-        """Inicializa los componentes asíncronos."""
-        if self.message_publisher:
-            try:
-                await self.message_publisher._get_client()
-            except Exception as e:
-                print(f"Error initializing Pulsar publisher: {e}")
-                self.message_publisher = None
-
+    def __init__(self, use_case: ImageCollectorUseCase):
+        self.use_case = use_case
     
     async def CollectImage(self, request, context):
         """Recolecta una imagen desde la URL proporcionada."""
@@ -53,35 +46,202 @@ class ImageCollectorServicer(images_pb2_grpc.ImageCollectorServicer):
             result = await self.use_case.collect_image(image_dto)
             
             # Convertir el resultado a response de protobuf
-            return images_pb2.ImageResponse(
-                id=result.id,
-                url=str(result.url),
-                file_name=result.file_name,
-                content_type=result.content_type,
-                size=result.size if result.size else 0,
-                created_at=result.created_at.isoformat() if result.created_at else ""
-            )
+            return self._to_response(result)
+        except AdmissionRejected as e:
+            # Los clientes con política de reintentos respetan `retry-after-ms`
+            context.set_trailing_metadata((("retry-after-ms", str(e.retry_after * 1000)),))
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details(str(e))
+            return images_pb2.ImageResponse()
         except Exception as e:
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(f"Error procesando imagen: {str(e)}")
             return images_pb2.ImageResponse()
     
-    # El resto de los métodos permanecen igual...
+    async def CollectImages(self, request_iterator, context):
+        """
+        Recolecta un flujo de imágenes con concurrencia acotada y envía cada
+        resultado en cuanto termina (no necesariamente en el orden de llegada).
+        """
+        results: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(settings.grpc_stream_concurrency)
+        # Recolecciones en curso: si el cliente cancela el flujo se cancelan
+        # con él en lugar de seguir descargando para nadie
+        tasks = set()
+        
+        async def collect(request):
+            try:
+                image_dto = ImageDTO(url=request.url, file_name=request.file_name)
+                result = await self.use_case.collect_image(image_dto)
+                await results.put(images_pb2.CollectImageResult(
+                    request_id=request.request_id,
+                    image=self._to_response(result)
+                ))
+            except ValidationError as e:
+                await results.put(images_pb2.CollectImageResult(
+                    request_id=request.request_id,
+                    error=f"Solicitud inválida: {e.errors()[0]['msg']}"
+                ))
+            except AdmissionRejected as e:
+                await results.put(images_pb2.CollectImageResult(
+                    request_id=request.request_id,
+                    error=f"RESOURCE_EXHAUSTED: {e} (reintentar en {e.retry_after}s)"
+                ))
+            except Exception as e:
+                await results.put(images_pb2.CollectImageResult(
+                    request_id=request.request_id,
+                    error=f"Error procesando imagen: {str(e)}"
+                ))
+            finally:
+                slots.release()
+        
+        async def feed():
+            # Lee solicitudes mientras haya posiciones libres (contrapresión hacia el cliente)
+            try:
+                async for request in request_iterator:
+                    await slots.acquire()
+                    task = asyncio.create_task(collect(request))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if tasks:
+                    await asyncio.gather(*tasks)
+            finally:
+                await results.put(None)
+        
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                result = await results.get()
+                if result is None:
+                    break
+                yield result
+            await feeder
+        finally:
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(feeder, *tasks, return_exceptions=True)
+    
+    async def GetAllImages(self, request, context):
+        """Envía el catálogo completo como flujo, leyéndolo página a página."""
+        cursor = request.cursor or None
+        page_size = request.page_size or settings.grpc_page_size
+        try:
+            while True:
+                page = await self.use_case.get_images_page(page_size, cursor)
+                for item in page.items:
+                    yield self._to_response(item)
+                if not page.next_cursor:
+                    break
+                cursor = page.next_cursor
+        except InvalidCursorError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except Exception as e:
+            await context.abort(grpc.StatusCode.INTERNAL, f"Error obteniendo imágenes: {str(e)}")
+    
+    async def GetImageById(self, request, context):
+        """Obtiene una imagen por su ID."""
+        try:
+            result = await self.use_case.get_image_by_id(request.id)
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(f"Error obteniendo imagen: {str(e)}")
+            return images_pb2.ImageResponse()
+        
+        if result is None:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(f"Image with id {request.id} not found")
+            return images_pb2.ImageResponse()
+        return self._to_response(result)
+    
+    async def SearchImages(self, request, context):
+        """Busca imágenes por URL o nombre de archivo, paginando por cursor."""
+        try:
+            page = await self.use_case.search_images(
+                request.query,
+                request.limit or 50,
+                request.cursor or None
+            )
+            return images_pb2.ImagesResponse(
+                images=[self._to_response(item) for item in page.items],
+                next_cursor=page.next_cursor or ""
+            )
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return images_pb2.ImagesResponse()
+        except Exception as e:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(f"Error buscando imágenes: {str(e)}")
+            return images_pb2.ImagesResponse()
+    
+    @staticmethod
+    def _to_response(result: ImageDTO) -> images_pb2.ImageResponse:
+        """Convierte un DTO en el mensaje protobuf de respuesta."""
+        return images_pb2.ImageResponse(
+            id=result.id,
+            url=str(result.url),
+            file_name=result.file_name,
+            content_type=result.content_type,
+            size=result.size if result.size else 0,
+            created_at=result.created_at.isoformat() if result.created_at else ""
+        )
+
+
+def create_server(use_case: ImageCollectorUseCase, reuse_port: bool = False) -> grpc.aio.Server:
+    """
+    Crea el servidor gRPC (sin iniciarlo) con el servicio registrado.
+    
+    Args:
+        use_case: Caso de uso que atiende las llamadas
+        reuse_port: Abrir el puerto con SO_REUSEPORT para compartirlo entre procesos
+    """
+    # Los handlers son corrutinas, así que no hace falta un pool de hilos.
+    # Compresión gzip por defecto: reduce el tamaño de los flujos de imágenes
+    options = [("grpc.so_reuseport", 1)] if reuse_port else None
+    server = grpc.aio.server(
+        compression=grpc.Compression.Gzip,
+        options=options,
+        interceptors=[MetricsInterceptor()]
+    )
+    
+    images_pb2_grpc.add_ImageCollectorServicer_to_server(ImageCollectorServicer(use_case), server)
+    server.add_insecure_port(f"{settings.grpc_host}:{settings.grpc_port}")
+    return server
 
 
-async def serve():
-    """Inicia el servidor gRPC."""
-    server = grpc.aio.server(futures.ThreadPoolExecutor(max_workers=10))
+async def serve(worker_index: int = 0, reuse_port: bool = False):
+    """
+    Inicia el servidor gRPC.
+    
+    Args:
+        worker_index: Índice del proceso dentro de `serve_multiprocess`
+        reuse_port: Abrir el puerto con SO_REUSEPORT para compartirlo entre procesos
+    """
+    container = await build_container()
+    server = create_server(container.use_case, reuse_port=reuse_port)
     
-    # Inicializar el servicio
-    servicer = ImageCollectorServicer()
-    await servicer.initialize()  # Inicializar componentes asíncronos
+    # Iniciar el relay del outbox si el repositorio lo soporta. Los relays
+    # reclaman las filas, así que varios no publican dos veces; con varios
+    # procesos basta con el del primero para no consultar el outbox de más.
+    if worker_index == 0:
+        container.start_outbox_relay()
     
-    images_pb2_grpc.add_ImageCollectorServicer_to_server(servicer, server)
-    server_address = f"{settings.grpc_host}:{settings.grpc_port}"
-    server.add_insecure_port(server_address)
+    # Detener de forma ordenada con SIGTERM/SIGINT: terminar las llamadas en curso
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(
+            sig, lambda: asyncio.ensure_future(server.stop(settings.grpc_shutdown_grace))
+        )
     
-    print(f"Starting gRPC server on {server_address}")
+    logger.info("Starting gRPC server on %s:%s (worker %s)", settings.grpc_host, settings.grpc_port, worker_index)
+    
+    # Métricas en un puerto propio; con varios procesos, uno por worker
+    metrics_server = None
+    if settings.grpc_metrics_port:
+        metrics_server = await start_metrics_server(
+            settings.grpc_host, settings.grpc_metrics_port + worker_index
+        )
     
     # Iniciar el servidor
     await server.start()
@@ -90,6 +250,87 @@ async def serve():
     try:
         await server.wait_for_termination()
     finally:
-        # Asegurarse de cerrar el cliente de Pulsar al terminar
-        if servicer.message_publisher:
-            await servicer.message_publisher.close()
\ No newline at end of file
+        if metrics_server:
+            metrics_server.close()
+        # Cierra el relay, el publicador de Pulsar y las conexiones
+        await container.close()
+
+
+def _run_worker(worker_index: int) -> None:
+    """Punto de entrada de cada proceso de `serve_multiprocess`."""
+    configure_logging()
+    asyncio.run(serve(worker_index=worker_index, reuse_port=True))
+
+
+def serve_multiprocess(
+    workers: int,
+    target: Callable[[int], None] = _run_worker,
+    name: str = "gRPC"
+) -> None:
+    """
+    Ejecuta `workers` procesos del servidor gRPC sobre el mismo puerto.
+    
+    Cada proceso tiene su propio event loop, servicer y conexiones; el kernel
+    reparte las conexiones entrantes gracias a SO_REUSEPORT. Este proceso solo
+    supervisa: reinicia los workers que terminan de forma inesperada (con
+    espera creciente si fallan al arrancar) y los detiene con SIGTERM/SIGINT.
+    
+    Args:
+        target: Punto de entrada de cada proceso, recibe el índice del worker
+            (debe poder serializarse para "spawn")
+        name: Nombre de los workers en los logs
+    """
+    # "spawn" en lugar de "fork": gRPC no soporta heredar su estado interno
+    context = multiprocessing.get_context("spawn")
+    processes = {}
+    restart_delays = {index: _MIN_RESTART_DELAY for index in range(workers)}
+    next_start = {index: 0.0 for index in range(workers)}
+    stopping = False
+    
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+    
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    
+    def _start(index: int):
+        process = context.Process(target=target, args=(index,), name=f"{name.lower()}-worker-{index}")
+        process.start()
+        processes[index] = (process, time.monotonic())
+        logger.info("Started %s worker %s (pid %s)", name, index, process.pid)
+    
+    logger.info("Starting %s %s workers on %s:%s", workers, name, settings.grpc_host, settings.grpc_port)
+    for index in range(workers):
+        _start(index)
+    
+    while not stopping:
+        now = time.monotonic()
+        for index in range(workers):
+            entry = processes.get(index)
+            if entry is not None:
+                process, started_at = entry
+                if process.is_alive():
+                    continue
+                logger.warning("%s worker %s (pid %s) exited with code %s", name, index, process.pid, process.exitcode)
+                del processes[index]
+                # Un worker que cae recién arrancado duplica la espera antes de reintentar
+                if now - started_at < _STABLE_UPTIME:
+                    restart_delays[index] = min(restart_delays[index] * 2, _MAX_RESTART_DELAY)
+                else:
+                    restart_delays[index] = _MIN_RESTART_DELAY
+                next_start[index] = now + restart_delays[index]
+            elif now >= next_start[index]:
+                _start(index)
+        time.sleep(0.5)
+    
+    logger.info("Stopping %s workers", name)
+    for process, _ in processes.values():
+        if process.is_alive():
+            process.terminate()
+    for process, _ in processes.values():
+        process.join(settings.grpc_shutdown_grace + 5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+    logger.info("%s workers stopped", name)
\ No newline at end of file
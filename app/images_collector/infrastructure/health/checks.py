@@ -0,0 +1,79 @@
+import asyncio
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from ...application.services.health_prober import HealthCheck
+from ...domain.ports.image_fetcher import ImageFetcher
+from ...domain.ports.image_repository import ImageRepository
+from ...domain.ports.message_publisher import MessagePublisher
+from ..settings.config import settings
+
+
+def repository_check(repository: ImageRepository) -> HealthCheck:
+    """Comprueba que el almacenamiento responde a una lectura."""
+    async def check():
+        await repository.ping()
+        details = {"storage_type": settings.storage_type}
+        if settings.storage_type == "sqlite":
+            details["db_path"] = settings.sqlite_db_path
+            details["db_exists"] = os.path.isfile(settings.sqlite_db_path)
+        return details
+    return check
+
+
+def broker_check(message_publisher: MessagePublisher) -> HealthCheck:
+    """
+    Comprueba que el broker acepta conexiones TCP y que el publicador no está
+    desviando mensajes a la cola local.
+    """
+    async def check():
+        details = {
+            "backend": settings.messaging_backend,
+            "service_url": settings.pulsar_service_url,
+            "topic": settings.pulsar_image_topic
+        }
+        if settings.messaging_backend == "pulsar":
+            address = urlsplit(settings.pulsar_service_url)
+            _, writer = await asyncio.open_connection(address.hostname, address.port or 6650)
+            writer.close()
+            await writer.wait_closed()
+        
+        stats = message_publisher.stats() if hasattr(message_publisher, "stats") else {}
+        if stats.get("broker_healthy") is False:
+            raise ConnectionError("el publicador está desviando mensajes a la cola local")
+        return details
+    return check
+
+
+def fetcher_check(fetcher: ImageFetcher) -> HealthCheck:
+    """
+    Comprueba las descargas con `health_fetch_probe_url` si está configurada;
+    sin ella solo informa la configuración del pool.
+    """
+    async def check():
+        details = {
+            "timeout_s": settings.fetch_timeout,
+            "max_connections": settings.fetch_max_connections
+        }
+        if settings.health_fetch_probe_url:
+            fetched = await fetcher.fetch(settings.health_fetch_probe_url)
+            details["probe_url"] = settings.health_fetch_probe_url
+            details["probe_bytes"] = len(fetched.content)
+        return details
+    return check
+
+
+def build_health_checks(
+    repository: ImageRepository,
+    fetcher: ImageFetcher,
+    message_publisher: Optional[MessagePublisher] = None
+) -> Dict[str, HealthCheck]:
+    """Comprobaciones de las dependencias de un contenedor."""
+    checks = {
+        "repository": repository_check(repository),
+        "fetcher": fetcher_check(fetcher)
+    }
+    if message_publisher is not None:
+        checks["broker"] = broker_check(message_publisher)
+    return checks
\ No newline at end of file
@@ -1,31 +1,56 @@
-from fastapi import Depends, HTTPException, status
-from typing import List
-import traceback
-import sys
+from fastapi import Depends, Header, HTTPException, Query, Response, status
+from typing import Optional
+import hashlib
+import logging
 
-from ....application.dto.image_dto import ImageDTO
-from ....application.use_cases.image_collector import ImageCollectorUseCase
-from ...repositories.sqlite_image_repository import SQLiteImageRepository
+from ....application.services.admission_controller import AdmissionRejected
+from ....application.dto.image_dto import (
+    ImageDTO,
+    dump_image_json,
+    dump_image_page_json,
+    dump_images_json,
+)
+from ....application.use_cases.image_collector import (
+    MAX_SEARCH_LIMIT,
+    MIN_SEARCH_QUERY_LENGTH,
+    ImageCollectorUseCase,
+)
+from ....domain.ports.image_repository import InvalidCursorError
+from ...settings.config import settings
 from ..dependencies import get_image_use_case
+from ..response_cache import VersionedBodyCache, etag_matches, make_etag
+
+logger = logging.getLogger(__name__)
 
 
 class ImageController:
     """Controlador para los endpoints relacionados con imágenes."""
     
+    def __init__(self):
+        # Listado serializado por versión del catálogo (uno por proceso)
+        self.list_cache = VersionedBodyCache(settings.http_list_cache_entries)
+    
     async def collect_image(
         self,
         image_data: ImageDTO,
         use_case: ImageCollectorUseCase = Depends(get_image_use_case)
-    ) -> ImageDTO:
+    ) -> Response:
         """
         Recolecta una imagen desde la URL proporcionada.
         """
         try:
-            print(f"Procesando imagen desde URL: {image_data.url}")
-            return await use_case.collect_image(image_data)
+            logger.debug("Procesando imagen desde URL: %s", image_data.url)
+            result = await use_case.collect_image(image_data)
+            return Response(content=dump_image_json(result), media_type="application/json")
+        except AdmissionRejected as e:
+            # Rechazo temprano: el cliente reintenta cuando haya capacidad
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
         except Exception as e:
-            print(f"Error al procesar la imagen: {e}")
-            traceback.print_exc(file=sys.stdout)
+            logger.exception("Error al procesar la imagen", extra={"url": str(image_data.url)})
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error al procesar la imagen: {str(e)}"
@@ -33,53 +58,115 @@ class ImageController:
     
     async def get_all_images(
         self,
+        if_none_match: Optional[str] = Header(None),
         use_case: ImageCollectorUseCase = Depends(get_image_use_case)
-    ) -> List[ImageDTO]:
+    ) -> Response:
         """
         Obtiene todas las imágenes almacenadas.
+        
+        La respuesta se serializa directamente a bytes JSON para evitar que
+        FastAPI revalide y vuelva a codificar cada elemento. Si el repositorio
+        mantiene una versión del catálogo, el ETag es esa versión: un cliente
+        con la vigente recibe 304 sin que se lea el catálogo, y el resto
+        comparte el cuerpo guardado para esa versión.
         """
         try:
-            print("Obteniendo todas las imágenes")
-            return await use_case.get_all_images()
+            logger.debug("Obteniendo todas las imágenes")
+            version = await use_case.catalogue_version() if settings.http_etag_enabled else None
+            if version is None:
+                images = await use_case.get_all_images()
+                return Response(content=dump_images_json(images), media_type="application/json")
+            
+            headers = {"ETag": make_etag(version), "Cache-Control": "no-cache"}
+            if etag_matches(if_none_match, headers["ETag"]):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            
+            async def build() -> bytes:
+                return dump_images_json(await use_case.get_all_images())
+            
+            body = await self.list_cache.get_or_build(version, build)
+            return Response(content=body, media_type="application/json", headers=headers)
         except Exception as e:
-            print(f"Error al obtener las imágenes: {e}")
-            traceback.print_exc(file=sys.stdout)
+            logger.exception("Error al obtener las imágenes")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error al obtener las imágenes: {str(e)}"
             )
     
+    async def search_images(
+        self,
+        q: str = Query(..., min_length=MIN_SEARCH_QUERY_LENGTH, description="Texto a buscar en la URL o el nombre de archivo"),
+        limit: int = Query(50, ge=1, le=MAX_SEARCH_LIMIT),
+        cursor: Optional[str] = Query(None, description="Valor `next_cursor` de la página anterior"),
+        use_case: ImageCollectorUseCase = Depends(get_image_use_case)
+    ) -> Response:
+        """
+        Busca imágenes cuya URL o nombre de archivo contenga el texto indicado.
+        """
+        try:
+            logger.debug("Buscando imágenes con: %s", q)
+            page = await use_case.search_images(q, limit, cursor)
+            return Response(content=dump_image_page_json(page), media_type="application/json")
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+        except Exception as e:
+            logger.exception("Error al buscar imágenes", extra={"query": q})
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error al buscar imágenes: {str(e)}"
+            )
+    
     async def get_image_by_id(
         self,
         image_id: str,
+        if_none_match: Optional[str] = Header(None),
         use_case: ImageCollectorUseCase = Depends(get_image_use_case)
-    ) -> ImageDTO:
+    ) -> Response:
         """
         Obtiene una imagen específica por su ID.
+        
+        El ETag es la versión de la fila que mantiene el repositorio y que
+        avanza cada vez que la imagen se vuelve a guardar: un cliente con la
+        vigente recibe 304 sin que se lea ni se serialice la imagen. Si el
+        repositorio no mantiene versiones, el ETag es un resumen del cuerpo.
         """
         try:
-            print(f"Buscando imagen con ID: {image_id}")
-            repository = SQLiteImageRepository()
-            image = await repository.get_by_id(image_id)
+            logger.debug("Buscando imagen con ID: %s", image_id)
+            version = None
+            if settings.http_etag_enabled:
+                version = await use_case.image_version(image_id)
+                if version is not None and etag_matches(if_none_match, make_etag(version)):
+                    return Response(
+                        status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers={"ETag": make_etag(version), "Cache-Control": "no-cache"}
+                    )
+            
+            image = await use_case.get_image_by_id(image_id)
             if not image:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Image with id {image_id} not found"
                 )
             
-            return ImageDTO(
-                id=image.id,
-                url=image.url,
-                file_name=image.file_name,
-                content_type=image.content_type,
-                size=image.size,
-                created_at=image.created_at
-            )
+            body = dump_image_json(image)
+            if not settings.http_etag_enabled:
+                return Response(content=body, media_type="application/json")
+            
+            if version is None:
+                version = hashlib.blake2b(body, digest_size=12).hexdigest()
+            headers = {"ETag": make_etag(version), "Cache-Control": "no-cache"}
+            if etag_matches(if_none_match, headers["ETag"]):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Error al obtener la imagen: {e}")
-            traceback.print_exc(file=sys.stdout)
+            logger.exception("Error al obtener la imagen", extra={"image_id": image_id})
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error al obtener la imagen: {str(e)}"
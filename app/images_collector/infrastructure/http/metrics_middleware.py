@@ -0,0 +1,59 @@
+import time
+
+from ..observability.metrics import HTTP_REQUESTS, HTTP_REQUEST_SECONDS
+from ..observability.request_timing import (
+    current_timings,
+    finish_request_timing,
+    format_server_timing,
+    start_request_timing
+)
+from ..settings.config import settings
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que registra cantidad y duración de las solicitudes por ruta.
+    
+    Se etiqueta con la plantilla de la ruta (`/images/{image_id}`) y no con la
+    URL, para que la cardinalidad de las series no crezca con cada ID.
+    
+    También agrega el encabezado `Server-Timing` con la duración de cada etapa
+    de la recolección (descarga, escritura, base de datos, publicación).
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status_code = 500
+        timing_token = start_request_timing() if settings.server_timing_enabled else None
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if timing_token is not None:
+                    # Las etapas ya terminaron: el cuerpo se envía después del encabezado
+                    value = format_server_timing(current_timings(), time.perf_counter() - start)
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", value.encode("latin-1"))
+                    ]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if timing_token is not None:
+                finish_request_timing(timing_token)
+            # El router guarda la ruta resuelta en el scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUEST_SECONDS.labels(method, path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, path, str(status_code)).inc()
\ No newline at end of file
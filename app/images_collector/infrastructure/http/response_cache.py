@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from ..observability.metrics import LIST_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(version: str) -> str:
+    """ETag fuerte a partir de una versión (sin comillas)."""
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indica si `If-None-Match` incluye el ETag (comparación débil, RFC 9110).
+    
+    Acepta listas separadas por comas, el comodín `*` y ETags débiles (`W/"..."`).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class VersionedBodyCache:
+    """
+    Cuerpos de respuesta serializados, indexados por versión del catálogo.
+    
+    La versión solo avanza, así que basta con conservar las últimas. Cuando
+    cambia, las solicitudes simultáneas comparten una única serialización en
+    lugar de recorrer el catálogo cada una.
+    """
+    
+    def __init__(self, max_entries: int = 4):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+    
+    async def get_or_build(self, version: str, build: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Devuelve el cuerpo de la versión, serializándolo con `build` si no está.
+        
+        `build` debe leer el catálogo después de haber obtenido `version`, para
+        que lo guardado nunca sea más antiguo que la versión bajo la que se guarda.
+        """
+        body = self._entries.get(version)
+        if body is not None:
+            self._entries.move_to_end(version)
+            LIST_CACHE_LOOKUPS.labels("hit").inc()
+            return body
+        
+        pending = self._pending.get(version)
+        if pending is None:
+            LIST_CACHE_LOOKUPS.labels("miss").inc()
+            pending = asyncio.ensure_future(build())
+            self._pending[version] = pending
+            pending.add_done_callback(lambda future: self._store(version, future))
+        else:
+            LIST_CACHE_LOOKUPS.labels("shared").inc()
+        
+        # Cancelar a quien espera no debe cancelar la serialización de los demás
+        return await asyncio.shield(pending)
+    
+    def _store(self, version: str, future: asyncio.Future) -> None:
+        self._pending.pop(version, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.debug("No se guardó la versión %s del listado: %s", version, error)
+            return
+        
+        self._entries[version] = future.result()
+        self._entries.move_to_end(version)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
\ No newline at end of file
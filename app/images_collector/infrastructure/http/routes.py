@@ -1,15 +1,59 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Header, HTTPException, Query, Response, status
+import fcntl
 import os
+import secrets
+import threading
 from pathlib import Path
+from typing import List, Literal, Optional
 
 from ..settings.config import settings
+from ...application.dto.image_dto import ImageDTO, ImagePageDTO
+from ...domain.ports.outbox_repository import OutboxRepository
 from .controllers.image_controller import ImageController
-from ..messaging.pulsar_publisher import PulsarMessagePublisher
+from ..container import ServiceContainer, build_container
+from ..observability.logging_setup import configure_logging, logging_stats
+from ..observability.metrics import CONTENT_TYPE, REGISTRY
+from ..observability.metrics_server import start_worker_metrics_server
+from ..observability.sampling_profiler import ProfilerBusyError, profile
+from .metrics_middleware import MetricsMiddleware
 
 
-def setup_routes() -> FastAPI:
-    """Configura y retorna la aplicación FastAPI con todas las rutas."""
+def _acquire_relay_lock():
+    """
+    Intenta tomar el candado del relay del outbox.
+    
+    Con varios workers de uvicorn todos ejecutan el evento de inicio; solo el
+    que obtiene el candado inicia el relay. No es necesario para no publicar
+    dos veces (los relays reclaman las filas, también entre nodos), pero evita
+    que cada worker del mismo host consulte el outbox. El candado se libera
+    al terminar el proceso, y el worker que uvicorn levante en su lugar lo
+    vuelve a tomar.
+    
+    Returns:
+        El archivo que mantiene el candado, o None si otro proceso lo tiene.
+    """
+    lock_file = open(os.path.join(settings.storage_path, "outbox-relay.lock"), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def setup_routes(container: Optional[ServiceContainer] = None) -> FastAPI:
+    """
+    Configura y retorna la aplicación FastAPI con todas las rutas.
+    
+    Args:
+        container: Dependencias compartidas con otro servidor del mismo proceso.
+            Si no se indica, la aplicación crea las suyas al iniciar y las cierra
+            al terminar.
+    """
+    # Cada worker de uvicorn construye la aplicación en su propio proceso
+    configure_logging()
     app = FastAPI(title="Image Collector API", version="0.1.0")
+    app.add_middleware(MetricsMiddleware)
     
     # Asegurar que los directorios necesarios existen
     storage_path = Path(settings.storage_path)
@@ -19,129 +63,154 @@ def setup_routes() -> FastAPI:
     db_dir = os.path.dirname(settings.sqlite_db_path)
     os.makedirs(db_dir, exist_ok=True)
     
-    # Variable para almacenar el publicador en la aplicación
-    app.state.message_publisher = None
+    # Con un contenedor externo su ciclo de vida (relay incluido) es de quien lo creó
+    app.state.container = container
+    app.state.outbox_relay_lock = None
+    app.state.metrics_server = None
     
     @app.on_event("startup")
     async def startup_event():
-        # Inicializar el publicador de Pulsar si está habilitado
-        if settings.pulsar_enabled:
-            try:
-                from ..messaging.pulsar_publisher import PulsarMessagePublisher
-                app.state.message_publisher = PulsarMessagePublisher()
-                # Pre-inicializar el cliente para asegurarnos que funciona
-                await app.state.message_publisher._get_client()
-                print(f"Pulsar publisher initialized. URL: {settings.pulsar_service_url}")
-            except Exception as e:
-                print(f"Error initializing Pulsar publisher: {e}")
-                app.state.message_publisher = None
+        if container is not None:
+            container.health_prober.start()
+            return
+        app.state.container = await build_container()
+        app.state.container.health_prober.start()
+        
+        # Con varios workers `/metrics` responde el que atiende la conexión:
+        # cada worker expone además las suyas en un puerto propio
+        if settings.http_metrics_port:
+            app.state.metrics_server, _ = await start_worker_metrics_server(
+                settings.http_host, settings.http_metrics_port
+            )
+        
+        # Iniciar el relay del outbox si el repositorio lo soporta
+        if (
+            app.state.container.message_publisher
+            and settings.outbox_enabled
+            and isinstance(app.state.container.repository, OutboxRepository)
+        ):
+            app.state.outbox_relay_lock = _acquire_relay_lock()
+            if app.state.outbox_relay_lock:
+                app.state.container.start_outbox_relay()
 
     @app.on_event("shutdown")
     async def shutdown_event():
-        # Cerrar el publicador de Pulsar si está disponible
-        if app.state.message_publisher:
-            try:
-                await app.state.message_publisher.close()
-                print("Pulsar publisher closed")
-            except Exception as e:
-                print(f"Error closing Pulsar publisher: {e}")
+        if container is not None:
+            return
+        if app.state.metrics_server:
+            app.state.metrics_server.close()
+        # Detiene el relay antes de cerrar el publicador que utiliza
+        await app.state.container.close()
+        if app.state.outbox_relay_lock:
+            app.state.outbox_relay_lock.close()
     
     # Instancia del controlador
     image_controller = ImageController()
     
     # Registro de rutas para imágenes
-    app.post("/images/", tags=["images"])(
+    app.post("/images/", tags=["images"], response_model=ImageDTO)(
         image_controller.collect_image
     )
-    app.get("/images/", tags=["images"])(
+    app.get("/images/", tags=["images"], response_model=List[ImageDTO])(
         image_controller.get_all_images
     )
-    app.get("/images/{image_id}", tags=["images"])(
+    # Debe registrarse antes de /images/{image_id} para no ser capturada por ella
+    app.get("/images/search", tags=["images"], response_model=ImagePageDTO)(
+        image_controller.search_images
+    )
+    app.get("/images/{image_id}", tags=["images"], response_model=ImageDTO)(
         image_controller.get_image_by_id
     )
     
-    # Ruta de salud
+    @app.get("/metrics", tags=["metrics"], include_in_schema=False)
+    async def metrics():
+        """Métricas del proceso en el formato de texto de Prometheus."""
+        return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+    
+    # Rutas de salud: leen los resultados que el HealthProber actualiza en
+    # segundo plano, sin E/S en la solicitud
+    @app.get("/health/live", tags=["health"])
+    async def liveness():
+        """Responde mientras el proceso atiende solicitudes."""
+        return {"status": "ok"}
+    
     @app.get("/health", tags=["health"])
-    async def health_check():
-        # Verifica si la base de datos existe
-        db_exists = os.path.isfile(settings.sqlite_db_path)
-        
-        # Verifica estado de Pulsar
-        pulsar_status = "enabled" if settings.pulsar_enabled else "disabled"
+    async def health_check(response: Response):
+        prober = app.state.container.health_prober
+        snapshot = prober.snapshot()
         
+        # Solo el almacenamiento saca al nodo de rotación: sin broker las
+        # solicitudes siguen atendiéndose y los eventos esperan en el outbox
+        repository = snapshot["checks"]["repository"]
+        if repository["status"] == "error":
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
         return {
-            "status": "ok", 
+            "status": snapshot["status"],
             "storage_type": settings.storage_type,
             "db_path": settings.sqlite_db_path,
-            "db_exists": db_exists,
+            "db_exists": repository.get("db_exists"),
             "pulsar": {
-                "status": pulsar_status,
+                "status": "enabled" if settings.pulsar_enabled else "disabled",
                 "service_url": settings.pulsar_service_url,
                 "topic": settings.pulsar_image_topic
-            }
+            },
+            "checks": snapshot["checks"],
+            # Capacidad de recolección: en curso, en cola y rechazadas
+            "admission": app.state.container.admission.stats() if app.state.container.admission else None,
+            # Registros descartados por cola de logs llena: el colector no da abasto
+            "logging": logging_stats()
         }
     
     @app.get("/health/pulsar", tags=["health"])
-    async def pulsar_health():
-        """Verifica la conexión con Pulsar."""
-        import socket
-        
-        # Extraer host y puerto de la URL de Pulsar
-        pulsar_url = settings.pulsar_service_url
-        if pulsar_url.startswith("pulsar://"):
-            pulsar_url = pulsar_url[9:]  # Quitar 'pulsar://'
-        
-        host, port_str = pulsar_url.split(":")
-        port = int(port_str)
-        
-        # Probar conectividad TCP
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            result = sock.connect_ex((host, port))
-            reachable = result == 0
-            sock.close()
-        except Exception as e:
+    async def pulsar_health(response: Response):
+        """Estado del broker según la última comprobación y métricas del publicador."""
+        container = app.state.container
+        publisher = container.message_publisher
+        if publisher is None:
             return {
-                "status": "error",
-                "error": str(e),
+                "status": "disabled",
                 "pulsar_url": settings.pulsar_service_url,
+                "publisher": None
             }
         
-        # Si podemos alcanzar Pulsar, intentar crear un cliente
-        if reachable and settings.pulsar_enabled:
-            try:
-                # Intenta crear un cliente Pulsar temporal
-                import pulsar
-                client = pulsar.Client(settings.pulsar_service_url)
-                # Intenta listar los tópicos para verificar que funciona
-                admin = pulsar.admin.AdminClient(f"http://{host}:8080")
-                topics = []
-                try:
-                    topics = admin.topics().get_list("public/default")
-                except:
-                    pass
-                client.close()
-                
-                return {
-                    "status": "ok",
-                    "reachable": True,
-                    "pulsar_url": settings.pulsar_service_url,
-                    "topics": topics
-                }
-            except Exception as e:
-                return {
-                    "status": "error",
-                    "reachable": True,
-                    "client_error": str(e),
-                    "pulsar_url": settings.pulsar_service_url
-                }
-        
+        broker = container.health_prober.result("broker")
+        if broker["status"] == "error":
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
         return {
-            "status": "error" if not reachable else "warning",
-            "reachable": reachable,
-            "message": "No se pudo conectar a Pulsar" if not reachable else "Pulsar alcanzable pero no probado completamente",
-            "pulsar_url": settings.pulsar_service_url
+            **broker,
+            "pulsar_url": settings.pulsar_service_url,
+            # Métricas del publicador en uso (latencias, pendientes, reintentos, descartes)
+            "publisher": publisher.stats() if hasattr(publisher, "stats") else None
         }
+    
+    @app.get("/admin/profile", tags=["admin"], include_in_schema=False)
+    async def admin_profile(
+        seconds: float = Query(10.0, gt=0, description="Duración del muestreo"),
+        interval_ms: float = Query(5.0, ge=1, le=1000, description="Milisegundos entre muestras"),
+        threads: Literal["loop", "all"] = Query("loop", description="Solo el event loop o todos los hilos"),
+        x_admin_token: Optional[str] = Header(None)
+    ):
+        """
+        Perfil por muestreo del proceso en ejecución, en formato de pilas
+        colapsadas (flamegraph.pl, speedscope). Requiere `ADMIN_TOKEN`.
+        """
+        # Sin token configurado la ruta no existe
+        if not settings.admin_token:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+        if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Token inválido")
+        if seconds > settings.profile_max_seconds:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La duración máxima es {settings.profile_max_seconds} segundos"
+            )
+        
+        # La ruta corre en el hilo del event loop, que es el que interesa perfilar
+        thread_ids = {threading.get_ident()} if threads == "loop" else None
+        try:
+            collapsed = await profile(seconds, interval_ms / 1000, thread_ids)
+        except ProfilerBusyError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        return Response(content=collapsed, media_type="text/plain; charset=utf-8")
 
     return app
\ No newline at end of file
@@ -17,6 +17,9 @@ TOPIC_PATH = "public/default/eventos-suscripcion"
 FULL_TOPIC_PATH = f"persistent://{TOPIC_PATH}"
 NAMESPACE = "public/default"
 CREATE_TEST_MESSAGE = True  # Crear un mensaje de prueba si se crea el tópico
+# Número de particiones; 0 crea un tópico sin particionar. Con particiones los
+# eventos se rutean por hash de su clave (id de imagen u host de origen)
+PARTITIONS = int(os.environ.get("PULSAR_TOPIC_PARTITIONS", "0"))
 
 def print_section(title):
     """Imprime un título de sección formateado."""
@@ -111,7 +114,14 @@ def create_topic_via_rest():
     """Intenta crear un tópico usando la API REST."""
     print(f"Creando tópico {TOPIC_PATH} vía API REST...")
     try:
-        response = requests.put(f"{ADMIN_URL}/admin/v2/persistent/{TOPIC_PATH}")
+        if PARTITIONS > 0:
+            # Tópico particionado: el cuerpo de la solicitud es el número de particiones
+            response = requests.put(
+                f"{ADMIN_URL}/admin/v2/persistent/{TOPIC_PATH}/partitions",
+                json=PARTITIONS
+            )
+        else:
+            response = requests.put(f"{ADMIN_URL}/admin/v2/persistent/{TOPIC_PATH}")
         if response.status_code in [200, 204]:
             print(f"✅ Tópico {TOPIC_PATH} creado correctamente")
             return True
@@ -133,18 +143,17 @@ def create_topic_via_cli():
         # Determinar si estamos dentro del contenedor o no
         in_container = os.path.exists("/.dockerenv")
         
+        if PARTITIONS > 0:
+            create_args = ["topics", "create-partitioned-topic", FULL_TOPIC_PATH, "-p", str(PARTITIONS)]
+        else:
+            create_args = ["topics", "create", FULL_TOPIC_PATH]
+        
         if in_container:
             # Si estamos dentro de un contenedor, usar el comando directo
-            cmd = [
-                "bin/pulsar-admin", "--admin-url", ADMIN_URL,
-                "topics", "create", FULL_TOPIC_PATH
-            ]
+            cmd = ["bin/pulsar-admin", "--admin-url", ADMIN_URL] + create_args
         else:
             # Si estamos fuera, usar docker exec
-            cmd = [
-                "docker", "exec", "broker", 
-                "bin/pulsar-admin", "topics", "create", FULL_TOPIC_PATH
-            ]
+            cmd = ["docker", "exec", "broker", "bin/pulsar-admin"] + create_args
             
         result = subprocess.run(cmd, capture_output=True, text=True)
         
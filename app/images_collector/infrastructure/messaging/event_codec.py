@@ -0,0 +1,159 @@
+import json
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict
+
+from ...domain.events.image_events import IMAGE_CREATED, IMAGE_CREATED_VERSION
+from ..grpc.protos import images_pb2
+
+# El cliente nativo de Pulsar solo se carga al pedir el esquema: el broker en
+# memoria usa los mismos codificadores sin necesitarlo
+if TYPE_CHECKING:
+    import pulsar
+
+
+class EventCodec(ABC):
+    """Codifica los eventos de integración al formato del tópico."""
+    
+    name: str
+    
+    @abstractmethod
+    def schema(self) -> "pulsar.schema.Schema":
+        """Esquema a registrar en el tópico al crear el productor."""
+        pass
+    
+    @abstractmethod
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        """Serializa el evento a bytes."""
+        pass
+    
+    @abstractmethod
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        """Reconstruye el evento a partir de los bytes publicados."""
+        pass
+
+
+class JsonEventCodec(EventCodec):
+    """Eventos como JSON sin esquema (formato original, para consumidores existentes)."""
+    
+    name = "json"
+    
+    def schema(self) -> "pulsar.schema.Schema":
+        import pulsar
+        
+        return pulsar.schema.BytesSchema()
+    
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        return json.dumps(event, separators=(",", ":")).encode("utf-8")
+    
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return json.loads(data)
+
+
+@lru_cache(maxsize=None)
+def _encoded_protobuf_schema_class() -> type:
+    """Clase del esquema protobuf, definida al primer uso para importar Pulsar tarde."""
+    import pulsar
+    
+    class _EncodedProtobufSchema(pulsar.schema.ProtobufNativeSchema):
+        """
+        Registra el descriptor protobuf en el tópico pero acepta bytes ya
+        serializados, para que el productor no vuelva a codificar el mensaje.
+        """
+        
+        def encode(self, obj):
+            if isinstance(obj, bytes):
+                return obj
+            return super().encode(obj)
+    
+    return _EncodedProtobufSchema
+
+
+class ProtobufEventCodec(EventCodec):
+    """Eventos `image_created` como `ImageCreatedEvent` de `images.proto`."""
+    
+    name = "protobuf"
+    
+    def __init__(self):
+        self._schema = None
+    
+    def schema(self) -> "pulsar.schema.Schema":
+        if self._schema is None:
+            self._schema = _encoded_protobuf_schema_class()(images_pb2.ImageCreatedEvent)
+        return self._schema
+    
+    def encode(self, event: Dict[str, Any]) -> bytes:
+        image = event.get("image") or {}
+        message = images_pb2.ImageCreatedEvent(
+            version=event.get("version", IMAGE_CREATED_VERSION),
+            event_type=event.get("event_type", IMAGE_CREATED),
+            image=images_pb2.ImageResponse(
+                id=image.get("id") or "",
+                url=image.get("url") or "",
+                file_name=image.get("file_name") or "",
+                content_type=image.get("content_type") or "",
+                size=image.get("size") or 0,
+                created_at=image.get("created_at") or ""
+            )
+        )
+        return message.SerializeToString()
+    
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        message = images_pb2.ImageCreatedEvent.FromString(data)
+        image = message.image
+        return {
+            "version": message.version,
+            "event_type": message.event_type,
+            "image": {
+                "id": image.id,
+                "url": image.url,
+                "file_name": image.file_name,
+                "content_type": image.content_type or None,
+                "size": image.size or None,
+                "created_at": image.created_at or None
+            }
+        }
+
+
+def get_event_codec(encoding: str) -> EventCodec:
+    """Retorna el codificador para el formato configurado ("protobuf" o "json")."""
+    if encoding == "protobuf":
+        return ProtobufEventCodec()
+    if encoding == "json":
+        return JsonEventCodec()
+    raise ValueError(f"Formato de evento no soportado: {encoding}")
+
+
+class TopicCodecs:
+    """
+    Codificador de cada tópico, compartido por todos los publicadores.
+    
+    Los eventos de imagen usan el formato configurado; el resto de tópicos se
+    publica como JSON.
+    """
+    
+    def __init__(self, event_encoding: str, image_topic: str):
+        self.image_topic = image_topic
+        self._event_codec = get_event_codec(event_encoding)
+        self._json_codec = JsonEventCodec()
+    
+    def for_topic(self, topic: str) -> EventCodec:
+        """Codificador correspondiente al tópico."""
+        if topic == self.image_topic:
+            return self._event_codec
+        return self._json_codec
+    
+    def encode(self, topic: str, message: Any) -> bytes:
+        """Normaliza el mensaje y lo serializa con el formato del tópico."""
+        return self.for_topic(topic).encode(message_to_dict(message))
+
+
+def message_to_dict(message: Any) -> Dict[str, Any]:
+    """Normaliza un mensaje (diccionario, entidad con `to_dict` o modelo Pydantic) a un diccionario."""
+    if isinstance(message, dict):
+        return message
+    elif hasattr(message, "to_dict") and callable(message.to_dict):
+        return message.to_dict()
+    elif hasattr(message, "model_dump") and callable(message.model_dump):
+        return message.model_dump()
+    return dict(message)
\ No newline at end of file
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from ...domain.ports.message_consumer import MessageConsumer
+from ...domain.ports.message_publisher import MessagePublisher
+from ..registry import AdapterRegistry
+from ..settings.config import settings
+
+# El cliente nativo de Pulsar solo se carga con `messaging_backend=pulsar`
+PUBLISHER_ADAPTERS = AdapterRegistry("publicador", __package__, {
+    "pulsar": ".pulsar_publisher:PulsarMessagePublisher",
+    "loopback": ".loopback:LoopbackMessagePublisher"
+})
+CONSUMER_ADAPTERS = AdapterRegistry("consumidor", __package__, {
+    "pulsar": ".pulsar_consumer:PulsarMessageConsumer",
+    "loopback": ".loopback:LoopbackMessageConsumer"
+})
+
+
+async def create_message_publisher() -> Optional[MessagePublisher]:
+    """
+    Crea el publicador de eventos según `messaging_backend`.
+    
+    Retorna None si la mensajería está deshabilitada. Con Pulsar el cliente se
+    inicializa aquí para detectar errores de configuración al arrancar.
+    """
+    if not settings.pulsar_enabled:
+        return None
+    
+    publisher = PUBLISHER_ADAPTERS.load(settings.messaging_backend).from_settings()
+    if settings.messaging_backend == "pulsar":
+        await publisher._get_client()
+    return publisher
+
+
+def create_collect_consumer() -> MessageConsumer:
+    """Crea el consumidor de solicitudes de recolección según `messaging_backend`."""
+    return CONSUMER_ADAPTERS.load(settings.messaging_backend).from_settings()
\ No newline at end of file
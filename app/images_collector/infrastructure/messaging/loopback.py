@@ -0,0 +1,191 @@
+import asyncio
+import dataclasses
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from ...domain.models.received_message import ReceivedMessage
+from ...domain.ports.message_consumer import MessageConsumer
+from ...domain.ports.message_publisher import MessagePublisher
+from ..settings.config import settings
+from .event_codec import TopicCodecs
+
+
+class LoopbackBroker:
+    """
+    Broker en memoria dentro del proceso, sustituto de Pulsar para pruebas de
+    carga y despliegues sin broker.
+    
+    Cada tópico es una cola acotada compartida por todos sus consumidores
+    (semántica de suscripción Shared). Al llenarse se descartan los mensajes
+    más antiguos.
+    """
+    
+    def __init__(self, max_queue: int = 100000):
+        self.max_queue = max_queue
+        self._topics: Dict[str, asyncio.Queue] = {}
+        self.dropped = 0
+    
+    def topic(self, name: str) -> asyncio.Queue:
+        """Obtiene la cola de un tópico, creándola si no existe."""
+        queue = self._topics.get(name)
+        if queue is None:
+            queue = self._topics[name] = asyncio.Queue(maxsize=self.max_queue)
+        return queue
+    
+    def put(self, topic: str, message: ReceivedMessage) -> None:
+        """Encola un mensaje en el tópico."""
+        queue = self.topic(topic)
+        if queue.full():
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(message)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Mensajes pendientes por tópico y descartados por cola llena."""
+        return {
+            "topics": {name: queue.qsize() for name, queue in self._topics.items()},
+            "dropped": self.dropped
+        }
+
+
+_broker: Optional[LoopbackBroker] = None
+
+
+def get_loopback_broker() -> LoopbackBroker:
+    """Broker en memoria compartido por todo el proceso."""
+    global _broker
+    if _broker is None:
+        _broker = LoopbackBroker(max_queue=settings.loopback_max_queue)
+    return _broker
+
+
+class LoopbackMessagePublisher(MessagePublisher):
+    """
+    Publicador sobre el broker en memoria.
+    
+    Codifica los mensajes igual que `PulsarMessagePublisher` y permite simular
+    la latencia del broker y fallos de publicación, de modo que las mediciones
+    separan el costo propio del publicador del costo del broker.
+    """
+    
+    def __init__(
+        self,
+        broker: Optional[LoopbackBroker] = None,
+        latency_ms: float = 0.0,
+        failure_rate: float = 0.0
+    ):
+        self.broker = broker or get_loopback_broker()
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self._codecs = TopicCodecs(settings.pulsar_event_encoding, settings.pulsar_image_topic)
+        self._published_count = 0
+        self._failed_count = 0
+        self._published_bytes = 0
+        self._started_at: Optional[float] = None
+    
+    @classmethod
+    def from_settings(cls) -> "LoopbackMessagePublisher":
+        """Publicador sobre el broker del proceso con la latencia y fallos configurados."""
+        return cls(
+            latency_ms=settings.loopback_latency_ms,
+            failure_rate=settings.loopback_failure_rate
+        )
+    
+    def _enqueue(self, topic: str, message: Any) -> bool:
+        """Codifica y encola un mensaje, aplicando la inyección de fallos."""
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        
+        if self.failure_rate and random.random() < self.failure_rate:
+            self._failed_count += 1
+            return False
+        
+        data = self._codecs.encode(topic, message)
+        self.broker.put(topic, ReceivedMessage(data=data))
+        self._published_count += 1
+        self._published_bytes += len(data)
+        return True
+    
+    async def publish(self, topic: str, message: Any) -> bool:
+        """Publica un mensaje en el broker en memoria."""
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._enqueue(topic, message)
+    
+    async def publish_many(self, topic: str, messages: Sequence[Any]) -> List[bool]:
+        """Publica un lote pagando la latencia simulada una sola vez, como un envío en lote."""
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return [self._enqueue(topic, message) for message in messages]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de publicación y throughput desde el primer mensaje."""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "published": self._published_count,
+            "failed": self._failed_count,
+            "bytes": self._published_bytes,
+            "messages_per_second": round(self._published_count / elapsed, 1) if elapsed else 0.0,
+            "broker": self.broker.stats()
+        }
+    
+    async def close(self) -> None:
+        """No hay conexiones que cerrar."""
+        pass
+
+
+class LoopbackMessageConsumer(MessageConsumer):
+    """Consumidor sobre el broker en memoria, con la misma interfaz que el de Pulsar."""
+    
+    def __init__(
+        self,
+        topic: str,
+        broker: Optional[LoopbackBroker] = None,
+        batch_size: int = 100,
+        batch_timeout_ms: int = 1000,
+        negative_ack_delay_ms: int = 60000
+    ):
+        self.topic = topic
+        self.broker = broker or get_loopback_broker()
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
+        self.negative_ack_delay_ms = negative_ack_delay_ms
+        self.acknowledged = 0
+        self.negative_acknowledged = 0
+    
+    @classmethod
+    def from_settings(cls) -> "LoopbackMessageConsumer":
+        """Consumidor del tópico de solicitudes de recolección."""
+        return cls(
+            settings.pulsar_collect_topic,
+            batch_size=settings.worker_batch_size,
+            negative_ack_delay_ms=settings.worker_negative_ack_delay_ms
+        )
+    
+    async def receive_batch(self) -> List[ReceivedMessage]:
+        """Espera el primer mensaje hasta el timeout y toma los disponibles hasta `batch_size`."""
+        queue = self.broker.topic(self.topic)
+        try:
+            first = await asyncio.wait_for(queue.get(), timeout=self.batch_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            return []
+        
+        batch = [first]
+        while len(batch) < self.batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+    
+    async def acknowledge(self, message: ReceivedMessage) -> None:
+        self.acknowledged += 1
+    
+    async def negative_acknowledge(self, message: ReceivedMessage) -> None:
+        """Reencola el mensaje tras el retardo de reenvío configurado."""
+        self.negative_acknowledged += 1
+        redelivery = dataclasses.replace(message, redelivery_count=message.redelivery_count + 1)
+        asyncio.get_running_loop().call_later(
+            self.negative_ack_delay_ms / 1000, self.broker.put, self.topic, redelivery
+        )
+    
+    async def close(self) -> None:
+        pass
\ No newline at end of file
@@ -0,0 +1,105 @@
+from typing import Any, Dict, Optional
+
+from ..observability.metrics import (
+    PUBLISH_DROPPED,
+    PUBLISH_PENDING,
+    PUBLISH_RETRIES,
+    PUBLISH_SEND_ERRORS,
+    PUBLISH_SEND_SECONDS
+)
+
+
+class TopicPublishMetrics:
+    """
+    Métricas de publicación de un tópico.
+    
+    Registra latencia, mensajes pendientes, reintentos y descartes en las series
+    del tópico en el registro del proceso (las que expone `/metrics`) y guarda
+    los contadores propios del publicador para `stats()`.
+    """
+    
+    def __init__(self, topic: str, max_pending: int):
+        self.max_pending = max_pending
+        self.latency = PUBLISH_SEND_SECONDS.labels(topic)
+        self._pending_gauge = PUBLISH_PENDING.labels(topic)
+        self._retries_counter = PUBLISH_RETRIES.labels(topic)
+        self._dropped_counter = PUBLISH_DROPPED.labels(topic)
+        self._topic = topic
+        self.pending = 0
+        self.pending_peak = 0
+        self.sent = 0
+        self.send_errors: Dict[str, int] = {}
+        self.retries = 0
+        self.dropped = 0
+    
+    def send_started(self) -> None:
+        self.pending += 1
+        self._pending_gauge.inc()
+        if self.pending > self.pending_peak:
+            self.pending_peak = self.pending
+    
+    def send_finished(self, seconds: float, error: Optional[str] = None) -> None:
+        self.pending -= 1
+        self._pending_gauge.dec()
+        if error is None:
+            self.sent += 1
+            self.latency.observe(seconds)
+        else:
+            self.send_errors[error] = self.send_errors.get(error, 0) + 1
+            PUBLISH_SEND_ERRORS.labels(self._topic, error).inc()
+    
+    def retried(self) -> None:
+        self.retries += 1
+        self._retries_counter.inc()
+    
+    def dropped_message(self) -> None:
+        self.dropped += 1
+        self._dropped_counter.inc()
+    
+    def _latency_quantile_ms(self, q: float) -> Optional[float]:
+        """
+        Estimación del cuantil `q` (límite superior del bucket que lo contiene);
+        None si cae por encima del último bucket.
+        """
+        if not self.latency.count:
+            return 0.0
+        target = q * self.latency.count
+        cumulative = 0
+        for bound, count in zip(self.latency.buckets, self.latency.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound * 1000
+        return None
+    
+    def _latency_snapshot(self) -> Dict[str, Any]:
+        """Buckets acumulados y resumen de la distribución, en milisegundos."""
+        histogram = self.latency
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            buckets[f"{bound * 1000:g}"] = cumulative
+        buckets["+Inf"] = histogram.count
+        sum_ms = histogram.sum * 1000
+        return {
+            "count": histogram.count,
+            "sum_ms": round(sum_ms, 3),
+            "avg_ms": round(sum_ms / histogram.count, 3) if histogram.count else 0.0,
+            "p50_ms": self._latency_quantile_ms(0.5),
+            "p99_ms": self._latency_quantile_ms(0.99),
+            "buckets_ms": buckets
+        }
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "send_errors": dict(self.send_errors),
+            "retries": self.retries,
+            "dropped": self.dropped,
+            # Ocupación de la cola del productor: cerca de 1 indica contrapresión del broker
+            "pending": self.pending,
+            "pending_peak": self.pending_peak,
+            "max_pending": self.max_pending,
+            "pending_ratio": round(self.pending / self.max_pending, 3) if self.max_pending else 0.0,
+            "latency": self._latency_snapshot()
+        }
\ No newline at end of file
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import pulsar
+from typing import List, Optional
+
+from ...domain.models.received_message import ReceivedMessage
+from ...domain.ports.message_consumer import MessageConsumer
+from ..settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PulsarMessageConsumer(MessageConsumer):
+    """
+    Consumidor de Pulsar con suscripción compartida y recepción por lotes.
+    
+    Las llamadas bloqueantes del cliente (suscripción y `batch_receive`) se
+    ejecutan en un hilo para no detener el bucle de eventos.
+    """
+    
+    def __init__(
+        self,
+        topic: str,
+        subscription: str,
+        subscription_type: str = "Key_Shared",
+        batch_size: int = 100,
+        batch_timeout_ms: int = 1000,
+        negative_ack_delay_ms: int = 60000,
+        max_redeliveries: int = 0
+    ):
+        self.topic = topic
+        self.subscription = subscription
+        self.subscription_type = subscription_type
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
+        self.negative_ack_delay_ms = negative_ack_delay_ms
+        self.max_redeliveries = max_redeliveries
+        self._client: Optional[pulsar.Client] = None
+        self._consumer: Optional[pulsar.Consumer] = None
+        self._lock = asyncio.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> "PulsarMessageConsumer":
+        """Consumidor de la suscripción de solicitudes de recolección."""
+        return cls(
+            settings.pulsar_collect_topic,
+            settings.pulsar_collect_subscription,
+            subscription_type=settings.pulsar_collect_subscription_type,
+            batch_size=settings.worker_batch_size,
+            negative_ack_delay_ms=settings.worker_negative_ack_delay_ms,
+            max_redeliveries=settings.worker_max_redeliveries
+        )
+    
+    def _subscribe(self):
+        """Crea el cliente y la suscripción (bloqueante)."""
+        client = pulsar.Client(
+            settings.pulsar_service_url,
+            operation_timeout_seconds=5,
+            io_threads=2,
+            message_listener_threads=1
+        )
+        # Tras `max_redeliveries` reenvíos el mensaje pasa al tópico de mensajes
+        # fallidos en lugar de reintentarse indefinidamente
+        dead_letter_policy = None
+        if self.max_redeliveries > 0:
+            dead_letter_policy = pulsar.ConsumerDeadLetterPolicy(self.max_redeliveries)
+        try:
+            consumer = client.subscribe(
+                self.topic,
+                self.subscription,
+                consumer_type=getattr(pulsar.ConsumerType, self.subscription_type),
+                # Prefetch acotado: un worker ocupado no acapara mensajes que
+                # otros workers podrían procesar
+                receiver_queue_size=self.batch_size * 2,
+                negative_ack_redelivery_delay_ms=self.negative_ack_delay_ms,
+                batch_receive_policy=pulsar.ConsumerBatchReceivePolicy(
+                    self.batch_size, -1, self.batch_timeout_ms
+                ),
+                initial_position=pulsar.InitialPosition.Earliest,
+                dead_letter_policy=dead_letter_policy
+            )
+        except Exception:
+            client.close()
+            raise
+        return client, consumer
+    
+    async def _get_consumer(self) -> pulsar.Consumer:
+        """Obtiene la suscripción, creándola en el primer uso."""
+        async with self._lock:
+            if self._consumer is None:
+                loop = asyncio.get_running_loop()
+                self._client, self._consumer = await loop.run_in_executor(None, self._subscribe)
+                logger.info("Suscrito a %s como '%s' (%s)", self.topic, self.subscription, self.subscription_type)
+        return self._consumer
+    
+    async def receive_batch(self) -> List[ReceivedMessage]:
+        """Recibe hasta `batch_size` mensajes o lo que llegue dentro del timeout."""
+        consumer = await self._get_consumer()
+        loop = asyncio.get_running_loop()
+        messages = await loop.run_in_executor(None, consumer.batch_receive)
+        return [
+            ReceivedMessage(
+                data=message.data(),
+                key=message.partition_key() or None,
+                redelivery_count=message.redelivery_count(),
+                handle=message
+            )
+            for message in messages
+        ]
+    
+    async def acknowledge(self, message: ReceivedMessage) -> None:
+        # acknowledge() espera al broker: se ejecuta en un hilo
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._consumer.acknowledge, message.handle)
+    
+    async def negative_acknowledge(self, message: ReceivedMessage) -> None:
+        # El reenvío diferido lo gestiona el cliente localmente, no bloquea
+        self._consumer.negative_acknowledge(message.handle)
+    
+    async def close(self) -> None:
+        """Cierra la suscripción y el cliente."""
+        consumer, client = self._consumer, self._client
+        self._consumer, self._client = None, None
+        if consumer is None:
+            return
+        
+        def _close_sync():
+            try:
+                consumer.close()
+            finally:
+                client.close()
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _close_sync)
\ No newline at end of file
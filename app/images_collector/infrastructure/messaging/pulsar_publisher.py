@@ -1,10 +1,28 @@
 import asyncio
-import json
+import functools
+import logging
+import os
+import time
 import pulsar
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set
+from urllib.parse import urlparse
 
 from ...domain.ports.message_publisher import MessagePublisher
 from ..settings.config import settings
+from .event_codec import TopicCodecs, message_to_dict
+from .publisher_metrics import TopicPublishMetrics
+from .spill_queue import SpillQueue, open_spill_queue
+
+logger = logging.getLogger(__name__)
+
+
+class PulsarPublishError(Exception):
+    """Error reportado por el broker al confirmar un envío asíncrono."""
+    
+    def __init__(self, result):
+        self.result = result
+        super().__init__(f"Pulsar rechazó el mensaje: {result}")
 
 
 class PulsarMessagePublisher(MessagePublisher):
@@ -13,9 +31,52 @@ class PulsarMessagePublisher(MessagePublisher):
     def __init__(self):
         self._client = None
         self._producers = {}
+        self._producer_locks: Dict[str, asyncio.Lock] = {}
         self._connection_lock = asyncio.Lock()
         self._max_retries = 3
         self._retry_delay = 1.0  # segundos
+        
+        # Modo "fire_and_confirm": publish() retorna al encolar el envío y la
+        # confirmación del broker se procesa en segundo plano
+        self._fire_and_confirm = settings.pulsar_publish_mode == "fire_and_confirm"
+        self._pending_confirmations: Set[asyncio.Task] = set()
+        self._confirmed_count = 0
+        self._failed_count = 0
+        
+        # Métricas por tópico: latencia de envío, mensajes pendientes frente al
+        # límite del productor, reintentos y descartes
+        self._max_pending_messages = 1000
+        self._topic_metrics: Dict[str, TopicPublishMetrics] = {}
+        self._reset_count = 0
+        
+        # Los eventos de imagen usan el formato configurado (protobuf con esquema
+        # registrado por defecto); el resto de tópicos se publica como JSON
+        self._codecs = TopicCodecs(settings.pulsar_event_encoding, settings.pulsar_image_topic)
+        
+        # Clave de ruteo: los eventos con la misma clave van a la misma partición
+        # y, con suscripciones Key_Shared, al mismo consumidor y en orden
+        self._routing_key = settings.pulsar_routing_key
+        self._last_sequence_id = 0
+        
+        # Cola local en disco: si el broker no está disponible los eventos se
+        # guardan ahí de inmediato y un drenador los reenvía en orden al volver
+        self._spill = None
+        if settings.pulsar_spill_enabled:
+            self._spill = open_spill_queue(
+                settings.pulsar_spill_path or os.path.join(settings.storage_path, "spill"),
+                segment_max_bytes=settings.pulsar_spill_segment_bytes,
+                max_total_bytes=settings.pulsar_spill_max_bytes
+            )
+        self._broker_healthy = True
+        self._spill_in_flight = 0
+        self._spilled_count = 0
+        self._drainer: Optional[asyncio.Task] = None
+        self._drain_wakeup: Optional[asyncio.Event] = None
+    
+    @classmethod
+    def from_settings(cls) -> "PulsarMessagePublisher":
+        """Publicador configurado a partir de `settings` (lo lee el constructor)."""
+        return cls()
     
     def _get_running_loop(self):
         """Obtiene el bucle de eventos actual o crea uno nuevo si no existe."""
@@ -32,131 +93,593 @@ class PulsarMessagePublisher(MessagePublisher):
         async with self._connection_lock:
             if self._client is None:
                 try:
-                    # Configuración del cliente sin el parámetro incompatible
-                    self._client = pulsar.Client(
-                        settings.pulsar_service_url,
-                        operation_timeout_seconds=5,
-                        # Eliminar: connection_timeout_seconds=5
-                        io_threads=2,
-                        message_listener_threads=1
+                    # La creación del cliente resuelve DNS y arranca hilos de I/O,
+                    # por lo que se ejecuta fuera del bucle de eventos
+                    loop = self._get_running_loop()
+                    self._client = await loop.run_in_executor(
+                        None,
+                        functools.partial(
+                            pulsar.Client,
+                            settings.pulsar_service_url,
+                            operation_timeout_seconds=5,
+                            io_threads=2,
+                            message_listener_threads=1
+                        )
                     )
-                    print(f"Cliente Pulsar creado y conectado a {settings.pulsar_service_url}")
+                    logger.info("Cliente Pulsar creado y conectado a %s", settings.pulsar_service_url)
                 except Exception as e:
-                    print(f"Error al crear cliente Pulsar: {e}")
+                    logger.error("Error al crear cliente Pulsar: %s", e)
                     self._client = None
                     raise
+                finally:
+                    # Reenviar lo que haya quedado en disco de ejecuciones anteriores
+                    self._ensure_drainer()
         return self._client
     
     async def _get_producer(self, topic: str):
         """Obtiene o crea un productor para un tópico específico con configuración optimizada."""
-        if topic not in self._producers:
-            try:
-                client = await self._get_client()
-                
-                # Crear productor directamente (sin asyncio.run_in_executor)
-                # Esto previene problemas de bloqueo y mejora la fiabilidad
-                self._producers[topic] = client.create_producer(
-                    topic,
-                    schema=pulsar.schema.BytesSchema(),
-                    send_timeout_millis=3000,           # Timeout más corto para detectar errores rápido
-                    block_if_queue_full=False,          # No bloquear para evitar deadlocks
-                    batching_enabled=True,              # Habilitar batching para mejor throughput
-                    batching_max_publish_delay_ms=10,   # Delay corto para envío rápido
-                    max_pending_messages=1000,          # Limitar mensajes pendientes
-                    max_pending_messages_across_partitions=50000
-                )
-                print(f"Productor creado para topic: {topic}")
-            except Exception as e:
-                print(f"Error al crear productor para {topic}: {e}")
-                if topic in self._producers:
-                    del self._producers[topic]
-                raise
-                
+        producer = self._producers.get(topic)
+        if producer is not None:
+            return producer
+        
+        # Un lock por tópico evita crear dos productores en paralelo para el mismo tópico
+        lock = self._producer_locks.setdefault(topic, asyncio.Lock())
+        async with lock:
+            if topic not in self._producers:
+                try:
+                    client = await self._get_client()
+                    
+                    # create_producer espera la respuesta del broker: se ejecuta
+                    # en un hilo para no bloquear el bucle de eventos
+                    loop = self._get_running_loop()
+                    self._producers[topic] = await loop.run_in_executor(
+                        None,
+                        functools.partial(
+                            client.create_producer,
+                            topic,
+                            schema=self._codecs.for_topic(topic).schema(),
+                            # En tópicos particionados los mensajes con clave se
+                            # rutean por hash de la clave; sin clave, round robin
+                            message_routing_mode=pulsar.PartitionsRoutingMode.RoundRobinDistribution,
+                            # Lotes por clave: requisito para consumir con Key_Shared
+                            batching_type=(
+                                pulsar.BatchingType.KeyBased
+                                if self._routing_key != "none"
+                                else pulsar.BatchingType.Default
+                            ),
+                            send_timeout_millis=3000,           # Timeout más corto para detectar errores rápido
+                            block_if_queue_full=False,          # No bloquear para evitar deadlocks
+                            batching_enabled=True,              # Habilitar batching para mejor throughput
+                            batching_max_publish_delay_ms=10,   # Delay corto para envío rápido
+                            max_pending_messages=self._max_pending_messages,  # Limitar mensajes pendientes
+                            max_pending_messages_across_partitions=50000
+                        )
+                    )
+                    logger.info("Productor creado para topic: %s", topic)
+                except Exception as e:
+                    logger.error("Error al crear productor para %s: %s", topic, e)
+                    if topic in self._producers:
+                        del self._producers[topic]
+                    raise
+        
         return self._producers[topic]
     
+    def _metrics(self, topic: str) -> TopicPublishMetrics:
+        """Métricas del tópico, creándolas en el primer uso."""
+        metrics = self._topic_metrics.get(topic)
+        if metrics is None:
+            metrics = self._topic_metrics[topic] = TopicPublishMetrics(topic, self._max_pending_messages)
+        return metrics
+    
+    def _send_async(self, topic: str, producer, data: bytes, options: Dict[str, Any]) -> asyncio.Future:
+        """Envía un mensaje con send_async y retorna un futuro de asyncio con el ack."""
+        loop = self._get_running_loop()
+        future = loop.create_future()
+        metrics = self._metrics(topic)
+        started = time.perf_counter()
+        
+        def _resolve(result, message_id, elapsed):
+            # Se ejecuta en el bucle de eventos: las métricas no necesitan lock
+            if result == pulsar.Result.Ok:
+                metrics.send_finished(elapsed)
+            else:
+                metrics.send_finished(elapsed, error=result.name)
+            if future.done():
+                return
+            if result == pulsar.Result.Ok:
+                future.set_result(message_id)
+            else:
+                future.set_exception(PulsarPublishError(result))
+        
+        def _callback(result, message_id):
+            # El callback se ejecuta en un hilo de I/O de Pulsar
+            elapsed = time.perf_counter() - started
+            loop.call_soon_threadsafe(_resolve, result, message_id, elapsed)
+        
+        metrics.send_started()
+        try:
+            producer.send_async(data, _callback, **options)
+        except Exception as e:
+            metrics.send_finished(time.perf_counter() - started, error=type(e).__name__)
+            raise
+        return future
+    
+    def _next_sequence_id(self) -> int:
+        """
+        Identificador de secuencia creciente, basado en microsegundos para que
+        siga creciendo entre reinicios (requisito de la deduplicación del broker).
+        """
+        self._last_sequence_id = max(self._last_sequence_id + 1, time.time_ns() // 1000)
+        return self._last_sequence_id
+    
+    def _message_options(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Clave de ruteo, tiempo del evento y secuencia para el envío de un mensaje."""
+        options: Dict[str, Any] = {"sequence_id": self._next_sequence_id()}
+        entity = payload.get("image")
+        if not isinstance(entity, dict):
+            entity = payload
+        
+        key = None
+        if self._routing_key == "image_id":
+            key = entity.get("id")
+        elif self._routing_key == "origin_host" and entity.get("url"):
+            key = urlparse(entity["url"]).hostname
+        if key:
+            options["partition_key"] = str(key)
+        
+        created_at = entity.get("created_at")
+        if isinstance(created_at, str):
+            try:
+                created_at = datetime.fromisoformat(created_at)
+            except ValueError:
+                created_at = None
+        if isinstance(created_at, datetime):
+            options["event_timestamp"] = int(created_at.timestamp() * 1000)
+        return options
+    
+    def _encode(self, topic: str, payload: Dict[str, Any]) -> bytes:
+        """Serializa el mensaje con el formato del tópico."""
+        return self._codecs.encode(topic, payload)
+    
     async def publish(self, topic: str, message: Any) -> bool:
         """Publica un mensaje en un tópico de Pulsar con reintentos limitados."""
+        payload = message_to_dict(message)
+        
+        # Broker no disponible (o eventos previos aún en disco): ir directo a la
+        # cola local para no esperar reintentos ni alterar el orden
+        if self._spill is not None and self._should_spill():
+            return await self._spill_event(topic, payload)
+        
+        # Serializar una única vez
+        data = self._encode(topic, payload)
+        options = self._message_options(payload)
+        
+        if not self._fire_and_confirm:
+            if self._spill is None:
+                return await self._publish_with_retries(topic, data, options)
+            return await self._publish_or_spill(topic, payload, data, options)
+        
+        # Si ya hay productor, encolar el envío ahora (conserva el orden);
+        # la creación del productor y la confirmación ocurren en segundo plano
+        ack = None
+        producer = self._producers.get(topic)
+        if producer is not None:
+            try:
+                ack = self._send_async(topic, producer, data, options)
+            except Exception as e:
+                logger.error("Error encolando mensaje en %s: %s", topic, e)
+        
+        self._track_confirmation(topic, payload, data, options, ack)
+        return True
+    
+    async def _publish_or_spill(
+        self,
+        topic: str,
+        payload: Dict[str, Any],
+        data: bytes,
+        options: Dict[str, Any]
+    ) -> bool:
+        """
+        Publica con cola local sin que la solicitud espere al broker más de lo necesario.
+        
+        No se conecta ni crea productores en la solicitud: sin productor listo el
+        evento va a disco y el drenador conecta en segundo plano. Si el ack no
+        llega en `pulsar_publish_ack_timeout`, la solicitud continúa y la
+        confirmación (o el paso a disco si falla) se resuelve en segundo plano.
+        """
+        producer = self._producers.get(topic)
+        if producer is None:
+            return await self._spill_event(topic, payload)
+        
+        try:
+            ack = self._send_async(topic, producer, data, options)
+        except Exception as e:
+            await self._mark_unhealthy(topic, e)
+            return await self._spill_event(topic, payload)
+        
+        try:
+            await asyncio.wait_for(asyncio.shield(ack), settings.pulsar_publish_ack_timeout)
+        except asyncio.TimeoutError:
+            # Broker lento o caído: las publicaciones siguientes van a disco
+            # hasta que el drenador lo compruebe
+            if self._broker_healthy:
+                logger.warning("El broker no confirmó a tiempo en %s, usando cola local", topic)
+            self._broker_healthy = False
+            self._track_confirmation(topic, payload, data, options, ack)
+            return True
+        except Exception as e:
+            await self._mark_unhealthy(topic, e)
+            return await self._spill_event(topic, payload)
+        
+        self._confirmed_count += 1
+        return True
+    
+    def _track_confirmation(
+        self,
+        topic: str,
+        payload: Dict[str, Any],
+        data: bytes,
+        options: Dict[str, Any],
+        ack: Optional[asyncio.Future]
+    ) -> None:
+        """Espera en segundo plano la confirmación de un envío ya encolado."""
+        task = asyncio.create_task(self._confirm(topic, payload, data, options, ack))
+        self._pending_confirmations.add(task)
+        task.add_done_callback(self._pending_confirmations.discard)
+    
+    async def publish_many(self, topic: str, messages: Sequence[Any]) -> List[bool]:
+        """
+        Publica un lote de mensajes encolando todos los envíos antes de esperar
+        los acks, de modo que el lote cuesta un viaje al broker y no uno por mensaje.
+        
+        A diferencia de `publish`, siempre espera las confirmaciones para poder
+        retornar el resultado de cada mensaje. Sin cola local los fallidos no se
+        reintentan aquí: se retornan como False y quien llama (el relay del
+        outbox) los reintenta en su siguiente ciclo, sin que una caída del
+        broker bloquee el lote con los reintentos de cada mensaje.
+        """
+        payloads = [message_to_dict(message) for message in messages]
+        if not payloads:
+            return []
+        
+        if self._spill is not None and self._should_spill():
+            return [await self._spill_event(topic, payload) for payload in payloads]
+        
+        encoded = [(self._encode(topic, payload), self._message_options(payload)) for payload in payloads]
+        results: List[Any]
+        try:
+            producer = await self._get_producer(topic)
+            acks = [self._send_async(topic, producer, data, options) for data, options in encoded]
+            results = await asyncio.gather(*acks, return_exceptions=True)
+        except Exception as e:
+            results = [e] * len(payloads)
+        
+        published = [not isinstance(result, BaseException) for result in results]
+        self._confirmed_count += sum(published)
+        failed = [index for index, ok in enumerate(published) if not ok]
+        if not failed:
+            return published
+        
+        # Los mensajes fallidos van a la cola local o se retornan para reintentarlos
+        error = results[failed[0]]
+        logger.warning("Fallaron %s de %s mensajes del lote en %s: %s", len(failed), len(payloads), topic, error)
+        if self._spill is not None:
+            await self._mark_unhealthy(topic, error)
+            for index in failed:
+                published[index] = await self._spill_event(topic, payloads[index])
+        elif self._is_connection_error(error):
+            # Forzar la reconexión para el siguiente intento
+            await self._reset_connection()
+        return published
+    
+    @staticmethod
+    def _is_connection_error(error: BaseException) -> bool:
+        """Indica si el error se debe a la conexión con el broker."""
+        if isinstance(error, (pulsar.ConnectError, pulsar.Timeout)):
+            return True
+        return isinstance(error, PulsarPublishError) and error.result in (
+            pulsar.Result.ConnectError, pulsar.Result.NotConnected,
+            pulsar.Result.AlreadyClosed, pulsar.Result.Timeout
+        )
+    
+    async def _confirm(
+        self,
+        topic: str,
+        payload: Dict[str, Any],
+        data: bytes,
+        options: Dict[str, Any],
+        ack: Optional[asyncio.Future]
+    ) -> None:
+        """Espera la confirmación de un envío en modo fire_and_confirm y reintenta si falla."""
+        if ack is not None:
+            try:
+                await ack
+                self._confirmed_count += 1
+                return
+            except Exception as e:
+                logger.warning("Confirmación fallida en %s, reintentando: %s", topic, e)
+        
+        if self._spill is None:
+            await self._publish_with_retries(topic, data, options)
+            return
+        
+        try:
+            if self._should_spill():
+                raise ConnectionError("Broker marcado como no disponible")
+            await self._send_once(topic, data, options)
+        except Exception as e:
+            await self._mark_unhealthy(topic, e)
+            await self._spill_event(topic, payload)
+    
+    async def _send_once(self, topic: str, data: bytes, options: Dict[str, Any]) -> None:
+        """Envía los bytes una sola vez y espera el ack del broker."""
+        producer = await self._get_producer(topic)
+        await self._send_async(topic, producer, data, options)
+        self._confirmed_count += 1
+    
+    async def _publish_with_retries(self, topic: str, data: bytes, options: Dict[str, Any]) -> bool:
+        """Envía los bytes y espera el ack del broker, reintentando ante errores."""
         retries = 0
         last_exception = None
         
         while retries <= self._max_retries:
             try:
-                # Preparar los datos
-                if isinstance(message, dict):
-                    data_to_send = message
-                elif hasattr(message, "to_dict") and callable(message.to_dict):
-                    data_to_send = message.to_dict()
-                elif hasattr(message, "model_dump") and callable(message.model_dump):
-                    data_to_send = message.model_dump()
-                else:
-                    data_to_send = dict(message)
-                
-                # Serializar a JSON
-                json_bytes = json.dumps(data_to_send).encode('utf-8')
-                
                 # Obtener productor (o crear uno nuevo)
                 producer = await self._get_producer(topic)
                 
-                # Enviar mensaje de forma síncrona con timeout
-                # Esto garantiza confirmación inmediata o error rápido
-                producer.send(json_bytes)
+                # Enviar de forma asíncrona y esperar el ack sin bloquear el bucle
+                await self._send_async(topic, producer, data, options)
                 
-                print(f"Mensaje publicado en {topic}: {json.dumps(data_to_send)[:100]}...")
+                self._confirmed_count += 1
+                logger.debug("Mensaje publicado en %s (%s bytes)", topic, len(data))
                 return True
-                
+            
             except pulsar.ConnectError as e:
                 # Error de conexión, intentar reconectar
-                print(f"Error de conexión al publicar en {topic} (intento {retries+1}/{self._max_retries+1}): {e}")
+                logger.warning(
+                    "Error de conexión al publicar en %s (intento %s/%s): %s",
+                    topic, retries + 1, self._max_retries + 1, e
+                )
                 last_exception = e
                 
                 # Cerrar cliente para forzar reconexión
                 await self._reset_connection()
-                
+            
             except Exception as e:
                 # Otros errores (problema con el broker)
-                print(f"Error publicando mensaje en {topic} (intento {retries+1}/{self._max_retries+1}): {e}")
-                print(f"Detalles: {type(e).__name__}")
+                logger.warning(
+                    "Error publicando mensaje en %s (intento %s/%s): %s",
+                    topic, retries + 1, self._max_retries + 1, e,
+                    extra={"error_type": type(e).__name__}
+                )
                 
                 # Si el error es de Bookkeeper, puede ser problema del broker
                 if "bookies" in str(e).lower() or "ManagedLedgerException" in str(e):
-                    print("Error de BookKeeper detectado, esperando a que el broker se estabilice")
+                    logger.warning("Error de BookKeeper detectado, esperando a que el broker se estabilice")
                     # Esperar más tiempo para permitir que el sistema se recupere
                     await asyncio.sleep(self._retry_delay * 2)
                     await self._reset_connection()
+                elif isinstance(e, PulsarPublishError) and e.result in (
+                    pulsar.Result.ConnectError, pulsar.Result.NotConnected, pulsar.Result.AlreadyClosed
+                ):
+                    # Los errores de conexión llegan por el callback: forzar reconexión
+                    await self._reset_connection()
                 
                 last_exception = e
             
             # Incrementar contador de reintentos y esperar antes de reintentar
             retries += 1
             if retries <= self._max_retries:
+                self._metrics(topic).retried()
                 await asyncio.sleep(self._retry_delay)
         
         # Si llegamos aquí, todos los reintentos han fallado
-        print(f"Fallaron todos los intentos de publicar en {topic}. Último error: {last_exception}")
+        self._failed_count += 1
+        self._metrics(topic).dropped_message()
+        logger.error("Fallaron todos los intentos de publicar en %s. Último error: %s", topic, last_exception)
         return False
     
+    def _should_spill(self) -> bool:
+        """Indica si los eventos nuevos deben ir a la cola local."""
+        return (
+            not self._broker_healthy
+            or self._spill_in_flight > 0
+            or self._spill.has_pending()
+        )
+    
+    async def _mark_unhealthy(self, topic: str, error: Exception) -> None:
+        """Marca el broker como no disponible y fuerza una reconexión posterior."""
+        if self._broker_healthy:
+            logger.warning("Broker no disponible al publicar en %s, usando cola local: %s", topic, error)
+        self._broker_healthy = False
+        await self._reset_connection()
+    
+    async def _spill_event(self, topic: str, payload: Dict[str, Any]) -> bool:
+        """Guarda el evento en la cola local sin bloquear el bucle de eventos."""
+        self._spill_in_flight += 1
+        try:
+            stored = await asyncio.to_thread(self._spill.append, topic, payload)
+        except OSError as e:
+            # La imagen ya se guardó: un fallo del disco descarta el evento
+            # en lugar de hacer fallar la solicitud
+            stored = False
+            logger.error("No se pudo escribir en la cola local (%s): se descarta el evento para %s", e, topic)
+        else:
+            if not stored:
+                logger.error("Cola local llena: se descarta el evento para %s", topic)
+        finally:
+            self._spill_in_flight -= 1
+        
+        if stored:
+            self._spilled_count += 1
+            self._ensure_drainer()
+        else:
+            self._failed_count += 1
+            self._metrics(topic).dropped_message()
+        return stored
+    
+    def _ensure_drainer(self) -> None:
+        """Arranca el drenador de la cola local si no está corriendo y lo despierta."""
+        if self._spill is None:
+            return
+        if self._drain_wakeup is None:
+            self._drain_wakeup = asyncio.Event()
+        self._drain_wakeup.set()
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain_loop())
+    
+    async def _drain_loop(self) -> None:
+        """
+        Reenvía los eventos de la cola local y comprueba el broker en segundo plano.
+        
+        Se ejecuta cada `pulsar_spill_drain_interval` segundos, o antes si se
+        guarda un evento nuevo. Con el broker disponible también reenvía los
+        slots que dejaron otros procesos al terminar.
+        """
+        while True:
+            self._drain_wakeup.clear()
+            try:
+                if await self._drain_spill(self._spill):
+                    await self._drain_orphans()
+            except Exception as e:
+                logger.error("Error drenando la cola local: %s", e)
+            try:
+                await asyncio.wait_for(self._drain_wakeup.wait(), settings.pulsar_spill_drain_interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _drain_orphans(self) -> None:
+        """Reenvía los eventos que quedaron en slots de procesos que ya no existen."""
+        for slot in await asyncio.to_thread(self._spill.orphan_slots):
+            queue = await asyncio.to_thread(self._spill.adopt, slot)
+            if queue is None:
+                continue  # el slot es de un proceso en ejecución
+            try:
+                logger.info("Reenviando eventos de la cola local huérfana %s", queue.directory)
+                drained = await self._drain_spill(queue)
+            finally:
+                await asyncio.to_thread(queue.close)
+            if not drained:
+                return
+    
+    async def _drain_spill(self, spill: SpillQueue) -> bool:
+        """
+        Reenvía en orden los eventos guardados hasta vaciar la cola o fallar.
+        
+        Con la cola propia vacía comprueba el broker (y deja listo el productor
+        de eventos de imagen que usan las solicitudes) fuera del camino de las
+        solicitudes; si responde, las publicaciones vuelven a enviarse
+        directamente.
+        
+        Returns:
+            bool: True si la cola quedó vacía y el broker disponible
+        """
+        own = spill is self._spill
+        forwarded = False
+        while True:
+            batch = await asyncio.to_thread(spill.read_batch, 100)
+            if not batch:
+                if own and self._spill_in_flight == 0 and not spill.has_pending():
+                    if not forwarded:
+                        await self._get_producer(settings.pulsar_image_topic)
+                    if not self._broker_healthy:
+                        logger.info("Broker disponible de nuevo, se publica directamente")
+                    self._broker_healthy = True
+                return self._broker_healthy
+            
+            # Enviar el lote en paralelo y esperar todos los acks
+            sent = 0
+            try:
+                acks = []
+                for record in batch:
+                    producer = await self._get_producer(record.topic)
+                    acks.append(self._send_async(
+                        record.topic,
+                        producer,
+                        self._encode(record.topic, record.message),
+                        self._message_options(record.message)
+                    ))
+                results = await asyncio.gather(*acks, return_exceptions=True)
+            except Exception as e:
+                results = [e]
+            
+            for result in results:
+                if isinstance(result, BaseException):
+                    break
+                sent += 1
+            
+            # Confirmar solo el prefijo enviado para conservar el orden
+            if sent:
+                forwarded = True
+                self._confirmed_count += sent
+                await asyncio.to_thread(spill.commit, batch[sent - 1].position)
+                logger.info("Reenviados %s eventos desde la cola local", sent)
+            
+            if sent < len(batch):
+                await self._mark_unhealthy(batch[sent].topic, results[min(sent, len(results) - 1)])
+                return False
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores del publicador y métricas por tópico."""
+        stats = {
+            "confirmed": self._confirmed_count,
+            "failed": self._failed_count,
+            "pending_confirmations": len(self._pending_confirmations),
+            "broker_healthy": self._broker_healthy,
+            "connection_resets": self._reset_count,
+            "topics": {topic: metrics.snapshot() for topic, metrics in self._topic_metrics.items()}
+        }
+        if self._spill is not None:
+            stats["spill"] = {**self._spill.stats(), "spilled": self._spilled_count}
+        return stats
+    
     async def _reset_connection(self):
         """Reinicia la conexión cerrando el cliente y productores."""
         async with self._connection_lock:
-            # Cerrar productores
-            for topic, producer in self._producers.items():
-                try:
-                    producer.close()
-                except:
-                    pass  # Ignorar errores al cerrar
-            
-            # Cerrar cliente
-            if self._client:
-                try:
-                    self._client.close()
-                except:
-                    pass  # Ignorar errores al cerrar
+            producers = list(self._producers.values())
+            client = self._client
             
             # Resetear variables
             self._producers = {}
             self._client = None
+            if producers or client:
+                self._reset_count += 1
+        
+        # Cerrar productores y cliente fuera del bucle de eventos (son llamadas bloqueantes)
+        if producers or client:
+            loop = self._get_running_loop()
+            await loop.run_in_executor(None, self._close_sync, producers, client)
+    
+    @staticmethod
+    def _close_sync(producers, client):
+        """Cierra productores y cliente de forma síncrona ignorando errores."""
+        for producer in producers:
+            try:
+                producer.close()
+            except:
+                pass  # Ignorar errores al cerrar
+        
+        if client:
+            try:
+                client.close()
+            except:
+                pass  # Ignorar errores al cerrar
     
     async def close(self) -> None:
         """Cierra todos los productores y el cliente."""
+        # Esperar las confirmaciones pendientes antes de cerrar
+        if self._pending_confirmations:
+            await asyncio.wait(set(self._pending_confirmations), timeout=10)
+        
+        if self._drainer is not None:
+            self._drainer.cancel()
+            try:
+                await self._drainer
+            except asyncio.CancelledError:
+                pass
+            self._drainer = None
+        if self._spill is not None:
+            self._spill.close()
+        
         await self._reset_connection()
-        print("Cliente y productores de Pulsar cerrados correctamente")
\ No newline at end of file
+        logger.info("Cliente y productores de Pulsar cerrados correctamente")
\ No newline at end of file
@@ -0,0 +1,287 @@
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SpillSlotBusy(RuntimeError):
+    """El slot pedido está tomado por otro proceso."""
+
+
+@dataclass(frozen=True)
+class SpillRecord:
+    """Evento almacenado en la cola local a la espera de ser publicado."""
+    topic: str
+    message: Dict[str, Any]
+    # Posición (segmento, offset) inmediatamente posterior al evento
+    position: Tuple[int, int]
+
+
+class SpillQueue:
+    """
+    Cola local append-only, respaldada en disco, para eventos no publicados.
+    
+    Los eventos se escriben como líneas JSON en segmentos `segment-<n>.log`.
+    Un archivo `cursor.json` guarda la posición (segmento, offset) del próximo
+    evento a reenviar; los segmentos ya consumidos se eliminan. El tamaño total
+    en disco está acotado por `max_total_bytes`: al alcanzarlo se rechazan los
+    eventos nuevos.
+    
+    Cada proceso toma un "slot" (`<directorio>/<n>`) protegido con `flock`, de
+    modo que varios workers pueden compartir el mismo directorio base. Los
+    eventos que deja un proceso que termina quedan en su slot; cualquier otro
+    proceso los encuentra con `orphan_slots` y los reenvía abriendo ese slot
+    con `adopt`.
+    """
+    
+    _SEGMENT_PREFIX = "segment-"
+    _SEGMENT_SUFFIX = ".log"
+    _MAX_SLOTS = 64
+    
+    def __init__(
+        self,
+        base_directory: str,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        max_total_bytes: int = 256 * 1024 * 1024,
+        slot: Optional[int] = None
+    ):
+        """
+        Args:
+            slot: Slot concreto a abrir (lanza `SpillSlotBusy` si está tomado);
+                por defecto, el primero libre
+        """
+        self.segment_max_bytes = segment_max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.base_directory = Path(base_directory)
+        self._lock = threading.Lock()
+        self._lock_file = None
+        self.slot, self.directory = self._acquire_slot(self.base_directory, slot)
+        
+        self._cursor_path = self.directory / "cursor.json"
+        self._cursor = self._load_cursor()
+        self._write_segment, self._write_file = self._open_write_segment()
+        self._total_bytes = sum(size for _, size in self._segments())
+        self._dropped = 0
+    
+    def _acquire_slot(self, base: Path, only: Optional[int]) -> Tuple[int, Path]:
+        """Toma el slot pedido o el primero libre del directorio base con un lock exclusivo."""
+        base.mkdir(parents=True, exist_ok=True)
+        for slot in (range(self._MAX_SLOTS) if only is None else (only,)):
+            directory = base / str(slot)
+            directory.mkdir(exist_ok=True)
+            lock_file = open(directory / ".lock", "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                continue
+            self._lock_file = lock_file
+            return slot, directory
+        if only is not None:
+            raise SpillSlotBusy(f"El slot {only} de {base} está tomado por otro proceso")
+        raise RuntimeError(f"No hay slots libres para la cola local en {base}")
+    
+    def orphan_slots(self) -> List[int]:
+        """
+        Slots de otros procesos con segmentos no vacíos.
+        
+        Incluye los de procesos en ejecución: `adopt` descarta los que siguen
+        tomados.
+        """
+        slots = []
+        for slot in range(self._MAX_SLOTS):
+            if slot == self.slot:
+                continue
+            directory = self.base_directory / str(slot)
+            if any(
+                path.stat().st_size > 0
+                for path in directory.glob(f"{self._SEGMENT_PREFIX}*{self._SEGMENT_SUFFIX}")
+            ):
+                slots.append(slot)
+        return slots
+    
+    def adopt(self, slot: int) -> Optional["SpillQueue"]:
+        """Abre el slot de otro proceso para drenarlo, o None si sigue tomado."""
+        try:
+            return SpillQueue(
+                str(self.base_directory),
+                segment_max_bytes=self.segment_max_bytes,
+                max_total_bytes=self.max_total_bytes,
+                slot=slot
+            )
+        except SpillSlotBusy:
+            return None
+    
+    def _segments(self) -> List[Tuple[int, int]]:
+        """Lista (número, tamaño) de los segmentos existentes en orden."""
+        segments = []
+        for path in self.directory.glob(f"{self._SEGMENT_PREFIX}*{self._SEGMENT_SUFFIX}"):
+            number = int(path.name[len(self._SEGMENT_PREFIX):-len(self._SEGMENT_SUFFIX)])
+            segments.append((number, path.stat().st_size))
+        return sorted(segments)
+    
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{self._SEGMENT_PREFIX}{number:012d}{self._SEGMENT_SUFFIX}"
+    
+    def _load_cursor(self) -> Tuple[int, int]:
+        """Lee la posición de lectura persistida (segmento, offset)."""
+        try:
+            with open(self._cursor_path) as f:
+                data = json.load(f)
+            return int(data["segment"]), int(data["offset"])
+        except (OSError, ValueError, KeyError):
+            segments = self._segments()
+            return (segments[0][0] if segments else 0), 0
+    
+    def _open_write_segment(self):
+        """Abre el último segmento para escritura (o crea el primero)."""
+        segments = self._segments()
+        number = segments[-1][0] if segments else self._cursor[0]
+        return number, open(self._segment_path(number), "ab")
+    
+    def append(self, topic: str, message: Dict[str, Any]) -> bool:
+        """
+        Agrega un evento al final de la cola; retorna False si no hay espacio.
+        
+        Raises:
+            OSError: Si falla la escritura en disco (el evento no queda en la cola)
+        """
+        line = json.dumps({"topic": topic, "message": message}).encode("utf-8") + b"\n"
+        
+        with self._lock:
+            if self._total_bytes + len(line) > self.max_total_bytes:
+                self._dropped += 1
+                return False
+            
+            # Un error de escritura anterior pudo dejar el segmento cerrado
+            if self._write_file.closed:
+                self._write_file = open(self._segment_path(self._write_segment), "ab")
+            
+            # Rotar el segmento cuando alcanza el tamaño máximo
+            if self._write_file.tell() >= self.segment_max_bytes:
+                self._write_file.close()
+                self._write_segment += 1
+                self._write_file = open(self._segment_path(self._write_segment), "ab")
+            
+            start = self._write_file.tell()
+            try:
+                self._write_file.write(line)
+                self._write_file.flush()
+            except OSError:
+                # Descartar lo que quedó en el buffer y la línea a medias, que
+                # bloquearía la lectura de los eventos siguientes
+                with contextlib.suppress(OSError):
+                    self._write_file.close()
+                with contextlib.suppress(OSError):
+                    os.truncate(self._segment_path(self._write_segment), start)
+                with contextlib.suppress(OSError):
+                    self._write_file = open(self._segment_path(self._write_segment), "ab")
+                raise
+            self._total_bytes += len(line)
+            return True
+    
+    def read_batch(self, max_records: int) -> List[SpillRecord]:
+        """
+        Lee hasta `max_records` eventos desde el cursor sin consumirlos.
+        
+        Para confirmar los eventos hasta uno dado se pasa su `position` a `commit`.
+        """
+        with self._lock:
+            segment, offset = self._cursor
+            write_segment = self._write_segment
+        
+        records: List[SpillRecord] = []
+        while len(records) < max_records and segment <= write_segment:
+            path = self._segment_path(segment)
+            if path.exists():
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    while len(records) < max_records:
+                        line = f.readline()
+                        # Una línea sin salto final todavía se está escribiendo
+                        if not line.endswith(b"\n"):
+                            break
+                        offset += len(line)
+                        data = json.loads(line)
+                        records.append(SpillRecord(
+                            topic=data["topic"],
+                            message=data["message"],
+                            position=(segment, offset)
+                        ))
+                if len(records) >= max_records or segment == write_segment:
+                    break
+            segment, offset = segment + 1, 0
+        
+        return records
+    
+    def commit(self, position: Tuple[int, int]) -> None:
+        """Confirma los eventos leídos hasta `position` y libera los segmentos consumidos."""
+        with self._lock:
+            # Persistir el cursor de forma atómica
+            tmp_path = self._cursor_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"segment": position[0], "offset": position[1]}, f)
+            os.replace(tmp_path, self._cursor_path)
+            self._cursor = position
+            
+            # Eliminar segmentos anteriores al cursor
+            for number, size in self._segments():
+                if number >= position[0] or number == self._write_segment:
+                    break
+                self._segment_path(number).unlink()
+            
+            # Si todo fue consumido, reiniciar el segmento activo para recuperar espacio
+            if position[0] == self._write_segment and position[1] >= self._write_file.tell():
+                self._write_file.close()
+                self._write_segment += 1
+                self._write_file = open(self._segment_path(self._write_segment), "ab")
+                self._segment_path(position[0]).unlink()
+                self._cursor = (self._write_segment, 0)
+                with open(tmp_path, "w") as f:
+                    json.dump({"segment": self._cursor[0], "offset": 0}, f)
+                os.replace(tmp_path, self._cursor_path)
+            
+            self._total_bytes = sum(size for _, size in self._segments())
+    
+    def has_pending(self) -> bool:
+        """Indica si quedan eventos por reenviar."""
+        with self._lock:
+            segment, offset = self._cursor
+            if segment < self._write_segment:
+                return True
+            return self._write_file.tell() > offset
+    
+    def stats(self) -> Dict[str, Any]:
+        """Uso de disco y eventos descartados por falta de espacio."""
+        with self._lock:
+            return {
+                "directory": str(self.directory),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_total_bytes,
+                "dropped": self._dropped
+            }
+    
+    def close(self) -> None:
+        """Cierra el segmento activo y libera el slot."""
+        with self._lock:
+            self._write_file.close()
+            if self._lock_file:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                self._lock_file.close()
+                self._lock_file = None
+
+
+def open_spill_queue(base_directory: str, **kwargs) -> Optional[SpillQueue]:
+    """Abre la cola local o retorna None si no es posible (p. ej. sin permisos)."""
+    try:
+        return SpillQueue(base_directory, **kwargs)
+    except Exception as e:
+        logger.error("No se pudo abrir la cola local de eventos en %s: %s", base_directory, e)
+        return None
\ No newline at end of file
@@ -0,0 +1,24 @@
+from typing import ContextManager
+
+from ...domain.ports.collect_instrumentation import CollectInstrumentation
+from .metrics import COLLECTS_IN_FLIGHT, COLLECTS_REJECTED
+from .request_timing import stage_timer
+
+
+class PrometheusCollectInstrumentation(CollectInstrumentation):
+    """
+    Publica la recolección en el registro de métricas del proceso y suma las
+    etapas a los tiempos de la solicitud en curso (Server-Timing / metadata gRPC).
+    """
+    
+    def collect_started(self) -> None:
+        COLLECTS_IN_FLIGHT.inc()
+    
+    def collect_finished(self) -> None:
+        COLLECTS_IN_FLIGHT.dec()
+    
+    def collect_rejected(self) -> None:
+        COLLECTS_REJECTED.inc()
+    
+    def stage(self, name: str) -> ContextManager[None]:
+        return stage_timer(name)
\ No newline at end of file
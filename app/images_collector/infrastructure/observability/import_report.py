@@ -0,0 +1,138 @@
+"""
+Informe del costo de arranque de cada modo: tiempo de importación por paquete,
+módulos más pesados, adaptadores cargados y memoria residente.
+
+Importa el punto de entrada del modo y los adaptadores que `Settings` selecciona
+en un intérprete nuevo con `-X importtime`, sin abrir conexiones. Sirve para
+comprobar que un proceso solo carga las librerías que usa.
+
+Uso:
+    python -m app.images_collector.infrastructure.observability.import_report --mode grpc
+    STORAGE_TYPE=postgres python -m app.images_collector.infrastructure.observability.import_report --json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List
+
+_ENTRYPOINTS = {
+    "http": "app.images_collector.infrastructure.http.routes",
+    "grpc": "app.images_collector.infrastructure.grpc.server",
+    "worker": "app.images_collector.infrastructure.worker.server",
+    "all": "app.images_collector.infrastructure.combined.server"
+}
+
+# Librerías nativas o grandes cuya presencia interesa vigilar
+_HEAVY_MODULES = (
+    "pulsar", "asyncpg", "aiosqlite", "grpc", "google.protobuf",
+    "httpx", "fastapi", "uvicorn", "uvloop", "httptools", "pydantic"
+)
+
+# Se ejecuta en el intérprete medido: importa lo mismo que el proceso real
+_PROBE = """
+import importlib, json, resource, sys
+importlib.import_module({entrypoint!r})
+from app.images_collector.infrastructure.settings.config import settings
+from app.images_collector.infrastructure.repositories.factory import STORAGE_ADAPTERS
+from app.images_collector.infrastructure.messaging.factory import CONSUMER_ADAPTERS, PUBLISHER_ADAPTERS
+STORAGE_ADAPTERS.load(settings.storage_type)
+if settings.pulsar_enabled:
+    PUBLISHER_ADAPTERS.load(settings.messaging_backend)
+if {mode!r} == "worker":
+    CONSUMER_ADAPTERS.load(settings.messaging_backend)
+print(json.dumps({{
+    "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "module_count": len(sys.modules),
+    "heavy_modules": [name for name in {heavy!r} if name in sys.modules],
+    "adapters": {{
+        "storage": STORAGE_ADAPTERS.loaded(),
+        "publisher": PUBLISHER_ADAPTERS.loaded(),
+        "consumer": CONSUMER_ADAPTERS.loaded()
+    }}
+}}))
+"""
+
+
+def _parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Convierte la salida de `-X importtime` en registros (módulo, propio, acumulado, nivel)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        name = name.rstrip()
+        module = name.lstrip()
+        entries.append({
+            "module": module,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            # Un espacio de separación y dos por cada nivel de anidamiento
+            "level": (len(name) - len(module) - 1) // 2
+        })
+    return entries
+
+
+def build_report(mode: str, top: int = 15) -> Dict[str, Any]:
+    """Mide el arranque del modo en un subproceso y resume el resultado."""
+    probe = _PROBE.format(entrypoint=_ENTRYPOINTS[mode], mode=mode, heavy=_HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar el modo {mode}:\n{result.stderr[-2000:]}")
+    
+    entries = _parse_importtime(result.stderr)
+    by_package: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        by_package[entry["module"].split(".")[0]] += entry["self_us"]
+    
+    return {
+        "mode": mode,
+        "import_ms": round(sum(e["cumulative_us"] for e in entries if e["level"] == 0) / 1000, 1),
+        **json.loads(result.stdout.strip().splitlines()[-1]),
+        "packages_ms": {
+            package: round(us / 1000, 1)
+            for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        },
+        "slowest_modules_ms": {
+            entry["module"]: round(entry["cumulative_us"] / 1000, 1)
+            for entry in sorted(entries, key=lambda e: -e["cumulative_us"])[:top]
+        }
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"== modo {report['mode']}")
+    print(f"importación: {report['import_ms']} ms, {report['module_count']} módulos, "
+          f"RSS máximo {report['max_rss_kib'] / 1024:.1f} MiB")
+    print(f"adaptadores: {report['adapters']}")
+    print(f"librerías pesadas cargadas: {', '.join(report['heavy_modules']) or '-'}")
+    print("tiempo propio por paquete (ms):")
+    for package, ms in report["packages_ms"].items():
+        print(f"  {package:<40} {ms:>8}")
+    print("módulos más lentos, acumulado (ms):")
+    for module, ms in report["slowest_modules_ms"].items():
+        print(f"  {module:<60} {ms:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Informe de tiempo de importación por modo")
+    parser.add_argument("--mode", nargs="+", choices=list(_ENTRYPOINTS), default=list(_ENTRYPOINTS))
+    parser.add_argument("--top", type=int, default=15, help="Paquetes y módulos a listar")
+    parser.add_argument("--json", action="store_true", help="Una línea JSON por modo")
+    args = parser.parse_args()
+    
+    for mode in args.mode:
+        report = build_report(mode, args.top)
+        if args.json:
+            print(json.dumps(report))
+        else:
+            _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
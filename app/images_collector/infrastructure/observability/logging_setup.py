@@ -0,0 +1,166 @@
+"""
+Configuración del logging del servicio.
+
+Los módulos usan `logging.getLogger(__name__)`; este módulo decide a dónde van
+los registros. El handler del logger raíz solo encola el registro (sin E/S) y
+un hilo en segundo plano lo formatea como JSON y lo escribe en stdout, de modo
+que un colector lento no bloquea el event loop. Si la cola se llena los
+registros se descartan y se cuentan en lugar de esperar.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+
+from ..settings.config import settings
+
+# Atributos propios de LogRecord (y el mensaje con colores de uvicorn); el resto
+# llegan por `extra=` y se emiten como campos
+_RECORD_ATTRIBUTES = (
+    set(vars(logging.LogRecord("", 0, "", 0, "", None, None)))
+    | {"message", "asctime", "color_message"}
+)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como un objeto JSON por línea."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deja pasar solo una fracción de los registros de los loggers indicados.
+    
+    Se aplica a INFO y niveles inferiores; las advertencias y errores nunca se
+    muestrean. La fracción del logger más específico (por prefijo) es la que
+    se aplica.
+    """
+    
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        # Más específico primero
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+    
+    def _rate(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Encola los registros sin bloquear; si la cola está llena los descarta.
+    
+    Solo resuelve el mensaje y la traza de la excepción en el hilo que registra
+    (los argumentos podrían cambiar después); el formato JSON y la escritura
+    ocurren en el hilo del QueueListener.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    levels: Optional[Mapping[str, str]] = None,
+    sample_rates: Optional[Mapping[str, float]] = None
+) -> None:
+    """
+    Configura el logger raíz del proceso. Es idempotente: cada proceso (también
+    los workers de uvicorn y de gRPC) lo llama al arrancar.
+    
+    Args:
+        level: Nivel del logger raíz (por defecto `log_level`)
+        log_format: "json" o "text" (por defecto `log_format`)
+        levels: Niveles por logger (por defecto `log_levels`)
+        sample_rates: Fracción de registros INFO/DEBUG a conservar por logger
+            (por defecto `log_sample_rates`)
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    
+    output = logging.StreamHandler(sys.stdout)
+    if (log_format or settings.log_format) == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    _queue_handler = DroppingQueueHandler(queue.Queue(settings.log_queue_size))
+    _queue_handler.addFilter(SamplingFilter(sample_rates if sample_rates is not None else settings.log_sample_rates))
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel((level or settings.log_level).upper())
+    
+    for name, logger_level in (levels if levels is not None else settings.log_levels).items():
+        logging.getLogger(name).setLevel(logger_level.upper())
+    
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Escribe los registros pendientes y detiene el hilo de escritura."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, int]:
+    """Registros descartados por cola llena y ocupación actual de la cola."""
+    if _queue_handler is None:
+        return {"dropped": 0, "queued": 0}
+    return {"dropped": _queue_handler.dropped, "queued": _queue_handler.queue.qsize()}
\ No newline at end of file
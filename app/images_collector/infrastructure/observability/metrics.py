@@ -0,0 +1,277 @@
+"""
+Registro de métricas en el formato de texto de Prometheus.
+
+Implementación mínima sin dependencias: contadores, gauges e histogramas con
+etiquetas, y `MetricsRegistry.render()` para el endpoint `/metrics`. Las
+métricas se actualizan desde el event loop del proceso, por lo que no usan
+candados; cada proceso (worker) expone las suyas.
+"""
+import bisect
+import contextlib
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Límites (en segundos) por defecto de los histogramas de latencia
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+    
+    def _new_child(self):
+        raise NotImplementedError
+    
+    def labels(self, *values: str):
+        """Serie de la métrica para los valores de etiqueta dados."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+    
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        raise NotImplementedError
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+    
+    def __init__(self):
+        self.value = 0.0
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Valor que solo crece (solicitudes, errores)."""
+    type_name = "counter"
+    
+    def _new_child(self):
+        return _CounterChild()
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+    
+    def _samples(self):
+        for key, child in self._children.items():
+            yield "_total", _format_labels(self.labelnames, key), child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+    
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+    
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+    
+    def set(self, value: float) -> None:
+        self.value = value
+    
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Calcula el valor al exportar (p. ej. el tamaño de un pool)."""
+        self.function = function
+    
+    def get(self) -> float:
+        if self.function is None:
+            return self.value
+        try:
+            return float(self.function())
+        except Exception:
+            return float("nan")
+
+
+class Gauge(_Metric):
+    """Valor que sube y baja (operaciones en curso, uso de un pool)."""
+    type_name = "gauge"
+    
+    def _new_child(self):
+        return _GaugeChild()
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+    
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+    
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+    
+    def _samples(self):
+        for key, child in self._children.items():
+            yield "", _format_labels(self.labelnames, key), child.get()
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "count", "sum")
+    
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        # Un contador por bucket más el de +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+    
+    @contextlib.contextmanager
+    def time(self) -> Iterator[None]:
+        """Mide la duración del bloque, también si termina con una excepción."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Distribución de latencias en buckets acumulados."""
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+    
+    def observe(self, seconds: float) -> None:
+        self.labels().observe(seconds)
+    
+    def time(self):
+        return self.labels().time()
+    
+    def _samples(self):
+        for key, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield "_bucket", _format_labels(self.labelnames, key, le), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield "_sum", labels, child.sum
+            yield "_count", labels, child.count
+
+
+class MetricsRegistry:
+    """Conjunto de métricas del proceso."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"La métrica {metric.name} ya está registrada")
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def render(self) -> str:
+        """Todas las métricas en el formato de texto de Prometheus."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Content-Type del formato de texto de Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests", "Solicitudes HTTP atendidas", ("method", "route", "status")
+))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Duración de las solicitudes HTTP", ("method", "route")
+))
+GRPC_REQUESTS = REGISTRY.register(Counter(
+    "grpc_server_handled", "Llamadas gRPC atendidas", ("method", "code")
+))
+GRPC_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "grpc_server_handling_seconds", "Duración de las llamadas gRPC", ("method",)
+))
+COLLECT_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "image_collect_stage_seconds",
+    "Duración de cada etapa de la recolección (download, disk_write, db_write, publish)",
+    ("stage",)
+))
+COLLECTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "image_collects_in_flight", "Recolecciones en curso"
+))
+COLLECT_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "image_collect_queue_depth", "Recolecciones esperando admisión"
+))
+COLLECTS_REJECTED = REGISTRY.register(Counter(
+    "image_collects_rejected", "Recolecciones rechazadas por falta de capacidad"
+))
+LIST_CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "image_list_cache_lookups",
+    "Consultas a la caché del listado de imágenes (hit, miss, shared)",
+    ("result",)
+))
+POOL_CONNECTIONS = REGISTRY.register(Gauge(
+    "pool_connections", "Conexiones de los pools por estado", ("pool", "state")
+))
+PUBLISH_SEND_SECONDS = REGISTRY.register(Histogram(
+    "pulsar_publish_send_seconds",
+    "Latencia entre el envío de un mensaje y su confirmación por el broker",
+    ("topic",)
+))
+PUBLISH_PENDING = REGISTRY.register(Gauge(
+    "pulsar_publish_pending", "Mensajes enviados pendientes de confirmación", ("topic",)
+))
+PUBLISH_SEND_ERRORS = REGISTRY.register(Counter(
+    "pulsar_publish_send_errors", "Envíos rechazados por el productor o el broker", ("topic", "error")
+))
+PUBLISH_RETRIES = REGISTRY.register(Counter(
+    "pulsar_publish_retries", "Reintentos de publicación", ("topic",)
+))
+PUBLISH_DROPPED = REGISTRY.register(Counter(
+    "pulsar_publish_dropped", "Eventos descartados tras agotar los reintentos o sin espacio en la cola local", ("topic",)
+))
\ No newline at end of file
@@ -0,0 +1,68 @@
+import asyncio
+import errno
+import logging
+from typing import Tuple
+
+from .metrics import CONTENT_TYPE, REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Puertos que se prueban, a partir del base, al buscar uno libre por worker
+_MAX_WORKER_PORTS = 64
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await reader.readline()
+        # Descartar las cabeceras de la solicitud
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        
+        parts = request_line.split()
+        if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+            status, content_type, body = "200 OK", CONTENT_TYPE, REGISTRY.render().encode("utf-8")
+        else:
+            status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+        
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii") + body
+        )
+        await writer.drain()
+    except Exception as e:
+        logger.warning("Error atendiendo /metrics: %s", e)
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host: str, port: int) -> asyncio.AbstractServer:
+    """
+    Expone `/metrics` en un puerto propio, para los procesos sin servidor HTTP
+    (modo gRPC) o con varios workers. Solo atiende `GET /metrics`.
+    """
+    server = await asyncio.start_server(_handle, host, port)
+    logger.info("Metrics endpoint on http://%s:%s/metrics", host, port)
+    return server
+
+
+async def start_worker_metrics_server(host: str, base_port: int) -> Tuple[asyncio.AbstractServer, int]:
+    """
+    Expone `/metrics` en el primer puerto libre a partir de `base_port`.
+    
+    Los workers de uvicorn comparten el puerto de la aplicación y no conocen su
+    índice: cada uno toma su propio puerto de métricas para que un scrape lea
+    siempre los contadores del mismo proceso. El worker que uvicorn levante en
+    lugar de uno caído vuelve a tomar el puerto que quedó libre.
+    
+    Returns:
+        El servidor y el puerto que tomó
+    """
+    for port in range(base_port, base_port + _MAX_WORKER_PORTS):
+        try:
+            return await start_metrics_server(host, port), port
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                raise
+    raise RuntimeError(
+        f"No hay puertos libres para /metrics entre {base_port} y {base_port + _MAX_WORKER_PORTS - 1}"
+    )
\ No newline at end of file
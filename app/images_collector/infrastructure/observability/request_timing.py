@@ -0,0 +1,53 @@
+import contextlib
+import contextvars
+import time
+from typing import Dict, Iterator, Optional
+
+from .metrics import COLLECT_STAGE_SECONDS
+
+# Duraciones (segundos) de las etapas de la solicitud en curso; None fuera de una solicitud
+_stage_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "stage_timings", default=None
+)
+
+
+def start_request_timing() -> contextvars.Token:
+    """Empieza a acumular las etapas de la solicitud actual."""
+    return _stage_timings.set({})
+
+
+def current_timings() -> Dict[str, float]:
+    """Etapas medidas hasta ahora en la solicitud actual."""
+    return dict(_stage_timings.get() or {})
+
+
+def finish_request_timing(token: contextvars.Token) -> Dict[str, float]:
+    """Deja de acumular y retorna las etapas medidas."""
+    timings = _stage_timings.get() or {}
+    _stage_timings.reset(token)
+    return timings
+
+
+@contextlib.contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """
+    Mide una etapa de la recolección: la registra en el histograma
+    `image_collect_stage_seconds` y, si hay una solicitud en curso, la suma a
+    sus tiempos para el encabezado Server-Timing o el metadata de gRPC.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        COLLECT_STAGE_SECONDS.labels(stage).observe(elapsed)
+        timings = _stage_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def format_server_timing(timings: Dict[str, float], total: float) -> str:
+    """Valor del encabezado Server-Timing (duraciones en milisegundos)."""
+    entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
\ No newline at end of file
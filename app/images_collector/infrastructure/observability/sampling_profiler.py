@@ -0,0 +1,87 @@
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+from typing import Counter, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Un solo perfil a la vez por proceso: dos muestreos simultáneos se miden entre sí
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Ya hay un perfil en curso en este proceso."""
+
+
+def _frame_label(frame) -> str:
+    """Nombre de un marco: función, archivo y primera línea de la función."""
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def sample_stacks(
+    duration: float,
+    interval: float,
+    thread_ids: Optional[Set[int]] = None
+) -> Counter[str]:
+    """
+    Toma muestras de las pilas de los hilos durante `duration` segundos.
+    
+    Args:
+        duration: Segundos de muestreo.
+        interval: Segundos entre muestras.
+        thread_ids: Hilos a muestrear; None para todos salvo el propio muestreador.
+    
+    Returns:
+        Cantidad de muestras por pila, con los marcos separados por `;` desde
+        la raíz (el nombre del hilo) hasta la función en ejecución.
+    """
+    own_id = threading.get_ident()
+    counts: Counter[str] = collections.Counter()
+    deadline = time.monotonic() + duration
+    
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or (thread_ids is not None and thread_id not in thread_ids):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    
+    return counts
+
+
+def to_collapsed(counts: Counter[str]) -> str:
+    """Formato "pila cantidad" por línea que aceptan flamegraph.pl y speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+async def profile(
+    duration: float,
+    interval: float,
+    thread_ids: Optional[Set[int]] = None
+) -> str:
+    """
+    Perfila el proceso en ejecución sin detenerlo: el muestreo corre en un hilo
+    aparte mientras el event loop sigue atendiendo solicitudes.
+    
+    Raises:
+        ProfilerBusyError: Si ya hay un perfil en curso.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("Ya hay un perfil en curso")
+    try:
+        logger.info("Perfil iniciado: %.1fs cada %.1fms", duration, interval * 1000)
+        counts = await asyncio.to_thread(sample_stacks, duration, interval, thread_ids)
+        logger.info("Perfil terminado: %s muestras", sum(counts.values()))
+        return to_collapsed(counts)
+    finally:
+        _profile_lock.release()
\ No newline at end of file
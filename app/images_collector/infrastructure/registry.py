@@ -0,0 +1,64 @@
+import importlib
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdapterRegistry:
+    """
+    Adaptadores de un puerto registrados por nombre como "módulo:Clase".
+    
+    El módulo de un adaptador solo se importa al resolverlo, de modo que un
+    proceso con SQLite y sin Pulsar no carga asyncpg ni el cliente nativo de
+    Pulsar (ni su memoria residente).
+    """
+    
+    def __init__(self, kind: str, package: str, adapters: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            kind: Tipo de adaptador, para los mensajes de error.
+            package: Paquete desde el que se resuelven las rutas relativas.
+            adapters: Rutas iniciales por nombre, p. ej. {"sqlite": ".sqlite_repo:SQLiteRepo"}.
+        """
+        self.kind = kind
+        self.package = package
+        self._paths: Dict[str, str] = dict(adapters or {})
+        self._loaded: Dict[str, type] = {}
+    
+    def register(self, name: str, path: str) -> None:
+        """Registra (o reemplaza) un adaptador sin importarlo."""
+        self._paths[name] = path
+        self._loaded.pop(name, None)
+    
+    def names(self) -> List[str]:
+        """Nombres registrados."""
+        return sorted(self._paths)
+    
+    def loaded(self) -> List[str]:
+        """Nombres cuyos módulos ya se importaron en este proceso."""
+        return sorted(self._loaded)
+    
+    def load(self, name: str) -> type:
+        """
+        Importa y retorna la clase del adaptador.
+        
+        Raises:
+            ValueError: Si el nombre no está registrado
+        """
+        adapter = self._loaded.get(name)
+        if adapter is not None:
+            return adapter
+        
+        path = self._paths.get(name)
+        if path is None:
+            raise ValueError(
+                f"Adaptador de {self.kind} desconocido: {name!r} "
+                f"(disponibles: {', '.join(self.names())})"
+            )
+        module_name, _, attribute = path.partition(":")
+        module = importlib.import_module(module_name, self.package)
+        adapter = getattr(module, attribute)
+        self._loaded[name] = adapter
+        logger.debug("Adaptador de %s %r cargado desde %s", self.kind, name, path)
+        return adapter
\ No newline at end of file
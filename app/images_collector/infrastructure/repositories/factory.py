@@ -0,0 +1,19 @@
+from typing import Optional
+
+from ...domain.ports.image_fetcher import ImageFetcher
+from ...domain.ports.image_repository import ImageRepository
+from ..registry import AdapterRegistry
+from ..settings.config import settings
+
+# Cada backend importa su controlador (aiosqlite, asyncpg) solo al elegirse
+STORAGE_ADAPTERS = AdapterRegistry("almacenamiento", __package__, {
+    "file": ".file_image_repository:FileImageRepository",
+    "sqlite": ".sqlite_image_repository:SQLiteImageRepository",
+    "postgres": ".postgres_image_repository:PostgresImageRepository"
+})
+
+
+def create_image_repository(fetcher: Optional[ImageFetcher] = None) -> ImageRepository:
+    """Crea el repositorio de imágenes según `storage_type`."""
+    repository_class = STORAGE_ADAPTERS.load(settings.storage_type)
+    return repository_class(fetcher)
\ No newline at end of file
@@ -1,48 +1,60 @@
 import asyncio
-import httpx
 import os
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ...domain.models.image import Image
-from ...domain.ports.image_repository import ImageRepository
+from ...domain.ports.image_fetcher import ImageFetcher
+from ...domain.ports.image_repository import ImageRepository, InvalidCursorError
+from ..fetchers.httpx_image_fetcher import HttpxImageFetcher
+from ..observability.request_timing import stage_timer
 from ..settings.config import settings
 
 
 class FileImageRepository(ImageRepository):
     """Implementación del repositorio que guarda imágenes en el sistema de archivos."""
     
-    def __init__(self):
+    def __init__(self, fetcher: Optional[ImageFetcher] = None):
+        # Sin fetcher compartido el repositorio usa uno propio
+        self.fetcher = fetcher or HttpxImageFetcher()
         self.storage_path = Path(settings.storage_path)
         self._ensure_storage_dir()
         self.images_metadata = {}  # Guarda metadatos en memoria por simplicidad
+        # El catálogo vive en memoria: un prefijo aleatorio distingue sus
+        # versiones de las de otro proceso o de un reinicio
+        self._version_epoch = uuid.uuid4().hex[:8]
+        self._version = 0
+        self._image_versions: Dict[str, int] = {}
     
     def _ensure_storage_dir(self):
         """Asegura que el directorio de almacenamiento exista."""
         self.storage_path.mkdir(parents=True, exist_ok=True)
     
-    async def save(self, image: Image) -> Image:
-        """Descarga y guarda una imagen desde la URL proporcionada."""
+    async def save(self, image: Image, outbox_topic: Optional[str] = None) -> Image:
+        """
+        Descarga y guarda una imagen desde la URL proporcionada.
+        
+        Este repositorio no es transaccional ni implementa el outbox, por lo que
+        `outbox_topic` se ignora y el caso de uso publica el evento directamente.
+        """
         # Generar nombre de archivo si no se proporciona
         file_name = image.file_name or f"{uuid.uuid4()}.jpg"
         file_path = self.storage_path / file_name
         
-        # Descargar la imagen
-        async with httpx.AsyncClient() as client:
-            response = await client.get(image.url)
-            response.raise_for_status()
-            
-            # Obtener el tipo de contenido
-            content_type = response.headers.get("content-type", "image/jpeg")
-            
-            # Guardar la imagen en disco
+        # Descargar la imagen con el pool de conexiones compartido
+        with stage_timer("download"):
+            fetched = await self.fetcher.fetch(image.url)
+        content_type = fetched.content_type
+        
+        # Guardar la imagen en disco
+        with stage_timer("disk_write"):
             with open(file_path, 'wb') as f:
-                f.write(response.content)
-            
-            # Obtener el tamaño del archivo
-            size = len(response.content)
+                f.write(fetched.content)
+        
+        # Obtener el tamaño del archivo
+        size = len(fetched.content)
         
         # Crear una nueva instancia con los datos actualizados
         saved_image = Image(
@@ -56,6 +68,8 @@ class FileImageRepository(ImageRepository):
         
         # Guardar metadatos en memoria
         self.images_metadata[saved_image.id] = saved_image
+        self._version += 1
+        self._image_versions[saved_image.id] = self._image_versions.get(saved_image.id, 0) + 1
         
         return saved_image
     
@@ -63,6 +77,62 @@ class FileImageRepository(ImageRepository):
         """Obtiene una imagen por su ID."""
         return self.images_metadata.get(image_id)
     
+    async def catalogue_version(self) -> Optional[str]:
+        """Versión del catálogo en memoria (contador de escrituras)."""
+        return f"{self._version_epoch}.{self._version}"
+    
+    async def image_version(self, image_id: str) -> Optional[str]:
+        """Versión de la imagen en memoria (veces que se guardó)."""
+        version = self._image_versions.get(image_id)
+        return f"{self._version_epoch}.{version}" if version else None
+    
     async def get_all(self) -> List[Image]:
-        """Obtiene todas las imágenes."""
-        return list(self.images_metadata.values())
\ No newline at end of file
+        """Obtiene todas las imágenes, de la más reciente a la más antigua."""
+        return sorted(self.images_metadata.values(), key=_listing_key, reverse=True)
+    
+    def _before_cursor(self, cursor: Optional[str]):
+        """
+        Filtro de las imágenes posteriores al cursor en el orden del listado.
+        
+        El cursor es el ID de la última imagen de la página anterior.
+        
+        Raises:
+            InvalidCursorError: Si el cursor no existe
+        """
+        if not cursor:
+            return lambda image: True
+        anchor = self.images_metadata.get(cursor)
+        if anchor is None:
+            raise InvalidCursorError(f"Cursor desconocido: {cursor}")
+        anchor_key = _listing_key(anchor)
+        return lambda image: _listing_key(image) < anchor_key
+    
+    async def get_page(self, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        """Obtiene una página de imágenes, de la más reciente a la más antigua."""
+        after_cursor = self._before_cursor(cursor)
+        images = [image for image in await self.get_all() if after_cursor(image)]
+        return images[:limit]
+    
+    async def search(self, query: str, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        """Busca imágenes por subcadena de URL o nombre de archivo (recorrido en memoria)."""
+        needle = query.lower()
+        after_cursor = self._before_cursor(cursor)
+        results = []
+        for image in await self.get_all():
+            if not after_cursor(image):
+                continue
+            if needle in image.url.lower() or needle in (image.file_name or "").lower():
+                results.append(image)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def _listing_key(image: Image):
+    """
+    Orden del listado: fecha de creación y, a igualdad, ID.
+    
+    No basta con el ID: los catálogos anteriores a UUIDv7 y los IDs indicados
+    por el cliente no están ordenados por tiempo.
+    """
+    return image.created_at, image.id
\ No newline at end of file
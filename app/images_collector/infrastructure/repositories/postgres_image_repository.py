@@ -1,22 +1,33 @@
 import asyncpg
-import httpx
+import json
+import logging
 import uuid
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from ...domain.events.image_events import image_created_event
 from ...domain.models.image import Image
-from ...domain.ports.image_repository import ImageRepository
+from ...domain.models.outbox_message import OutboxMessage
+from ...domain.ports.image_fetcher import ImageFetcher
+from ...domain.ports.image_repository import ImageRepository, InvalidCursorError
+from ...domain.ports.outbox_repository import OutboxRepository
+from ..fetchers.httpx_image_fetcher import HttpxImageFetcher
+from ..observability.request_timing import stage_timer
 from ..settings.config import settings
 
+logger = logging.getLogger(__name__)
 
-class PostgresImageRepository(ImageRepository):
+
+class PostgresImageRepository(ImageRepository, OutboxRepository):
     """Implementación del repositorio que guarda imágenes usando PostgreSQL."""
     
-    def __init__(self):
+    def __init__(self, fetcher: Optional[ImageFetcher] = None):
+        # Sin fetcher compartido el repositorio usa uno propio
+        self.fetcher = fetcher or HttpxImageFetcher()
         self.storage_path = Path(settings.storage_path)
         self._ensure_storage_dir()
         self._pool = None
-        print(f"Nuevo repositorio PostgreSQL creado: {id(self)}")
+        logger.debug("Nuevo repositorio PostgreSQL creado: %s", id(self))
     
     def _ensure_storage_dir(self):
         """Asegura que el directorio de almacenamiento exista."""
@@ -47,37 +58,93 @@ class PostgresImageRepository(ImageRepository):
                         file_path TEXT
                     )
                 """)
+                # Versión por fila (ETag de cada imagen); tablas creadas antes de tenerla
+                await conn.execute(
+                    "ALTER TABLE images ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1"
+                )
+                # Índice del orden de los listados (fecha de creación y, a igualdad, ID)
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_images_created_at
+                    ON images (created_at, id)
+                """)
+                await self._init_search_index(conn)
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS outbox (
+                        id BIGSERIAL PRIMARY KEY,
+                        topic TEXT NOT NULL,
+                        payload JSONB NOT NULL,
+                        created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+                        sent_at TIMESTAMP WITH TIME ZONE
+                    )
+                """)
+                # Reserva del relay que reclamó el evento (tablas creadas antes de tenerla)
+                await conn.execute(
+                    "ALTER TABLE outbox ADD COLUMN IF NOT EXISTS claimed_until TIMESTAMP WITH TIME ZONE"
+                )
+                # Índice parcial: el relay solo consulta los eventos pendientes
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_outbox_pending
+                    ON outbox (id) WHERE sent_at IS NULL
+                """)
+                await self._init_catalogue_version(conn)
         
         return self._pool
     
-    async def _get_connection(self):
-        """Obtiene una conexión del pool y la registra."""
-        pool = await self._get_pool()
-        connection = await pool.acquire()
-        conn_id = id(connection)
-        return connection, conn_id
+    async def _init_search_index(self, conn):
+        """Crea los índices de trigramas (pg_trgm) para la búsqueda por subcadena."""
+        try:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_images_url_trgm
+                ON images USING gin (url gin_trgm_ops)
+            """)
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_images_file_name_trgm
+                ON images USING gin (file_name gin_trgm_ops)
+            """)
+        except Exception as e:
+            # Sin la extensión la búsqueda funciona, pero recorriendo la tabla
+            logger.warning("No se pudieron crear los índices de búsqueda en PostgreSQL: %s", e)
+    
+    async def _init_catalogue_version(self, conn):
+        """
+        Crea la versión del catálogo: una secuencia que avanza tras cada escritura.
+        
+        Una secuencia no bloquea a los escritores concurrentes, a diferencia de
+        una fila actualizada en cada transacción. La fila de `catalogue_version`
+        guarda un prefijo aleatorio que distingue una base de datos recreada.
+        """
+        await conn.execute("CREATE SEQUENCE IF NOT EXISTS images_version_seq")
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS catalogue_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                epoch TEXT NOT NULL
+            )
+        """)
+        await conn.execute(
+            "INSERT INTO catalogue_version (id, epoch) VALUES (1, $1) ON CONFLICT (id) DO NOTHING",
+            uuid.uuid4().hex[:8]
+        )
     
-    async def save(self, image: Image) -> Image:
+    async def save(self, image: Image, outbox_topic: Optional[str] = None) -> Image:
         """Descarga y guarda una imagen desde la URL proporcionada."""
         try:
             # Generar nombre de archivo si no se proporciona
             file_name = image.file_name or f"{uuid.uuid4()}.jpg"
             file_path = str(self.storage_path / file_name)
             
-            # Descargar la imagen
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image.url)
-                response.raise_for_status()
-                
-                # Obtener el tipo de contenido
-                content_type = response.headers.get("content-type", "image/jpeg")
-                
-                # Guardar la imagen en disco
+            # Descargar la imagen con el pool de conexiones compartido
+            with stage_timer("download"):
+                fetched = await self.fetcher.fetch(image.url)
+            content_type = fetched.content_type
+            
+            # Guardar la imagen en disco
+            with stage_timer("disk_write"):
                 with open(file_path, 'wb') as f:
-                    f.write(response.content)
-                
-                # Obtener el tamaño del archivo
-                size = len(response.content)
+                    f.write(fetched.content)
+            
+            # Obtener el tamaño del archivo
+            size = len(fetched.content)
             
             # Crear una nueva instancia con los datos actualizados
             saved_image = Image(
@@ -89,36 +156,52 @@ class PostgresImageRepository(ImageRepository):
                 created_at=image.created_at
             )
             
-            # Guardar en la base de datos
-            conn, conn_id = await self._get_connection()
-
-            await conn.execute("""
-                INSERT INTO images (id, url, file_name, content_type, size, created_at, file_path)
-                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                ON CONFLICT (id) DO UPDATE 
-                SET url = $2, file_name = $3, content_type = $4, size = $5, created_at = $6, file_path = $7
-            """, 
-                saved_image.id,
-                saved_image.url,
-                saved_image.file_name,
-                saved_image.content_type,
-                saved_image.size,
-                saved_image.created_at,
-                file_path
-            )
+            # Guardar en la base de datos (la conexión vuelve al pool al terminar)
+            with stage_timer("db_write"):
+                pool = await self._get_pool()
+                async with pool.acquire() as conn:
+                    async with conn.transaction():
+                        await conn.execute("""
+                            INSERT INTO images (id, url, file_name, content_type, size, created_at, file_path)
+                            VALUES ($1, $2, $3, $4, $5, $6, $7)
+                            ON CONFLICT (id) DO UPDATE 
+                            SET url = $2, file_name = $3, content_type = $4, size = $5, created_at = $6, file_path = $7,
+                                version = images.version + 1
+                        """, 
+                            saved_image.id,
+                            saved_image.url,
+                            saved_image.file_name,
+                            saved_image.content_type,
+                            saved_image.size,
+                            saved_image.created_at,
+                            file_path
+                        )
+                        
+                        # El evento se escribe en la misma transacción que la imagen
+                        if outbox_topic:
+                            await conn.execute(
+                                "INSERT INTO outbox (topic, payload) VALUES ($1, $2::jsonb)",
+                                outbox_topic,
+                                json.dumps(image_created_event(saved_image))
+                            )
+                    
+                    # nextval no es transaccional: avanzar la versión dentro de la
+                    # transacción la haría visible antes que la fila
+                    await conn.execute("SELECT nextval('images_version_seq')")
             
-            print(f"Imagen guardada en PostgreSQL: {saved_image.id}")
+            logger.info("Imagen guardada en PostgreSQL: %s", saved_image.id)
             return saved_image
             
         except Exception as e:
-            print(f"Error guardando imagen en PostgreSQL: {e}")
+            logger.error("Error guardando imagen en PostgreSQL: %s", e)
             raise
     
     async def get_by_id(self, image_id: str) -> Optional[Image]:
         """Obtiene una imagen por su ID."""
         try:
-            conn, conn_id = await self._get_connection()
-            row = await conn.fetchrow("SELECT * FROM images WHERE id = $1", image_id)
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow("SELECT * FROM images WHERE id = $1", image_id)
             
             if not row:
                 return None
@@ -132,14 +215,41 @@ class PostgresImageRepository(ImageRepository):
                 created_at=row['created_at']
             )
         except Exception as e:
-            print(f"Error obteniendo imagen por ID desde PostgreSQL: {e}")
+            logger.error("Error obteniendo imagen por ID desde PostgreSQL: %s", e)
             raise
     
+    async def catalogue_version(self) -> Optional[str]:
+        """Lee la versión del catálogo (valor actual de la secuencia, sin bloquear)."""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT v.epoch, s.last_value, s.is_called "
+                "FROM catalogue_version v, images_version_seq s WHERE v.id = 1"
+            )
+        if not row:
+            return None
+        seq = row['last_value'] if row['is_called'] else 0
+        return f"{row['epoch']}.{seq}"
+    
+    async def image_version(self, image_id: str) -> Optional[str]:
+        """Lee la versión de la fila sin leer la imagen completa."""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT c.epoch, i.version FROM images i, catalogue_version c "
+                "WHERE i.id = $1 AND c.id = 1",
+                image_id
+            )
+        return f"{row['epoch']}.{row['version']}" if row else None
+    
     async def get_all(self) -> List[Image]:
         """Obtiene todas las imágenes."""
         try:
-            conn, conn_id = await self._get_connection()
-            rows = await conn.fetch("SELECT * FROM images ORDER BY created_at DESC")
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                # No basta con ordenar por ID: los catálogos anteriores a UUIDv7 y
+                # los IDs indicados por el cliente no están ordenados por tiempo
+                rows = await conn.fetch("SELECT * FROM images ORDER BY created_at DESC, id DESC")
             
             return [
                 Image(
@@ -153,10 +263,181 @@ class PostgresImageRepository(ImageRepository):
                 for row in rows
             ]
         except Exception as e:
-            print(f"Error obteniendo todas las imágenes desde PostgreSQL: {e}")
+            logger.error("Error obteniendo todas las imágenes desde PostgreSQL: %s", e)
+            raise
+    
+    async def get_page(self, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        """
+        Obtiene una página de imágenes usando el ID como cursor.
+        
+        La página continúa tras la fila del cursor en el orden del listado,
+        recorriendo el índice (created_at, id).
+        """
+        try:
+            sql = "SELECT * FROM images"
+            params = []
+            
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                if cursor:
+                    params.extend(await self._cursor_key(conn, cursor))
+                    sql += " WHERE (created_at, id) < ($1, $2)"
+                params.append(limit)
+                sql += f" ORDER BY created_at DESC, id DESC LIMIT ${len(params)}"
+                rows = await conn.fetch(sql, *params)
+            
+            return [
+                Image(
+                    id=row['id'],
+                    url=row['url'],
+                    file_name=row['file_name'],
+                    content_type=row['content_type'],
+                    size=row['size'],
+                    created_at=row['created_at']
+                )
+                for row in rows
+            ]
+        except Exception as e:
+            logger.error("Error obteniendo página de imágenes desde PostgreSQL: %s", e)
             raise
 
+    async def claim_pending(self, limit: int, lease_seconds: float) -> List[OutboxMessage]:
+        """
+        Reclama los eventos pendientes sin reserva vigente, en orden de inserción.
+        
+        FOR UPDATE SKIP LOCKED hace que dos relays concurrentes se repartan las
+        filas en lugar de esperar uno al otro o reclamar las mismas.
+        """
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                UPDATE outbox SET claimed_until = now() + make_interval(secs => $2)
+                WHERE id IN (
+                    SELECT id FROM outbox
+                    WHERE sent_at IS NULL AND (claimed_until IS NULL OR claimed_until < now())
+                    ORDER BY id LIMIT $1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, topic, payload, created_at
+                """,
+                limit,
+                lease_seconds
+            )
+        
+        # RETURNING no garantiza el orden
+        return sorted(
+            (
+                OutboxMessage(
+                    id=row['id'],
+                    topic=row['topic'],
+                    payload=json.loads(row['payload']),
+                    created_at=row['created_at']
+                )
+                for row in rows
+            ),
+            key=lambda message: message.id
+        )
+    
+    async def mark_sent(self, message_ids: List[int]) -> None:
+        """Marca los eventos indicados como publicados."""
+        if not message_ids:
+            return
+        
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                "UPDATE outbox SET sent_at = now(), claimed_until = NULL WHERE id = ANY($1::bigint[])",
+                message_ids
+            )
+    
+    async def release(self, message_ids: List[int]) -> None:
+        """Libera la reserva de los eventos indicados."""
+        if not message_ids:
+            return
+        
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                "UPDATE outbox SET claimed_until = NULL WHERE id = ANY($1::bigint[]) AND sent_at IS NULL",
+                message_ids
+            )
+    
+    async def prune_sent(self, older_than_seconds: float) -> int:
+        """Elimina los eventos publicados hace más de `older_than_seconds`."""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            status = await conn.execute(
+                "DELETE FROM outbox WHERE sent_at < now() - make_interval(secs => $1)",
+                older_than_seconds
+            )
+        # asyncpg retorna la etiqueta del comando, p. ej. "DELETE 42"
+        return int(status.split()[-1])
+    
+    def pool_stats(self) -> Dict[str, int]:
+        """Conexiones del pool: abiertas, libres y máximo (vacío si aún no existe)."""
+        if self._pool is None:
+            return {}
+        return {
+            "open": self._pool.get_size(),
+            "idle": self._pool.get_idle_size(),
+            "max": self._pool.get_max_size()
+        }
+    
+    async def ping(self) -> None:
+        """Comprueba la conexión con una consulta trivial."""
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+    
     async def close(self):
         """Cierra el pool de conexiones."""
         if self._pool:
-            await self._pool.close()
\ No newline at end of file
+            await self._pool.close()
+    
+    @staticmethod
+    async def _cursor_key(conn, cursor: str):
+        """
+        Clave (created_at, id) de la imagen del cursor.
+        
+        Raises:
+            InvalidCursorError: Si el cursor no existe
+        """
+        row = await conn.fetchrow("SELECT created_at, id FROM images WHERE id = $1", cursor)
+        if row is None:
+            raise InvalidCursorError(f"Cursor desconocido: {cursor}")
+        return row['created_at'], row['id']
+    
+    async def search(self, query: str, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        """Busca imágenes por subcadena de URL o nombre de archivo (índices pg_trgm)."""
+        try:
+            # Escapar comodines de LIKE para buscar el texto literal
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            
+            sql = "SELECT * FROM images WHERE (url ILIKE $1 OR file_name ILIKE $1)"
+            params = [pattern]
+            
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                if cursor:
+                    params.extend(await self._cursor_key(conn, cursor))
+                    sql += " AND (created_at, id) < ($2, $3)"
+                params.append(limit)
+                sql += f" ORDER BY created_at DESC, id DESC LIMIT ${len(params)}"
+                rows = await conn.fetch(sql, *params)
+            
+            return [
+                Image(
+                    id=row['id'],
+                    url=row['url'],
+                    file_name=row['file_name'],
+                    content_type=row['content_type'],
+                    size=row['size'],
+                    created_at=row['created_at']
+                )
+                for row in rows
+            ]
+        except Exception as e:
+            logger.error("Error buscando imágenes en PostgreSQL: %s", e)
+            raise
\ No newline at end of file
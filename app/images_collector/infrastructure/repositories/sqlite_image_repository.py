@@ -1,32 +1,55 @@
 import aiosqlite
-import httpx
+import json
+import logging
 import uuid
 import os
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Optional
 import contextlib
 
+from ...domain.events.image_events import image_created_event
 from ...domain.models.image import Image
-from ...domain.ports.image_repository import ImageRepository
+from ...domain.models.outbox_message import OutboxMessage
+from ...domain.ports.image_fetcher import ImageFetcher
+from ...domain.ports.image_repository import ImageRepository, InvalidCursorError
+from ...domain.ports.outbox_repository import OutboxRepository
+from ..fetchers.httpx_image_fetcher import HttpxImageFetcher
+from ..observability.request_timing import stage_timer
 from ..settings.config import settings
 
-class SQLiteImageRepository(ImageRepository):
+logger = logging.getLogger(__name__)
+
+
+def _db_timestamp(value: datetime) -> str:
+    """
+    Fecha de creación como texto ordenable: UTC con microsegundos fijos.
+    
+    Los listados comparan `created_at` como texto, así que todas las filas
+    deben usar el mismo formato. Las fechas sin zona horaria se asumen en UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+class SQLiteImageRepository(ImageRepository, OutboxRepository):
     """Implementación del repositorio que guarda imágenes en SQLite."""
     
-    def __init__(self):
+    def __init__(self, fetcher: Optional[ImageFetcher] = None):
+        # Sin fetcher compartido el repositorio usa uno propio
+        self.fetcher = fetcher or HttpxImageFetcher()
         self.db_path = settings.sqlite_db_path
         self.storage_path = Path(settings.storage_path)
         self._ensure_storage_dir()
         self._init_db_sync()
-        print(f"Nuevo repositorio SQLite creado: {id(self)}")
+        logger.debug("Nuevo repositorio SQLite creado: %s", id(self))
         
     @contextlib.asynccontextmanager
     async def _get_db_connection(self):
         """Obtiene una conexión a la base de datos y la registra."""
         connection = await aiosqlite.connect(self.db_path)
         connection.row_factory = aiosqlite.Row
-        conn_id = id(connection)
         
         try:
             yield connection
@@ -56,33 +79,153 @@ class SQLiteImageRepository(ImageRepository):
                     file_path TEXT
                 )
             """)
+            # Índice del orden de los listados (fecha de creación y, a igualdad, ID)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_images_created_at ON images (created_at, id)"
+            )
+            self._normalize_created_at(cursor)
+            self._init_image_version(cursor)
+            self._init_search_index(cursor)
+            self._init_outbox(cursor)
+            self._init_catalogue_version(cursor)
             conn.commit()
         finally:
             conn.close()
         
-        print(f"Base de datos SQLite inicializada en: {self.db_path}")
+        logger.info("Base de datos SQLite inicializada en: %s", self.db_path)
     
-    async def save(self, image: Image) -> Image:
+    def _init_image_version(self, cursor):
+        """Agrega la versión por fila (ETag de cada imagen) a las tablas creadas antes de tenerla."""
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(images)")}
+        if "version" not in columns:
+            cursor.execute("ALTER TABLE images ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    
+    def _normalize_created_at(self, cursor):
+        """
+        Reescribe las fechas guardadas en otro formato (p. ej. sin zona horaria,
+        como las de versiones anteriores) con el de `_db_timestamp`.
+        """
+        rows = cursor.execute(
+            "SELECT id, created_at FROM images WHERE created_at IS NOT NULL "
+            "AND (length(created_at) != 32 OR substr(created_at, -6) != '+00:00')"
+        ).fetchall()
+        for image_id, created_at in rows:
+            cursor.execute(
+                "UPDATE images SET created_at = ? WHERE id = ?",
+                (_db_timestamp(datetime.fromisoformat(created_at)), image_id)
+            )
+        if rows:
+            logger.info("Fechas de creación normalizadas a UTC en %d imágenes", len(rows))
+    
+    def _init_search_index(self, cursor):
+        """Crea el índice FTS5 (trigramas) sobre URL y nombre de archivo."""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'images_fts'"
+        )
+        exists = cursor.fetchone() is not None
+        
+        # Tabla de contenido externo: el texto vive en `images`, FTS5 solo guarda el índice
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS images_fts USING fts5(
+                url, file_name,
+                content='images', content_rowid='rowid',
+                tokenize='trigram'
+            )
+        """)
+        
+        # Triggers que mantienen el índice sincronizado en cada escritura
+        cursor.executescript("""
+            CREATE TRIGGER IF NOT EXISTS images_fts_ai AFTER INSERT ON images BEGIN
+                INSERT INTO images_fts(rowid, url, file_name)
+                VALUES (new.rowid, new.url, new.file_name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS images_fts_ad AFTER DELETE ON images BEGIN
+                INSERT INTO images_fts(images_fts, rowid, url, file_name)
+                VALUES ('delete', old.rowid, old.url, old.file_name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS images_fts_au AFTER UPDATE ON images BEGIN
+                INSERT INTO images_fts(images_fts, rowid, url, file_name)
+                VALUES ('delete', old.rowid, old.url, old.file_name);
+                INSERT INTO images_fts(rowid, url, file_name)
+                VALUES (new.rowid, new.url, new.file_name);
+            END;
+        """)
+        
+        # Indexar las filas existentes la primera vez que se crea el índice
+        if not exists:
+            cursor.execute("INSERT INTO images_fts(images_fts) VALUES ('rebuild')")
+    
+    def _init_outbox(self, cursor):
+        """Crea la tabla del outbox transaccional."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                topic TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                sent_at TEXT
+            )
+        """)
+        # Reserva del relay que reclamó el evento (tablas creadas antes de tenerla)
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(outbox)")}
+        if "claimed_until" not in columns:
+            cursor.execute("ALTER TABLE outbox ADD COLUMN claimed_until TEXT")
+        # Índice parcial: el relay solo consulta los eventos pendientes
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outbox_pending
+            ON outbox (id) WHERE sent_at IS NULL
+        """)
+    
+    def _init_catalogue_version(self, cursor):
+        """
+        Crea la versión del catálogo: una fila que los triggers avanzan en cada escritura.
+        
+        Al avanzar en la misma transacción que la escritura, la versión y los
+        datos se hacen visibles a la vez, también entre procesos. El prefijo
+        aleatorio distingue las versiones de una base de datos recreada.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS catalogue_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                epoch TEXT NOT NULL,
+                seq INTEGER NOT NULL
+            )
+        """)
+        cursor.execute(
+            "INSERT OR IGNORE INTO catalogue_version (id, epoch, seq) VALUES (1, ?, 0)",
+            (uuid.uuid4().hex[:8],)
+        )
+        cursor.executescript("""
+            CREATE TRIGGER IF NOT EXISTS images_version_ai AFTER INSERT ON images BEGIN
+                UPDATE catalogue_version SET seq = seq + 1 WHERE id = 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS images_version_ad AFTER DELETE ON images BEGIN
+                UPDATE catalogue_version SET seq = seq + 1 WHERE id = 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS images_version_au AFTER UPDATE ON images BEGIN
+                UPDATE catalogue_version SET seq = seq + 1 WHERE id = 1;
+            END;
+        """)
+    
+    async def save(self, image: Image, outbox_topic: Optional[str] = None) -> Image:
         """Descarga y guarda una imagen desde la URL proporcionada."""
         try:
             # Generar nombre de archivo si no se proporciona
             file_name = image.file_name or f"{uuid.uuid4()}.jpg"
             file_path = str(self.storage_path / file_name)
             
-            # Descargar la imagen
-            async with httpx.AsyncClient() as client:
-                response = await client.get(image.url)
-                response.raise_for_status()
-                
-                # Obtener el tipo de contenido
-                content_type = response.headers.get("content-type", "image/jpeg")
-                
-                # Guardar la imagen en disco
+            # Descargar la imagen con el pool de conexiones compartido
+            with stage_timer("download"):
+                fetched = await self.fetcher.fetch(image.url)
+            content_type = fetched.content_type
+            
+            # Guardar la imagen en disco
+            with stage_timer("disk_write"):
                 with open(file_path, 'wb') as f:
-                    f.write(response.content)
-                
-                # Obtener el tamaño del archivo
-                size = len(response.content)
+                    f.write(fetched.content)
+            
+            # Obtener el tamaño del archivo
+            size = len(fetched.content)
             
             # Crear una nueva instancia con los datos actualizados
             saved_image = Image(
@@ -95,29 +238,51 @@ class SQLiteImageRepository(ImageRepository):
             )
             
             # Guardar en la base de datos usando el connection manager
-            async with self._get_db_connection() as db:
-                await db.execute(
-                    """
-                    INSERT OR REPLACE INTO images (id, url, file_name, content_type, size, created_at, file_path)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        saved_image.id,
-                        saved_image.url,
-                        saved_image.file_name,
-                        saved_image.content_type,
-                        saved_image.size,
-                        saved_image.created_at.isoformat(),
-                        file_path
+            with stage_timer("db_write"):
+                async with self._get_db_connection() as db:
+                    # UPSERT en lugar de INSERT OR REPLACE para que se disparen
+                    # los triggers de actualización del índice de búsqueda
+                    await db.execute(
+                        """
+                        INSERT INTO images (id, url, file_name, content_type, size, created_at, file_path)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(id) DO UPDATE SET
+                            url = excluded.url,
+                            file_name = excluded.file_name,
+                            content_type = excluded.content_type,
+                            size = excluded.size,
+                            created_at = excluded.created_at,
+                            file_path = excluded.file_path,
+                            version = images.version + 1
+                        """,
+                        (
+                            saved_image.id,
+                            saved_image.url,
+                            saved_image.file_name,
+                            saved_image.content_type,
+                            saved_image.size,
+                            _db_timestamp(saved_image.created_at),
+                            file_path
+                        )
                     )
-                )
-                await db.commit()
+                    
+                    # El evento se escribe en la misma transacción que la imagen
+                    if outbox_topic:
+                        await db.execute(
+                            "INSERT INTO outbox (topic, payload, created_at) VALUES (?, ?, ?)",
+                            (
+                                outbox_topic,
+                                json.dumps(image_created_event(saved_image)),
+                                datetime.now(timezone.utc).isoformat()
+                            )
+                        )
+                    await db.commit()
             
-            print(f"Imagen guardada: {saved_image.id}")
+            logger.info("Imagen guardada: %s", saved_image.id)
             return saved_image
             
         except Exception as e:
-            print(f"Error guardando imagen: {e}")
+            logger.error("Error guardando imagen: %s", e)
             raise
     
     async def get_by_id(self, image_id: str) -> Optional[Image]:
@@ -139,14 +304,34 @@ class SQLiteImageRepository(ImageRepository):
                     created_at=datetime.fromisoformat(row['created_at'])
                 )
         except Exception as e:
-            print(f"Error obteniendo imagen por ID: {e}")
+            logger.error("Error obteniendo imagen por ID: %s", e)
             raise
     
+    async def catalogue_version(self) -> Optional[str]:
+        """Lee la versión del catálogo (una fila por clave primaria)."""
+        async with self._get_db_connection() as db:
+            cursor = await db.execute("SELECT epoch, seq FROM catalogue_version WHERE id = 1")
+            row = await cursor.fetchone()
+        return f"{row['epoch']}.{row['seq']}" if row else None
+    
+    async def image_version(self, image_id: str) -> Optional[str]:
+        """Lee la versión de la fila sin leer la imagen completa."""
+        async with self._get_db_connection() as db:
+            cursor = await db.execute(
+                "SELECT c.epoch, i.version FROM images i, catalogue_version c "
+                "WHERE i.id = ? AND c.id = 1",
+                (image_id,)
+            )
+            row = await cursor.fetchone()
+        return f"{row['epoch']}.{row['version']}" if row else None
+    
     async def get_all(self) -> List[Image]:
         """Obtiene todas las imágenes."""
         try:
             async with self._get_db_connection() as db:
-                cursor = await db.execute("SELECT * FROM images ORDER BY created_at DESC")
+                # No basta con ordenar por ID: los catálogos anteriores a UUIDv7 y
+                # los IDs indicados por el cliente no están ordenados por tiempo
+                cursor = await db.execute("SELECT * FROM images ORDER BY created_at DESC, id DESC")
                 rows = await cursor.fetchall()
                 
                 return [
@@ -161,5 +346,171 @@ class SQLiteImageRepository(ImageRepository):
                     for row in rows
                 ]
         except Exception as e:
-            print(f"Error obteniendo todas las imágenes: {e}")
-            raise
\ No newline at end of file
+            logger.error("Error obteniendo todas las imágenes: %s", e)
+            raise
+    
+    async def get_page(self, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        """
+        Obtiene una página de imágenes usando el ID como cursor.
+        
+        La página continúa tras la fila del cursor en el orden del listado,
+        recorriendo el índice (created_at, id).
+        """
+        try:
+            sql = "SELECT * FROM images"
+            params = []
+            
+            async with self._get_db_connection() as db:
+                if cursor:
+                    sql += " WHERE (created_at, id) < (?, ?)"
+                    params.extend(await self._cursor_key(db, cursor))
+                sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+                params.append(limit)
+                
+                cursor_db = await db.execute(sql, params)
+                rows = await cursor_db.fetchall()
+                
+                return [
+                    Image(
+                        id=row['id'],
+                        url=row['url'],
+                        file_name=row['file_name'],
+                        content_type=row['content_type'],
+                        size=row['size'],
+                        created_at=datetime.fromisoformat(row['created_at'])
+                    )
+                    for row in rows
+                ]
+        except Exception as e:
+            logger.error("Error obteniendo página de imágenes: %s", e)
+            raise
+    
+    @staticmethod
+    async def _cursor_key(db, cursor: str):
+        """
+        Clave (created_at, id) de la imagen del cursor.
+        
+        Raises:
+            InvalidCursorError: Si el cursor no existe
+        """
+        cursor_db = await db.execute("SELECT created_at, id FROM images WHERE id = ?", (cursor,))
+        row = await cursor_db.fetchone()
+        if row is None:
+            raise InvalidCursorError(f"Cursor desconocido: {cursor}")
+        return row['created_at'], row['id']
+    
+    async def search(self, query: str, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        """Busca imágenes por subcadena de URL o nombre de archivo usando FTS5."""
+        try:
+            # Frase entre comillas: con el tokenizador de trigramas equivale a
+            # buscar la subcadena exacta sin distinguir mayúsculas
+            match = '"' + query.replace('"', '""') + '"'
+            sql = """
+                SELECT images.* FROM images_fts
+                JOIN images ON images.rowid = images_fts.rowid
+                WHERE images_fts MATCH ?
+            """
+            params = [match]
+            
+            async with self._get_db_connection() as db:
+                if cursor:
+                    sql += " AND (images.created_at, images.id) < (?, ?)"
+                    params.extend(await self._cursor_key(db, cursor))
+                sql += " ORDER BY images.created_at DESC, images.id DESC LIMIT ?"
+                params.append(limit)
+                
+                cursor_db = await db.execute(sql, params)
+                rows = await cursor_db.fetchall()
+                
+                return [
+                    Image(
+                        id=row['id'],
+                        url=row['url'],
+                        file_name=row['file_name'],
+                        content_type=row['content_type'],
+                        size=row['size'],
+                        created_at=datetime.fromisoformat(row['created_at'])
+                    )
+                    for row in rows
+                ]
+        except Exception as e:
+            logger.error("Error buscando imágenes: %s", e)
+            raise
+    
+    async def claim_pending(self, limit: int, lease_seconds: float) -> List[OutboxMessage]:
+        """
+        Reclama los eventos pendientes sin reserva vigente, en orden de inserción.
+        
+        BEGIN IMMEDIATE toma el candado de escritura antes de leer, de modo que
+        dos procesos que comparten el archivo no reclaman las mismas filas.
+        """
+        now = datetime.now(timezone.utc)
+        claimed_until = (now + timedelta(seconds=lease_seconds)).isoformat()
+        
+        async with self._get_db_connection() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = await db.execute(
+                    "SELECT id, topic, payload, created_at FROM outbox "
+                    "WHERE sent_at IS NULL AND (claimed_until IS NULL OR claimed_until < ?) "
+                    "ORDER BY id LIMIT ?",
+                    (now.isoformat(), limit)
+                )
+                rows = await cursor.fetchall()
+                if rows:
+                    placeholders = ", ".join("?" for _ in rows)
+                    await db.execute(
+                        f"UPDATE outbox SET claimed_until = ? WHERE id IN ({placeholders})",
+                        (claimed_until, *(row['id'] for row in rows))
+                    )
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+            
+            return [
+                OutboxMessage(
+                    id=row['id'],
+                    topic=row['topic'],
+                    payload=json.loads(row['payload']),
+                    created_at=datetime.fromisoformat(row['created_at'])
+                )
+                for row in rows
+            ]
+    
+    async def mark_sent(self, message_ids: List[int]) -> None:
+        """Marca los eventos indicados como publicados."""
+        if not message_ids:
+            return
+        
+        placeholders = ", ".join("?" for _ in message_ids)
+        async with self._get_db_connection() as db:
+            await db.execute(
+                f"UPDATE outbox SET sent_at = ?, claimed_until = NULL WHERE id IN ({placeholders})",
+                (datetime.now(timezone.utc).isoformat(), *message_ids)
+            )
+            await db.commit()
+    
+    async def release(self, message_ids: List[int]) -> None:
+        """Libera la reserva de los eventos indicados."""
+        if not message_ids:
+            return
+        
+        placeholders = ", ".join("?" for _ in message_ids)
+        async with self._get_db_connection() as db:
+            await db.execute(
+                f"UPDATE outbox SET claimed_until = NULL WHERE id IN ({placeholders}) AND sent_at IS NULL",
+                tuple(message_ids)
+            )
+            await db.commit()
+    
+    async def prune_sent(self, older_than_seconds: float) -> int:
+        """Elimina los eventos publicados hace más de `older_than_seconds`."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=older_than_seconds)
+        async with self._get_db_connection() as db:
+            cursor = await db.execute(
+                "DELETE FROM outbox WHERE sent_at IS NOT NULL AND sent_at < ?",
+                (cutoff.isoformat(),)
+            )
+            await db.commit()
+            return cursor.rowcount
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Literal
+from typing import Dict, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -11,15 +11,37 @@ class Settings(BaseSettings):
     # HTTP Settings
     http_port: int = 8000
     http_host: str = "0.0.0.0"
+    http_workers: int = 1  # procesos de uvicorn; cada uno inicializa sus propios recursos
+    http_loop: Literal["auto", "asyncio", "uvloop"] = "auto"  # "auto" usa uvloop si está instalado
+    http_parser: Literal["auto", "h11", "httptools"] = "auto"  # "auto" usa httptools si está instalado
+    http_backlog: int = 2048  # conexiones pendientes de aceptar en el socket
+    http_keepalive_timeout: int = 5  # segundos que se mantiene abierta una conexión inactiva
+    http_etag_enabled: bool = True  # ETag e If-None-Match (304) en GET /images/ y /images/{id}
+    http_list_cache_entries: int = 4  # versiones del listado serializado guardadas en memoria
+    http_metrics_port: Optional[int] = None  # puerto base de /metrics por worker (cada uno toma el primero libre)
     
     # GRPC Settings
     grpc_port: int = 8001
     grpc_host: str = "127.0.0.1"
+    grpc_stream_concurrency: int = 16  # recolecciones simultáneas por flujo CollectImages
+    grpc_page_size: int = 500  # tamaño de página interno de GetAllImages
+    grpc_workers: int = 1  # procesos del servidor gRPC (SO_REUSEPORT si es mayor que 1)
+    grpc_shutdown_grace: float = 5.0  # segundos para terminar las llamadas en curso al detenerse
+    grpc_metrics_port: Optional[int] = None  # puerto de /metrics en modo gRPC (más el índice del worker)
     
     # Storage Settings
     storage_type: Literal["file", "sqlite", "postgres"] = "sqlite"
     storage_path: str = "./storage"
     
+    # Descarga de imágenes (pool de conexiones compartido)
+    fetch_timeout: float = 5.0  # segundos por descarga
+    fetch_max_connections: int = 100  # conexiones simultáneas hacia los orígenes
+    
+    # Control de admisión de recolecciones (por proceso, compartido por HTTP y gRPC)
+    admission_max_in_flight: int = 128  # recolecciones simultáneas; 0 desactiva el control
+    admission_max_queue: int = 512  # recolecciones esperando turno antes de rechazar
+    admission_queue_timeout: float = 10.0  # segundos máximos de espera en la cola
+    
     # SQLite Settings
     sqlite_db_path: str = "./storage/images.db"
     
@@ -30,10 +52,70 @@ class Settings(BaseSettings):
     postgres_password: str = "postgres"
     postgres_db: str = "images_db"
     
+    # Mensajería: "pulsar" o "loopback" (broker en memoria para pruebas de
+    # carga y despliegues sin broker)
+    messaging_backend: Literal["pulsar", "loopback"] = "pulsar"
+    loopback_latency_ms: float = 0.0  # latencia simulada por publicación
+    loopback_failure_rate: float = 0.0  # fracción de publicaciones que fallan
+    loopback_max_queue: int = 100000  # mensajes retenidos por tópico
+    
     # Pulsar Settings
     pulsar_service_url: str = "pulsar://broker:6650"
     pulsar_enabled: bool = True
     pulsar_image_topic: str = "persistent://public/default/eventos-suscripcion"
+    # confirm: publish() espera el ack del broker
+    # fire_and_confirm: publish() retorna al encolar y el ack se procesa en segundo plano
+    pulsar_publish_mode: Literal["confirm", "fire_and_confirm"] = "confirm"
+    # Con cola local, espera máxima del ack en la solicitud (modo confirm); si
+    # vence, la confirmación o el paso a disco continúan en segundo plano
+    pulsar_publish_ack_timeout: float = 0.5
+    # Formato de los eventos de imagen: protobuf (ImageCreatedEvent, esquema
+    # registrado en el tópico) o json para consumidores que aún no lo soportan
+    pulsar_event_encoding: Literal["protobuf", "json"] = "protobuf"
+    # Clave de ruteo de los eventos: id de la imagen, host de origen o sin clave
+    pulsar_routing_key: Literal["image_id", "origin_host", "none"] = "image_id"
+    
+    # Cola local en disco para eventos cuando el broker no está disponible
+    pulsar_spill_enabled: bool = True
+    pulsar_spill_path: str = ""  # vacío: <storage_path>/spill
+    pulsar_spill_max_bytes: int = 256 * 1024 * 1024
+    pulsar_spill_segment_bytes: int = 4 * 1024 * 1024
+    pulsar_spill_drain_interval: float = 5.0  # segundos
+    
+    # Workers de recolección (main.py --mode worker)
+    pulsar_collect_topic: str = "persistent://public/default/solicitudes-recoleccion"
+    pulsar_collect_subscription: str = "images-collector-workers"
+    pulsar_collect_subscription_type: Literal["Shared", "Key_Shared"] = "Key_Shared"
+    worker_concurrency: int = 32  # recolecciones simultáneas por worker
+    worker_batch_size: int = 100
+    worker_negative_ack_delay_ms: int = 60000
+    worker_max_redeliveries: int = 5  # 0: reintentar indefinidamente
+    worker_outbox_relay: bool = True  # publicar en el worker los eventos de su outbox
+    
+    # Outbox transaccional (solo repositorios SQLite y PostgreSQL)
+    outbox_enabled: bool = True
+    outbox_batch_size: int = 100
+    outbox_poll_interval: float = 0.5  # segundos
+    outbox_claim_lease: float = 30.0  # segundos que un relay reserva los eventos reclamados
+    outbox_retention_seconds: float = 3600.0  # antigüedad a partir de la cual se eliminan los publicados
+    outbox_prune_interval: float = 60.0  # segundos entre depuraciones del outbox
+    
+    # Logging (JSON por línea, escrito desde un hilo en segundo plano)
+    log_level: str = "INFO"
+    log_format: Literal["json", "text"] = "json"
+    log_levels: Dict[str, str] = {}  # niveles por logger, p. ej. {"uvicorn.access": "WARNING"}
+    log_sample_rates: Dict[str, float] = {}  # fracción de INFO/DEBUG a conservar por logger
+    log_queue_size: int = 10000  # registros en espera antes de empezar a descartar
+    
+    # Comprobaciones de salud en segundo plano
+    health_probe_interval: float = 5.0  # segundos entre rondas de comprobación
+    health_probe_timeout: float = 2.0  # segundos máximos por comprobación
+    health_fetch_probe_url: Optional[str] = None  # URL de imagen para comprobar las descargas
+    
+    # Diagnóstico
+    server_timing_enabled: bool = True  # encabezado Server-Timing / metadata final de gRPC
+    admin_token: Optional[str] = None  # habilita /admin/* con el encabezado X-Admin-Token
+    profile_max_seconds: float = 60.0  # duración máxima de /admin/profile
     
     model_config = SettingsConfigDict(
         env_file=".env", 
@@ -53,7 +135,4 @@ class Settings(BaseSettings):
         if not os.path.isabs(self.sqlite_db_path):
             self.sqlite_db_path = os.path.join(base_dir, self.sqlite_db_path)
 
-settings = Settings()
-print("test.. ",settings.pulsar_service_url)
-print("test.. ",settings.pulsar_service_url)
-
+settings = Settings()
\ No newline at end of file
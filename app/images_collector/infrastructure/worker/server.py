@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import signal
+
+from ...application.services.collect_worker import CollectWorker
+from ..container import build_container
+from ..messaging.factory import create_collect_consumer
+from ..settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def serve():
+    """Inicia un worker que procesa las solicitudes de recolección del broker."""
+    container = await build_container()
+    
+    consumer = create_collect_consumer()
+    worker = CollectWorker(consumer, container.use_case, concurrency=settings.worker_concurrency)
+    
+    # Los eventos de las imágenes recolectadas salen por el outbox, igual que en
+    # la API. Cada worker publica los suyos: con la base de datos local por
+    # defecto (SQLite) ningún otro proceso los vería, y si la comparte con la
+    # API los relays reclaman las filas y no publican dos veces
+    if settings.worker_outbox_relay:
+        container.start_outbox_relay()
+    elif settings.outbox_enabled:
+        logger.warning(
+            "Outbox relay disabled in this worker: events are only published if "
+            "another process with a relay shares the database"
+        )
+    
+    # Detener de forma ordenada con SIGTERM/SIGINT: terminar lo que está en curso
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_event.set)
+    
+    logger.info(
+        "Starting collect worker on %s (concurrency=%s)",
+        settings.pulsar_collect_topic, settings.worker_concurrency
+    )
+    worker.start()
+    
+    try:
+        await stop_event.wait()
+    finally:
+        await worker.stop()
+        await consumer.close()
+        await container.close()
+        logger.info("Collect worker stopped")
\ No newline at end of file
@@ -5,25 +5,36 @@ el servicio ni el dominio.
 """
 import argparse
 import asyncio
+import logging
 import sys
 
+from app.images_collector.infrastructure.observability.logging_setup import configure_logging
 from app.images_collector.infrastructure.settings.config import settings
 
+logger = logging.getLogger(__name__)
 
-async def start_http_server():
+
+def start_http_server(workers: int, loop: str, http: str):
     # Importación condicional para no cargar módulos innecesarios
-    from app.images_collector.infrastructure.http.routes import setup_routes
     import uvicorn
     
-    app = setup_routes()
-    config = uvicorn.Config(
-        app=app,
+    # La aplicación se indica como fábrica importable para que cada worker la
+    # construya en su propio proceso, con su propio publicador y conexiones.
+    # uvicorn crea el event loop, así que la elección de loop sí tiene efecto.
+    uvicorn.run(
+        "app.images_collector.infrastructure.http.routes:setup_routes",
+        factory=True,
         host=settings.http_host,
         port=settings.http_port,
-        reload=settings.debug
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.http_backlog,
+        timeout_keep_alive=settings.http_keepalive_timeout,
+        reload=settings.debug,
+        # Los logs de uvicorn (incluido el de acceso) van al logger raíz y su cola
+        log_config=None
     )
-    server = uvicorn.Server(config)
-    await server.serve()
 
 
 async def start_grpc_server():
@@ -32,22 +43,68 @@ async def start_grpc_server():
     await serve()
 
 
+def start_grpc_workers(workers: int):
+    # Importación condicional para no cargar módulos innecesarios
+    from app.images_collector.infrastructure.grpc.server import serve_multiprocess
+    serve_multiprocess(workers)
+
+
+def start_all(workers: int, loop: str, http: str):
+    # Importación condicional para no cargar módulos innecesarios
+    from app.images_collector.infrastructure.combined.server import run
+    run(http, loop, workers)
+
+
+async def start_worker():
+    # Importación condicional para no cargar módulos innecesarios
+    from app.images_collector.infrastructure.worker.server import serve
+    await serve()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Image Collector Service")
     parser.add_argument(
         "--mode", 
-        choices=["http", "grpc"], 
+        choices=["http", "grpc", "worker", "all"], 
         default="http",
-        help="Execution mode: http for REST API, grpc for gRPC server"
+        help=(
+            "Execution mode: http for REST API, grpc for gRPC server, worker for Pulsar collect worker, "
+            "all for HTTP and gRPC in one process sharing connections"
+        )
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of server processes sharing the port (http, grpc and all modes)"
+    )
+    parser.add_argument(
+        "--loop",
+        choices=["auto", "asyncio", "uvloop"],
+        default=settings.http_loop,
+        help="Event loop implementation (http and all modes)"
+    )
+    parser.add_argument(
+        "--http",
+        choices=["auto", "h11", "httptools"],
+        default=settings.http_parser,
+        help="HTTP protocol implementation for the HTTP server"
     )
     
     args = parser.parse_args()
+    configure_logging()
     
     try:
         if args.mode == "http":
-            asyncio.run(start_http_server())
+            start_http_server(args.workers or settings.http_workers, args.loop, args.http)
+        elif args.mode == "worker":
+            asyncio.run(start_worker())
+        elif args.mode == "all":
+            start_all(args.workers or 1, args.loop, args.http)
+        elif (args.workers or settings.grpc_workers) > 1:
+            start_grpc_workers(args.workers or settings.grpc_workers)
         else:
             asyncio.run(start_grpc_server())
     except KeyboardInterrupt:
-        print("Service stopped")
+        logger.info("Service stopped")
         sys.exit(0)
\ No newline at end of file
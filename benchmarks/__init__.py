@@ -0,0 +1 @@
+"""Benchmarks de rendimiento del servicio de recolección de imágenes."""
\ No newline at end of file
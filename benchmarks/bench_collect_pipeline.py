@@ -0,0 +1,104 @@
+"""
+Benchmark del pipeline de recolección sobre el broker en memoria.
+
+Encola solicitudes de recolección en el tópico de trabajo, las procesa con
+`CollectWorker` y publica los eventos `image_created` con
+`LoopbackMessagePublisher`. El repositorio es un stub en memoria para medir
+solo el costo del pipeline (decodificación, caso de uso, codificación y
+publicación), sin descargas ni base de datos. Con `--latency-ms` se simula el
+tiempo de ida y vuelta del broker para separar su costo del del publicador.
+
+Uso:
+    python -m benchmarks.bench_collect_pipeline --requests 20000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Optional
+
+from app.images_collector.application.services.collect_worker import CollectWorker
+from app.images_collector.application.use_cases.image_collector import ImageCollectorUseCase
+from app.images_collector.domain.models.image import Image
+from app.images_collector.domain.models.received_message import ReceivedMessage
+from app.images_collector.domain.ports.image_repository import ImageRepository
+from app.images_collector.infrastructure.messaging.loopback import (
+    LoopbackBroker,
+    LoopbackMessageConsumer,
+    LoopbackMessagePublisher
+)
+from app.images_collector.infrastructure.settings.config import settings
+
+
+class InMemoryImageRepository(ImageRepository):
+    """Repositorio mínimo: guarda las entidades en un diccionario."""
+
+    def __init__(self):
+        self.images = {}
+
+    async def save(self, image: Image, outbox_topic: Optional[str] = None) -> Image:
+        self.images[image.id] = image
+        return image
+
+    async def get_by_id(self, image_id: str) -> Optional[Image]:
+        return self.images.get(image_id)
+
+    async def get_all(self) -> List[Image]:
+        return list(self.images.values())
+
+    async def get_page(self, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        return []
+
+    async def search(self, query: str, limit: int, cursor: Optional[str] = None) -> List[Image]:
+        return []
+
+
+async def run(requests: int, concurrency: int, latency_ms: float, failure_rate: float) -> dict:
+    """Procesa `requests` solicitudes y retorna el throughput medido."""
+    broker = LoopbackBroker(max_queue=requests * 2)
+    publisher = LoopbackMessagePublisher(broker, latency_ms=latency_ms, failure_rate=failure_rate)
+    consumer = LoopbackMessageConsumer(
+        settings.pulsar_collect_topic, broker, batch_size=settings.worker_batch_size, batch_timeout_ms=50
+    )
+    use_case = ImageCollectorUseCase(InMemoryImageRepository(), publisher)
+    worker = CollectWorker(consumer, use_case, concurrency=concurrency)
+
+    for i in range(requests):
+        payload = {"url": f"https://images{i % 50}.example.com/image_{i}.jpg", "file_name": f"image_{i}.jpg"}
+        broker.put(settings.pulsar_collect_topic, ReceivedMessage(data=json.dumps(payload).encode("utf-8")))
+
+    start = time.perf_counter()
+    worker.start()
+    while consumer.acknowledged + worker.failed < requests:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    await worker.stop()
+
+    stats = publisher.stats()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "latency_ms": latency_ms,
+        "elapsed_s": round(elapsed, 3),
+        "collects_per_second": round(requests / elapsed, 1),
+        "events_published": stats["published"],
+        "events_failed": stats["failed"],
+        "event_bytes": stats["bytes"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de recolección en memoria")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        result = asyncio.run(run(args.requests, concurrency, args.latency_ms, args.failure_rate))
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Benchmark de la conversión entidad -> DTO -> JSON en los endpoints de listado.
+
+Compara el camino original (un `ImageDTO` validado por fila y serialización
+genérica de FastAPI) con el camino rápido (`ImageDTO.from_entity` y
+`dump_images_json`).
+
+Uso:
+    python -m benchmarks.bench_list_images --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import timeit
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.images_collector.application.dto.image_dto import ImageDTO, dump_images_json
+from app.images_collector.domain.models.image import Image
+
+from .common import build_images
+
+
+# Adaptador equivalente al campo de respuesta que FastAPI usa con `List[ImageDTO]`
+_response_field = TypeAdapter(List[ImageDTO])
+
+
+def legacy_path(images: List[Image]) -> bytes:
+    """Camino original: validación por fila, revalidación de la respuesta y json.dumps."""
+    dtos = [
+        ImageDTO(
+            id=img.id,
+            url=img.url,
+            file_name=img.file_name,
+            content_type=img.content_type,
+            size=img.size,
+            created_at=img.created_at
+        )
+        for img in images
+    ]
+    # FastAPI vuelca los modelos, los revalida contra el modelo de respuesta
+    # y luego los codifica con jsonable_encoder + json.dumps
+    validated = _response_field.validate_python([dto.model_dump() for dto in dtos])
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(images: List[Image]) -> bytes:
+    """Camino rápido: construcción sin validación y serialización directa a bytes."""
+    return dump_images_json([ImageDTO.from_entity(img) for img in images])
+
+
+def run(rows: int, repeat: int) -> dict:
+    """Ejecuta ambos caminos y retorna los tiempos mínimos en milisegundos."""
+    images = build_images(rows)
+
+    # Ambos caminos deben producir el mismo documento
+    assert json.loads(legacy_path(images[:10])) == json.loads(fast_path(images[:10]))
+
+    legacy = min(timeit.repeat(lambda: legacy_path(images), number=1, repeat=repeat))
+    fast = min(timeit.repeat(lambda: fast_path(images), number=1, repeat=repeat))
+
+    return {
+        "rows": rows,
+        "legacy_ms": round(legacy * 1000, 3),
+        "fast_ms": round(fast * 1000, 3),
+        "speedup": round(legacy / fast, 2) if fast else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        print(json.dumps(run(rows, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""Utilidades compartidas por los benchmarks: catálogos sintéticos y percentiles."""
+import math
+from datetime import datetime, timezone
+from typing import List
+
+from app.images_collector.domain.models.image import Image
+from app.images_collector.domain.models.image_id import new_image_id
+
+
+def build_images(rows: int) -> List[Image]:
+    """Genera un catálogo sintético de entidades, con IDs crecientes como los reales."""
+    now = datetime.now(timezone.utc)
+    return [
+        Image(
+            id=new_image_id(),
+            url=f"https://images{i % 50}.example.com/path/to/image_{i}.jpg",
+            file_name=f"image_{i}.jpg",
+            content_type="image/jpeg",
+            size=1024 + i,
+            created_at=now
+        )
+        for i in range(rows)
+    ]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano sobre valores ya ordenados."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""
+Pruebas de carga de extremo a extremo: un origen de imágenes local, el
+servicio en un proceso aparte y un generador de carga asíncrono.
+"""
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Prueba de carga de extremo a extremo del servicio.
+
+Levanta un origen de imágenes falso y, para cada combinación de modo
+(`http`, `grpc`, `all`) y almacenamiento (`file`, `sqlite`, `postgres`), el
+servicio en un proceso aparte. Luego lo somete a carga de lazo cerrado con N
+clientes concurrentes por operación (`collect`, `get`, `list`) y reporta
+throughput y latencias p50/p95/p99. En modo `all` los clientes se reparten
+entre HTTP y gRPC.
+
+Cada resultado se imprime como una línea JSON; con `--output` se guarda el
+documento completo (commit, parámetros y resultados) para compararlo con
+`python -m benchmarks.load.compare`.
+
+PostgreSQL usa la instancia indicada por las variables POSTGRES_* y no se
+limpia entre corridas.
+
+Uso:
+    python -m benchmarks.load --modes http grpc --storages sqlite --concurrency 16 64 \
+        --requests 2000 --image-size 65536 --origin-latency-ms 10 --output results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from app.images_collector.infrastructure.settings.config import settings
+
+from .clients import GrpcServiceClient, HttpServiceClient, RequestFailed
+from .service import REPO_ROOT, free_port, origin_process, service_process
+from .stats import summarize
+
+OPERATIONS = ("collect", "get", "list")
+
+
+def make_clients(mode: str, http_port: int, grpc_port: int, concurrency: int) -> list:
+    """Clientes del modo indicado; en modo `all`, uno por protocolo."""
+    clients = []
+    if mode in ("http", "all"):
+        clients.append(HttpServiceClient(http_port, concurrency))
+    if mode in ("grpc", "all"):
+        clients.append(GrpcServiceClient(grpc_port, concurrency))
+    return clients
+
+
+async def drive(
+    clients: list,
+    operation: str,
+    requests: int,
+    concurrency: int,
+    origin_url: str,
+    image_ids: List[str],
+    sequence: itertools.count
+) -> dict:
+    """
+    Ejecuta `requests` operaciones con `concurrency` clientes en lazo cerrado:
+    cada uno envía la siguiente solicitud en cuanto recibe la respuesta.
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def call(client) -> None:
+        if operation == "collect":
+            image_ids.append(await client.collect(f"{origin_url}/img/{next(sequence)}.jpg"))
+        elif operation == "get":
+            await client.get(image_ids[next(sequence) % len(image_ids)])
+        else:
+            await client.list()
+
+    async def worker(index: int) -> None:
+        nonlocal errors
+        client = clients[index % len(clients)]
+        while next(remaining) < requests:
+            start = time.perf_counter()
+            try:
+                await call(client)
+            except (RequestFailed, OSError):
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_scenario(mode: str, storage: str, args, workdir: Path, origin_url: str) -> List[dict]:
+    """Levanta el servicio con un modo y almacenamiento y recorre concurrencias y operaciones."""
+    http_port, grpc_port = free_port(), free_port()
+    results = []
+    try:
+        if storage == "postgres":
+            # El servicio crea el pool en la primera solicitud: sin esta comprobación
+            # el escenario solo mediría errores
+            await check_postgres()
+        async with service_process(mode, storage, http_port, grpc_port, workdir):
+            image_ids: List[str] = []
+            sequence = itertools.count()
+            for concurrency in args.concurrency:
+                clients = make_clients(mode, http_port, grpc_port, concurrency)
+                try:
+                    for operation in args.operations:
+                        if operation == "get" and not image_ids:
+                            continue
+                        requests = args.list_requests if operation == "list" else args.requests
+                        # Calentamiento: conexiones, cachés y JIT de las consultas fuera de la medición
+                        await drive(clients, operation, args.warmup, concurrency, origin_url, image_ids, sequence)
+                        summary = await drive(
+                            clients, operation, requests, concurrency, origin_url, image_ids, sequence
+                        )
+                        result = {
+                            "mode": mode,
+                            "storage": storage,
+                            "operation": operation,
+                            "concurrency": concurrency,
+                            **summary
+                        }
+                        print(json.dumps(result), flush=True)
+                        results.append(result)
+                finally:
+                    for client in clients:
+                        await client.close()
+    except RuntimeError as e:
+        # Un backend no disponible (p. ej. sin PostgreSQL local) no detiene el resto
+        result = {"mode": mode, "storage": storage, "error": str(e).splitlines()[0]}
+        print(json.dumps(result), flush=True)
+        results.append(result)
+    return results
+
+
+async def check_postgres() -> None:
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(settings.postgres_host, settings.postgres_port), timeout=5
+        )
+        writer.close()
+    except (OSError, asyncio.TimeoutError) as e:
+        raise RuntimeError(
+            f"PostgreSQL no disponible en {settings.postgres_host}:{settings.postgres_port}: {e}"
+        ) from e
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="images-load-"))
+    origin_port = free_port()
+    results = []
+    try:
+        async with origin_process(
+            origin_port, args.image_size, args.origin_latency_ms, args.origin_error_rate, workdir
+        ):
+            origin_url = f"http://127.0.0.1:{origin_port}"
+            for mode in args.modes:
+                for storage in args.storages:
+                    results.extend(await run_scenario(mode, storage, args, workdir, origin_url))
+    finally:
+        if args.keep_workdir:
+            print(json.dumps({"workdir": str(workdir)}))
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "commit": current_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "params": {
+            key: value for key, value in vars(args).items() if key not in ("output", "keep_workdir")
+        },
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de extremo a extremo")
+    parser.add_argument("--modes", nargs="+", choices=["http", "grpc", "all"], default=["http", "grpc"])
+    parser.add_argument("--storages", nargs="+", choices=["file", "sqlite", "postgres"], default=["file", "sqlite"])
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="Solicitudes medidas por operación")
+    parser.add_argument("--list-requests", type=int, default=200, help="Solicitudes de listado (catálogo completo)")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--image-size", type=int, default=64 * 1024, help="Bytes por imagen del origen")
+    parser.add_argument("--origin-latency-ms", type=float, default=0.0)
+    parser.add_argument("--origin-error-rate", type=float, default=0.0)
+    parser.add_argument("--output", type=Path, help="Archivo JSON con el documento de resultados")
+    parser.add_argument("--keep-workdir", action="store_true", help="Conservar almacenamiento y logs")
+    args = parser.parse_args()
+
+    document = asyncio.run(run(args))
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Clientes del servicio para el generador de carga: una operación por método."""
+import grpc
+import httpx
+
+from app.images_collector.infrastructure.grpc.protos import images_pb2, images_pb2_grpc
+
+
+class RequestFailed(Exception):
+    """La solicitud terminó con un código de error."""
+
+
+class HttpServiceClient:
+    """Cliente HTTP con un pool de conexiones keep-alive del tamaño de la concurrencia."""
+
+    protocol = "http"
+
+    def __init__(self, port: int, max_connections: int):
+        self._client = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=60.0
+        )
+
+    async def _check(self, response: httpx.Response) -> httpx.Response:
+        if response.status_code >= 400:
+            raise RequestFailed(f"HTTP {response.status_code}")
+        return response
+
+    async def collect(self, url: str) -> str:
+        response = await self._check(await self._client.post("/images/", json={"url": url}))
+        return response.json()["id"]
+
+    async def get(self, image_id: str) -> None:
+        await self._check(await self._client.get(f"/images/{image_id}"))
+
+    async def list(self) -> None:
+        response = await self._check(await self._client.get("/images/"))
+        # Leer el cuerpo completo: el costo de serializar es parte de la operación
+        response.read()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class GrpcServiceClient:
+    """Cliente gRPC sobre un único canal HTTP/2 (las llamadas se multiplexan)."""
+
+    protocol = "grpc"
+
+    def __init__(self, port: int, max_connections: int):
+        self._channel = grpc.aio.insecure_channel(f"127.0.0.1:{port}")
+        self._stub = images_pb2_grpc.ImageCollectorStub(self._channel)
+
+    async def collect(self, url: str) -> str:
+        try:
+            response = await self._stub.CollectImage(images_pb2.ImageRequest(url=url))
+        except grpc.aio.AioRpcError as e:
+            raise RequestFailed(e.code().name) from e
+        return response.id
+
+    async def get(self, image_id: str) -> None:
+        try:
+            await self._stub.GetImageById(images_pb2.ImageIdRequest(id=image_id))
+        except grpc.aio.AioRpcError as e:
+            raise RequestFailed(e.code().name) from e
+
+    async def list(self) -> None:
+        try:
+            async for _ in self._stub.GetAllImages(images_pb2.ListImagesRequest()):
+                pass
+        except grpc.aio.AioRpcError as e:
+            raise RequestFailed(e.code().name) from e
+
+    async def close(self) -> None:
+        await self._channel.close()
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Compara dos documentos de resultados de `benchmarks.load`.
+
+Empareja los escenarios por modo, almacenamiento, operación y concurrencia y
+reporta la variación de throughput y de p99. Termina con código 1 si algún
+escenario empeora más que el umbral, para usarlo antes de un despliegue.
+
+Uso:
+    python -m benchmarks.load.compare baseline.json results.json --threshold 0.10
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+Key = Tuple[str, str, str, int]
+
+
+def index_results(document: dict) -> Dict[Key, dict]:
+    return {
+        (r["mode"], r["storage"], r["operation"], r["concurrency"]): r
+        for r in document["results"]
+        if "error" not in r
+    }
+
+
+def change(before: float, after: float) -> float:
+    """Variación relativa (0.10 = +10 %)."""
+    return (after - before) / before if before else 0.0
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Imprime la comparación; retorna True si hay regresiones."""
+    before, after = index_results(baseline), index_results(current)
+    print(f"baseline {baseline.get('commit')} -> actual {current.get('commit')}")
+    print(f"{'escenario':<40} {'rps':>10} {'Δrps':>8} {'p99 ms':>10} {'Δp99':>8}")
+
+    regressed = False
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key], after[key]
+        rps_change = change(old["throughput_rps"], new["throughput_rps"])
+        p99_change = change(old["p99_ms"], new["p99_ms"])
+        # Menos throughput o más latencia de cola por encima del umbral
+        flag = rps_change < -threshold or p99_change > threshold
+        regressed |= flag
+        name = "/".join(str(part) for part in key)
+        print(
+            f"{name:<40} {new['throughput_rps']:>10.1f} {rps_change:>+8.1%} "
+            f"{new['p99_ms']:>10.2f} {p99_change:>+8.1%}{'  REGRESIÓN' if flag else ''}"
+        )
+
+    for key in sorted(before.keys() - after.keys()):
+        print(f"{'/'.join(str(part) for part in key):<40} sin resultado en la corrida actual")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara resultados de pruebas de carga")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10, help="Variación tolerada (0.10 = 10 %%)")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    sys.exit(1 if compare(baseline, current, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Origen de imágenes falso para las pruebas de carga.
+
+Sirve cualquier ruta con una imagen sintética de tamaño fijo, con latencia y
+tasa de errores configurables, para que la descarga tenga un costo conocido y
+reproducible. Atiende HTTP/1.1 con keep-alive, como los orígenes reales.
+
+Uso:
+    python -m benchmarks.load.origin --port 9000 --size 65536 --latency-ms 20 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import random
+
+# Cabecera JPEG (SOI + APP0) seguida de relleno hasta el tamaño pedido
+_JPEG_HEADER = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"
+
+
+class FakeOrigin:
+    """Servidor HTTP mínimo que responde imágenes sintéticas."""
+
+    def __init__(self, size: int, latency_ms: float = 0.0, error_rate: float = 0.0):
+        self.body = (_JPEG_HEADER + b"\x00" * max(size - len(_JPEG_HEADER), 0))[:max(size, 1)]
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.served = 0
+        self.failed = 0
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = True
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    if line.lower().startswith(b"connection:") and b"close" in line.lower():
+                        keep_alive = False
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                if self.error_rate and random.random() < self.error_rate:
+                    self.failed += 1
+                    status, content_type, body = "503 Service Unavailable", "text/plain", b"error\n"
+                else:
+                    self.served += 1
+                    status, content_type, body = "200 OK", "image/jpeg", self.body
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("ascii")
+                )
+                writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self._handle, host, port, backlog=4096)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Origen de imágenes falso")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--size", type=int, default=64 * 1024, help="Bytes por imagen")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    origin = FakeOrigin(args.size, args.latency_ms, args.error_rate)
+    try:
+        asyncio.run(origin.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""Arranque y parada de los procesos bajo prueba (servicio y origen falso)."""
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Raíz del repositorio: los procesos se lanzan como `python -m ...` desde ahí
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def free_port() -> int:
+    """Puerto TCP libre en la interfaz local."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port: int, process: subprocess.Popen, timeout: float) -> None:
+    """Espera a que el puerto acepte conexiones o a que el proceso termine."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"El proceso terminó con código {process.returncode}")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"El puerto {port} no respondió en {timeout} segundos")
+
+
+class ManagedProcess:
+    """Proceso hijo con su salida en un archivo, detenido con SIGTERM."""
+
+    def __init__(self, args: List[str], env: Dict[str, str], log_path: Path, ports: List[int]):
+        self.args = args
+        self.env = env
+        self.log_path = log_path
+        self.ports = ports
+        self.process: Optional[subprocess.Popen] = None
+
+    async def start(self, timeout: float = 30.0) -> None:
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.process = subprocess.Popen(
+            [sys.executable, *self.args],
+            cwd=REPO_ROOT,
+            env={**os.environ, **self.env},
+            stdout=open(self.log_path, "wb"),
+            stderr=subprocess.STDOUT
+        )
+        try:
+            for port in self.ports:
+                await wait_for_port(port, self.process, timeout)
+        except Exception as e:
+            self.stop()
+            raise RuntimeError(f"{' '.join(self.args)}: {e}\n{self.log_tail()}") from e
+
+    def stop(self, timeout: float = 15.0) -> None:
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+    def log_tail(self, lines: int = 20) -> str:
+        try:
+            return "\n".join(self.log_path.read_text(errors="replace").splitlines()[-lines:])
+        except OSError:
+            return ""
+
+    async def __aenter__(self) -> "ManagedProcess":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.stop()
+
+
+def origin_process(
+    port: int, size: int, latency_ms: float, error_rate: float, workdir: Path
+) -> ManagedProcess:
+    """Origen de imágenes falso en un proceso propio, para no competir con el generador."""
+    return ManagedProcess(
+        [
+            "-m", "benchmarks.load.origin",
+            "--port", str(port),
+            "--size", str(size),
+            "--latency-ms", str(latency_ms),
+            "--error-rate", str(error_rate)
+        ],
+        env={},
+        log_path=workdir / "origin.log",
+        ports=[port]
+    )
+
+
+def service_process(
+    mode: str,
+    storage: str,
+    http_port: int,
+    grpc_port: int,
+    workdir: Path,
+    extra_env: Optional[Dict[str, str]] = None
+) -> ManagedProcess:
+    """
+    Servicio en el modo indicado (`http`, `grpc` o `all`) con el backend de
+    almacenamiento indicado. Los eventos van al broker en memoria para medir
+    el servicio y no el clúster de Pulsar; PostgreSQL usa las variables
+    POSTGRES_* del entorno.
+    """
+    storage_path = workdir / f"{mode}-{storage}"
+    env = {
+        "STORAGE_TYPE": storage,
+        "STORAGE_PATH": str(storage_path),
+        "SQLITE_DB_PATH": str(storage_path / "images.db"),
+        "HTTP_HOST": "127.0.0.1",
+        "HTTP_PORT": str(http_port),
+        "GRPC_HOST": "127.0.0.1",
+        "GRPC_PORT": str(grpc_port),
+        "PULSAR_ENABLED": "true",
+        "MESSAGING_BACKEND": "loopback",
+        "LOG_LEVEL": "WARNING",
+        **(extra_env or {})
+    }
+    ports = {"http": [http_port], "grpc": [grpc_port], "all": [http_port, grpc_port]}[mode]
+    return ManagedProcess(
+        ["-m", "app.main", "--mode", mode],
+        env=env,
+        log_path=workdir / f"service-{mode}-{storage}.log",
+        ports=ports
+    )
\ No newline at end of file
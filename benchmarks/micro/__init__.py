@@ -0,0 +1,3 @@
+"""
+Microbenchmarks de los repositorios y del caso de uso, aislados de la red.
+"""
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+Microbenchmarks de los repositorios y del caso de uso, con la red sustituida
+por un fetcher en memoria.
+
+Para cada backend (`file`, `sqlite`, `postgres`) y tamaño de catálogo carga
+las filas directamente en el almacenamiento y mide, con concurrencia
+controlada:
+
+- Repositorio: `get_by_id`, `get_all` y `save`.
+- Caso de uso: `get_all_images` y `collect_image` (sin publicador).
+
+Cada operación se mide dos veces: una corrida cronometrada (ops/s, p50, p99)
+y otra más corta con tracemalloc (memoria pico asignada durante las llamadas
+y memoria retenida por operación), para que el trazado no distorsione los
+tiempos. Las escrituras se miden al final, de modo que las lecturas ven el
+catálogo sembrado.
+
+PostgreSQL usa una base de datos temporal creada en la instancia de
+`POSTGRES_*` y eliminada al terminar.
+
+Uso:
+    python -m benchmarks.micro --backends file sqlite --rows 1000 100000 --concurrency 1 16
+    python -m benchmarks.micro --baseline benchmarks/micro/baseline.json
+    python -m benchmarks.micro --output benchmarks/micro/baseline.json   # actualizar la línea base
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from app.images_collector.application.dto.image_dto import ImageDTO
+from app.images_collector.application.use_cases.image_collector import ImageCollectorUseCase
+from app.images_collector.domain.models.image import Image
+from app.images_collector.domain.models.image_id import new_image_id
+from app.images_collector.infrastructure.settings.config import settings
+
+from ..common import build_images, percentile
+from .fixtures import (
+    StubImageFetcher,
+    create_postgres_database,
+    create_repository,
+    drop_postgres_database,
+    seed
+)
+
+# Lecturas primero: las escrituras agregan filas al catálogo sembrado
+OPERATIONS = (
+    ("repository", "get_by_id"),
+    ("repository", "get_all"),
+    ("use_case", "get_all_images"),
+    ("repository", "save"),
+    ("use_case", "collect_image")
+)
+# Operaciones que recorren el catálogo completo: se ejecutan menos veces
+LIST_OPERATIONS = {"get_all", "get_all_images"}
+
+Call = Callable[[int], Awaitable]
+
+
+def make_call(operation: str, repository, use_case, ids: List[str]) -> Call:
+    """Función que ejecuta la i-ésima llamada de la operación."""
+    rng = random.Random(0)
+    if operation == "get_by_id":
+        return lambda i: repository.get_by_id(ids[rng.randrange(len(ids))])
+    if operation == "get_all":
+        return lambda i: repository.get_all()
+    if operation == "get_all_images":
+        return lambda i: use_case.get_all_images()
+    if operation == "save":
+        return lambda i: repository.save(
+            Image(id=new_image_id(), url=f"https://bench.example.com/save_{i}.jpg")
+        )
+    return lambda i: use_case.collect_image(ImageDTO(url=f"https://bench.example.com/collect_{i}.jpg"))
+
+
+async def run_calls(call: Call, operations: int, concurrency: int) -> List[float]:
+    """Ejecuta `operations` llamadas con `concurrency` tareas y retorna sus latencias."""
+    latencies: List[float] = []
+    counter = itertools.count()
+
+    async def worker() -> None:
+        while (i := next(counter)) < operations:
+            start = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def measure(call: Call, operations: int, concurrency: int, alloc_operations: int) -> dict:
+    """Throughput, latencias y memoria de una operación."""
+    await run_calls(call, max(operations // 10, 1), concurrency)
+
+    start = time.perf_counter()
+    latencies = sorted(await run_calls(call, operations, concurrency))
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    await run_calls(call, alloc_operations, concurrency)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "operations": operations,
+        "ops_per_s": round(operations / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "peak_alloc_kib": round((peak - baseline) / 1024, 1),
+        "retained_kib_per_op": round((current - baseline) / 1024 / alloc_operations, 2)
+    }
+
+
+async def run_backend(backend: str, rows: int, args) -> List[dict]:
+    """Siembra un catálogo de `rows` filas en el backend y mide todas las operaciones."""
+    workdir = Path(tempfile.mkdtemp(prefix="images-micro-"))
+    database: Optional[str] = None
+    if backend == "postgres":
+        database = await create_postgres_database()
+        settings.postgres_db = database
+
+    fetcher = StubImageFetcher(args.image_size)
+    repository = create_repository(backend, workdir, fetcher)
+    results = []
+    try:
+        images = build_images(rows)
+        start = time.perf_counter()
+        await seed(repository, backend, images)
+        seed_s = time.perf_counter() - start
+        ids = [image.id for image in images]
+        del images
+
+        use_case = ImageCollectorUseCase(repository)
+        for concurrency in args.concurrency:
+            for target, operation in OPERATIONS:
+                if operation not in args.operations:
+                    continue
+                list_operation = operation in LIST_OPERATIONS
+                summary = await measure(
+                    make_call(operation, repository, use_case, ids),
+                    args.list_ops if list_operation else args.ops,
+                    concurrency,
+                    args.list_alloc_ops if list_operation else args.alloc_ops
+                )
+                result = {
+                    "target": target,
+                    "backend": backend,
+                    "operation": operation,
+                    "rows": rows,
+                    "concurrency": concurrency,
+                    **summary,
+                    "seed_s": round(seed_s, 2),
+                    # Máximo del proceso hasta ahora (KiB en Linux)
+                    "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+                }
+                print(json.dumps(result), flush=True)
+                results.append(result)
+    finally:
+        if hasattr(repository, "close"):
+            await repository.close()
+        await fetcher.close()
+        if database:
+            await drop_postgres_database(database)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def result_key(result: dict) -> str:
+    return "/".join(
+        str(result[field]) for field in ("target", "backend", "operation", "rows", "concurrency")
+    )
+
+
+def compare(baseline: dict, results: List[dict], threshold: float) -> bool:
+    """Imprime la variación frente a la línea base; retorna True si hay regresiones."""
+    before = {result_key(result): result for result in baseline["results"]}
+    print(f"\nlínea base {baseline.get('commit')} ({baseline.get('created_at')})")
+    print(f"{'escenario':<52} {'ops/s':>10} {'Δops/s':>8} {'pico KiB':>10} {'Δpico':>8}")
+
+    regressed = False
+    for result in results:
+        key = result_key(result)
+        old = before.get(key)
+        if old is None:
+            print(f"{key:<52} sin línea base")
+            continue
+        ops_change = (result["ops_per_s"] - old["ops_per_s"]) / old["ops_per_s"]
+        peak_change = (
+            (result["peak_alloc_kib"] - old["peak_alloc_kib"]) / old["peak_alloc_kib"]
+            if old["peak_alloc_kib"] > 0 else 0.0
+        )
+        # Las variaciones de memoria de pocos KiB son ruido del recolector
+        flag = ops_change < -threshold or (
+            peak_change > threshold and result["peak_alloc_kib"] - old["peak_alloc_kib"] > 64
+        )
+        regressed |= flag
+        print(
+            f"{key:<52} {result['ops_per_s']:>10.1f} {ops_change:>+8.1%} "
+            f"{result['peak_alloc_kib']:>10.1f} {peak_change:>+8.1%}{'  REGRESIÓN' if flag else ''}"
+        )
+    return regressed
+
+
+def current_commit() -> Optional[str]:
+    import subprocess
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> List[dict]:
+    results = []
+    for backend in args.backends:
+        for rows in args.rows:
+            try:
+                results.extend(await run_backend(backend, rows, args))
+            except OSError as e:
+                # Un backend no disponible (p. ej. sin PostgreSQL local) no detiene el resto
+                print(json.dumps({"backend": backend, "rows": rows, "error": str(e)}), flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks de repositorios y caso de uso")
+    parser.add_argument("--backends", nargs="+", choices=["file", "sqlite", "postgres"], default=["file", "sqlite"])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="Tamaños de catálogo (hasta 10^6)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--operations", nargs="+", choices=[op for _, op in OPERATIONS], default=[op for _, op in OPERATIONS])
+    parser.add_argument("--ops", type=int, default=500, help="Llamadas medidas por operación puntual")
+    parser.add_argument("--list-ops", type=int, default=5, help="Llamadas medidas por listado completo")
+    parser.add_argument("--alloc-ops", type=int, default=100, help="Llamadas trazadas con tracemalloc")
+    parser.add_argument("--list-alloc-ops", type=int, default=1)
+    parser.add_argument("--image-size", type=int, default=16 * 1024, help="Bytes por imagen guardada")
+    parser.add_argument("--baseline", type=Path, help="Documento de resultados con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Variación tolerada (0.15 = 15 %%)")
+    parser.add_argument("--output", type=Path, help="Guardar el documento de resultados (p. ej. como nueva línea base)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        document = {
+            "commit": current_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "params": {key: value for key, value in vars(args).items() if key not in ("baseline", "output")},
+            "results": results
+        }
+        args.output.write_text(json.dumps(document, indent=2, default=str))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        sys.exit(1 if compare(baseline, results, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
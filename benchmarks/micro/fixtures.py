@@ -0,0 +1,130 @@
+"""Catálogos sintéticos, fetcher sin red y repositorios listos para medir."""
+import sqlite3
+import uuid
+from pathlib import Path
+from typing import List
+
+from app.images_collector.domain.models.fetched_image import FetchedImage
+from app.images_collector.domain.models.image import Image
+from app.images_collector.domain.ports.image_fetcher import ImageFetcher
+from app.images_collector.domain.ports.image_repository import ImageRepository
+from app.images_collector.infrastructure.settings.config import settings
+
+
+class StubImageFetcher(ImageFetcher):
+    """Fetcher que retorna siempre el mismo contenido, sin E/S de red."""
+
+    def __init__(self, size: int):
+        self.image = FetchedImage(content=b"\xff\xd8\xff\xe0" + b"\x00" * max(size - 4, 0), content_type="image/jpeg")
+
+    async def fetch(self, url: str) -> FetchedImage:
+        return self.image
+
+    async def close(self) -> None:
+        pass
+
+
+async def create_postgres_database() -> str:
+    """
+    Crea una base de datos temporal para no tocar la de `POSTGRES_DB`.
+
+    Returns:
+        str: Nombre de la base de datos creada
+    """
+    import asyncpg
+
+    name = f"images_bench_{uuid.uuid4().hex[:8]}"
+    conn = await asyncpg.connect(
+        host=settings.postgres_host,
+        port=settings.postgres_port,
+        user=settings.postgres_user,
+        password=settings.postgres_password,
+        database="postgres"
+    )
+    try:
+        await conn.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        await conn.close()
+    return name
+
+
+async def drop_postgres_database(name: str) -> None:
+    import asyncpg
+
+    conn = await asyncpg.connect(
+        host=settings.postgres_host,
+        port=settings.postgres_port,
+        user=settings.postgres_user,
+        password=settings.postgres_password,
+        database="postgres"
+    )
+    try:
+        await conn.execute(f'DROP DATABASE IF EXISTS "{name}"')
+    finally:
+        await conn.close()
+
+
+def create_repository(backend: str, workdir: Path, fetcher: ImageFetcher) -> ImageRepository:
+    """
+    Crea el repositorio indicado sobre un directorio de trabajo propio.
+
+    Los repositorios leen sus rutas de `settings` al construirse, por eso se
+    ajustan antes de crearlos.
+    """
+    settings.storage_path = str(workdir / "storage")
+    settings.sqlite_db_path = str(workdir / "images.db")
+
+    if backend == "sqlite":
+        from app.images_collector.infrastructure.repositories.sqlite_image_repository import SQLiteImageRepository
+        return SQLiteImageRepository(fetcher)
+    if backend == "postgres":
+        from app.images_collector.infrastructure.repositories.postgres_image_repository import PostgresImageRepository
+        return PostgresImageRepository(fetcher)
+
+    from app.images_collector.infrastructure.repositories.file_image_repository import FileImageRepository
+    return FileImageRepository(fetcher)
+
+
+async def seed(repository: ImageRepository, backend: str, images: List[Image]) -> None:
+    """
+    Carga el catálogo directamente en el almacenamiento, sin pasar por `save`:
+    medir con 10^6 filas no debería requerir 10^6 descargas y escrituras.
+    """
+    if backend == "file":
+        repository.images_metadata.update((image.id, image) for image in images)
+        return
+
+    records = [
+        (
+            image.id,
+            image.url,
+            image.file_name,
+            image.content_type,
+            image.size,
+            image.created_at,
+            str(Path(settings.storage_path) / image.file_name)
+        )
+        for image in images
+    ]
+
+    if backend == "sqlite":
+        conn = sqlite3.connect(settings.sqlite_db_path)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO images (id, url, file_name, content_type, size, created_at, file_path) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(*record[:5], record[5].isoformat(), record[6]) for record in records]
+                )
+        finally:
+            conn.close()
+        return
+
+    pool = await repository._get_pool()
+    async with pool.acquire() as conn:
+        await conn.copy_records_to_table(
+            "images",
+            records=records,
+            columns=["id", "url", "file_name", "content_type", "size", "created_at", "file_path"]
+        )
+        await conn.execute("ANALYZE images")
\ No newline at end of file
@@ -0,0 +1,181 @@
+import asyncio
+
+import grpc
+import pytest
+from fastapi import HTTPException
+
+from app.images_collector.application.dto.image_dto import ImageDTO
+from app.images_collector.application.services.admission_controller import (
+    AdmissionController,
+    AdmissionRejected
+)
+from app.images_collector.application.use_cases.image_collector import ImageCollectorUseCase
+from app.images_collector.infrastructure.grpc.protos import images_pb2
+from app.images_collector.infrastructure.grpc.server import ImageCollectorServicer
+from app.images_collector.infrastructure.http.controllers.image_controller import ImageController
+
+
+async def _hold(controller: AdmissionController, started: asyncio.Event, release: asyncio.Event) -> None:
+    async with controller.admit():
+        started.set()
+        await release.wait()
+
+
+def test_admits_up_to_max_in_flight():
+    async def scenario():
+        controller = AdmissionController(2, max_queue=0)
+        release = asyncio.Event()
+        started = [asyncio.Event(), asyncio.Event()]
+        holders = [asyncio.create_task(_hold(controller, event, release)) for event in started]
+        await asyncio.gather(*(event.wait() for event in started))
+        
+        assert controller.in_flight == 2
+        release.set()
+        await asyncio.gather(*holders)
+        return controller
+    
+    controller = asyncio.run(scenario())
+    assert controller.in_flight == 0
+    assert controller.admitted == 2
+    assert controller.rejected == 0
+
+
+def test_rejects_when_queue_is_full():
+    async def scenario():
+        controller = AdmissionController(1, max_queue=1, queue_timeout=5.0)
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, started, release))
+        await started.wait()
+        
+        # Ocupa la única posición de la cola
+        queued = asyncio.create_task(_hold(controller, asyncio.Event(), release))
+        await asyncio.sleep(0)
+        assert controller.waiting == 1
+        
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit():
+                pass
+        
+        release.set()
+        await asyncio.gather(holder, queued)
+        return controller, rejected.value
+    
+    controller, error = asyncio.run(scenario())
+    assert error.retry_after >= 1
+    assert controller.rejected == 1
+    assert controller.admitted == 2
+    assert controller.waiting == 0
+
+
+def test_rejects_when_queue_wait_times_out():
+    async def scenario():
+        controller = AdmissionController(1, max_queue=4, queue_timeout=0.05)
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, started, release))
+        await started.wait()
+        
+        with pytest.raises(AdmissionRejected):
+            async with controller.admit():
+                pass
+        
+        release.set()
+        await holder
+        return controller
+    
+    controller = asyncio.run(scenario())
+    assert controller.rejected == 1
+    assert controller.waiting == 0
+    assert controller.in_flight == 0
+
+
+def test_queued_operation_runs_when_a_slot_is_released():
+    async def scenario():
+        controller = AdmissionController(1, max_queue=1, queue_timeout=5.0)
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, started, release))
+        await started.wait()
+        
+        queued_started = asyncio.Event()
+        queued = asyncio.create_task(_hold(controller, queued_started, asyncio.Event()))
+        await asyncio.sleep(0)
+        assert not queued_started.is_set()
+        
+        release.set()
+        await holder
+        await asyncio.wait_for(queued_started.wait(), 1.0)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        return controller
+    
+    controller = asyncio.run(scenario())
+    assert controller.rejected == 0
+    assert controller.in_flight == 0
+
+
+class FakeServicerContext:
+    def __init__(self):
+        self.code = None
+        self.details = None
+        self.trailing_metadata = ()
+    
+    def set_code(self, code):
+        self.code = code
+    
+    def set_details(self, details):
+        self.details = details
+    
+    def set_trailing_metadata(self, metadata):
+        self.trailing_metadata = metadata
+
+
+async def _saturated_use_case(release: asyncio.Event):
+    """Caso de uso con la única posición ocupada y sin cola: la siguiente recolección se rechaza."""
+    controller = AdmissionController(1, max_queue=0)
+    started = asyncio.Event()
+    holder = asyncio.create_task(_hold(controller, started, release))
+    await started.wait()
+    # El repositorio no se usa: el rechazo ocurre antes de guardar
+    return ImageCollectorUseCase(image_repository=None, admission=controller), holder
+
+
+def test_http_collect_returns_429_with_retry_after():
+    async def scenario():
+        release = asyncio.Event()
+        use_case, holder = await _saturated_use_case(release)
+        try:
+            with pytest.raises(HTTPException) as rejected:
+                await ImageController().collect_image(
+                    ImageDTO(url="https://images.example.com/a.jpg"), use_case=use_case
+                )
+        finally:
+            release.set()
+            await holder
+        return rejected.value
+    
+    error = asyncio.run(scenario())
+    assert error.status_code == 429
+    assert int(error.headers["Retry-After"]) >= 1
+
+
+def test_grpc_collect_returns_resource_exhausted_with_retry_after_ms():
+    async def scenario():
+        release = asyncio.Event()
+        use_case, holder = await _saturated_use_case(release)
+        context = FakeServicerContext()
+        try:
+            response = await ImageCollectorServicer(use_case).CollectImage(
+                images_pb2.ImageRequest(url="https://images.example.com/a.jpg"), context
+            )
+        finally:
+            release.set()
+            await holder
+        return response, context
+    
+    response, context = asyncio.run(scenario())
+    assert response == images_pb2.ImageResponse()
+    assert context.code == grpc.StatusCode.RESOURCE_EXHAUSTED
+    metadata = dict(context.trailing_metadata)
+    assert int(metadata["retry-after-ms"]) >= 1000
\ No newline at end of file
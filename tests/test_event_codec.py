@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+
+from app.images_collector.infrastructure.messaging.event_codec import (
+    JsonEventCodec,
+    ProtobufEventCodec,
+    TopicCodecs,
+    message_to_dict
+)
+from app.images_collector.infrastructure.messaging.loopback import LoopbackMessagePublisher
+from app.images_collector.infrastructure.messaging.pulsar_publisher import PulsarMessagePublisher
+from app.images_collector.infrastructure.settings.config import settings
+
+
+class Payload(BaseModel):
+    url: str
+
+
+def test_image_topic_uses_configured_encoding_and_others_json():
+    codecs = TopicCodecs("protobuf", "images")
+    
+    assert isinstance(codecs.for_topic("images"), ProtobufEventCodec)
+    assert isinstance(codecs.for_topic("collect"), JsonEventCodec)
+
+
+def test_message_to_dict_accepts_models_and_dicts():
+    assert message_to_dict({"url": "a"}) == {"url": "a"}
+    assert message_to_dict(Payload(url="a")) == {"url": "a"}
+
+
+def test_loopback_and_pulsar_publishers_encode_alike(monkeypatch):
+    monkeypatch.setattr(settings, "pulsar_spill_enabled", False)
+    message = Payload(url="https://images.example.com/a.jpg")
+    
+    loopback = LoopbackMessagePublisher()._codecs.encode("collect", message)
+    pulsar = PulsarMessagePublisher()._codecs.encode("collect", message)
+    
+    assert loopback == pulsar
\ No newline at end of file
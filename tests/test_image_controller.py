@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.images_collector.application.dto.image_dto import ImageDTO
+from app.images_collector.infrastructure.http.controllers.image_controller import ImageController
+
+
+class FakeUseCase:
+    """Caso de uso con una sola imagen cuya versión mantiene el repositorio."""
+    
+    def __init__(self):
+        self.reads = 0
+    
+    async def image_version(self, image_id: str):
+        return "epoch.3" if image_id == "a" else None
+    
+    async def get_image_by_id(self, image_id: str):
+        self.reads += 1
+        return ImageDTO(
+            id="a",
+            url="https://images.example.com/a.jpg",
+            created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+
+
+def test_detail_etag_is_the_row_version():
+    use_case = FakeUseCase()
+    
+    response = asyncio.run(ImageController().get_image_by_id("a", None, use_case=use_case))
+    
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"epoch.3"'
+
+
+def test_matching_detail_etag_answers_304_without_reading_the_image():
+    use_case = FakeUseCase()
+    
+    response = asyncio.run(ImageController().get_image_by_id("a", '"epoch.3"', use_case=use_case))
+    
+    assert response.status_code == 304
+    assert use_case.reads == 0
\ No newline at end of file
@@ -0,0 +1,48 @@
+import uuid
+
+from app.images_collector.domain.models import image_id
+from app.images_collector.domain.models.image_id import ImageIdGenerator
+
+
+def _timestamp_ms(value: str) -> int:
+    return uuid.UUID(value).int >> 80
+
+
+def test_ids_are_uuidv7_rfc4122():
+    value = uuid.UUID(ImageIdGenerator().new_id())
+    
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_ids_are_strictly_increasing():
+    generator = ImageIdGenerator()
+    ids = [generator.new_id() for _ in range(10_000)]
+    
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_counter_overflow_advances_to_next_millisecond(monkeypatch):
+    now_ns = 1_700_000_000_000 * 1_000_000
+    monkeypatch.setattr(image_id.time, "time_ns", lambda: now_ns)
+    generator = ImageIdGenerator()
+    
+    # Con el reloj detenido, 4097 IDs agotan el contador de 12 bits
+    ids = [generator.new_id() for _ in range(ImageIdGenerator._COUNTER_MAX + 2)]
+    
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert _timestamp_ms(ids[0]) == now_ns // 1_000_000
+    assert _timestamp_ms(ids[-1]) == now_ns // 1_000_000 + 1
+
+
+def test_clock_going_backwards_keeps_order(monkeypatch):
+    clock = iter([2_000, 1_000, 1_500])
+    monkeypatch.setattr(image_id.time, "time_ns", lambda: next(clock) * 1_000_000)
+    generator = ImageIdGenerator()
+    
+    ids = [generator.new_id() for _ in range(3)]
+    
+    assert ids == sorted(ids)
+    assert all(_timestamp_ms(value) == 2_000 for value in ids)
\ No newline at end of file
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Dict, List
+
+from app.images_collector.application.services.outbox_relay import OutboxRelay
+from app.images_collector.domain.models.outbox_message import OutboxMessage
+from app.images_collector.domain.ports.message_publisher import MessagePublisher
+from app.images_collector.domain.ports.outbox_repository import OutboxRepository
+
+
+class FakeOutbox(OutboxRepository):
+    def __init__(self, messages: List[OutboxMessage]):
+        self.messages = messages
+        self.sent: List[int] = []
+        self.released: List[int] = []
+    
+    async def claim_pending(self, limit: int, lease_seconds: float) -> List[OutboxMessage]:
+        return self.messages[:limit]
+    
+    async def mark_sent(self, message_ids: List[int]) -> None:
+        self.sent.extend(message_ids)
+    
+    async def release(self, message_ids: List[int]) -> None:
+        self.released.extend(message_ids)
+    
+    async def prune_sent(self, older_than_seconds: float) -> int:
+        return 0
+
+
+class FakePublisher(MessagePublisher):
+    """Publica todo salvo los payloads cuyo `n` está en `failing`."""
+    
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls: List[tuple] = []
+    
+    async def publish(self, topic: str, message: Dict[str, Any]) -> bool:
+        return (await self.publish_many(topic, [message]))[0]
+    
+    async def publish_many(self, topic: str, messages: List[Dict[str, Any]]) -> List[bool]:
+        self.calls.append((topic, [message["n"] for message in messages]))
+        return [message["n"] not in self.failing for message in messages]
+    
+    async def close(self) -> None:
+        pass
+
+
+def _messages(*topics: str) -> List[OutboxMessage]:
+    return [OutboxMessage(id=i + 1, topic=topic, payload={"n": i + 1}) for i, topic in enumerate(topics)]
+
+
+def test_marks_every_message_when_all_are_published():
+    outbox = FakeOutbox(_messages("a", "a", "b"))
+    publisher = FakePublisher()
+    
+    sent = asyncio.run(OutboxRelay(outbox, publisher).relay_once())
+    
+    assert sent == 3
+    assert outbox.sent == [1, 2, 3]
+    assert outbox.released == []
+    # Un tramo por tópico consecutivo
+    assert publisher.calls == [("a", [1, 2]), ("b", [3])]
+
+
+def test_partial_failure_marks_only_the_published_prefix():
+    outbox = FakeOutbox(_messages("a", "a", "a", "a"))
+    # El 3 falla: el 4 se publicó pero no puede marcarse sin romper el orden
+    publisher = FakePublisher(failing={3})
+    
+    sent = asyncio.run(OutboxRelay(outbox, publisher).relay_once())
+    
+    assert sent == 2
+    assert outbox.sent == [1, 2]
+    assert outbox.released == [3, 4]
+
+
+def test_failure_stops_before_later_topics():
+    outbox = FakeOutbox(_messages("a", "a", "b", "b"))
+    publisher = FakePublisher(failing={2})
+    
+    sent = asyncio.run(OutboxRelay(outbox, publisher).relay_once())
+    
+    assert sent == 1
+    assert outbox.sent == [1]
+    assert outbox.released == [2, 3, 4]
+    assert publisher.calls == [("a", [1, 2])]
\ No newline at end of file
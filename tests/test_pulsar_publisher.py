@@ -0,0 +1,24 @@
+import asyncio
+
+from app.images_collector.infrastructure.messaging.pulsar_publisher import PulsarMessagePublisher
+from app.images_collector.infrastructure.observability.metrics import PUBLISH_DROPPED
+from app.images_collector.infrastructure.settings.config import settings
+
+
+class BrokenSpill:
+    def append(self, topic, message):
+        raise OSError(28, "No space left on device")
+
+
+def test_spill_disk_error_drops_the_event(monkeypatch):
+    monkeypatch.setattr(settings, "pulsar_spill_enabled", False)
+    publisher = PulsarMessagePublisher()
+    publisher._spill = BrokenSpill()
+    dropped = PUBLISH_DROPPED.labels("spill-test")
+    before = dropped.value
+    
+    stored = asyncio.run(publisher._spill_event("spill-test", {"n": 1}))
+    
+    assert stored is False
+    assert dropped.value == before + 1
+    assert publisher._failed_count == 1
\ No newline at end of file
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.images_collector.infrastructure.http.response_cache import VersionedBodyCache
+
+
+def test_concurrent_requests_share_one_build():
+    builds = 0
+    
+    async def build() -> bytes:
+        nonlocal builds
+        builds += 1
+        await asyncio.sleep(0.01)
+        return b"[]"
+    
+    async def scenario():
+        cache = VersionedBodyCache()
+        return await asyncio.gather(*(cache.get_or_build("v1", build) for _ in range(10)))
+    
+    bodies = asyncio.run(scenario())
+    assert bodies == [b"[]"] * 10
+    assert builds == 1
+
+
+def test_cached_version_is_not_rebuilt():
+    builds = []
+    
+    async def scenario():
+        cache = VersionedBodyCache()
+        
+        async def build() -> bytes:
+            builds.append(1)
+            return b"body"
+        
+        first = await cache.get_or_build("v1", build)
+        second = await cache.get_or_build("v1", build)
+        return first, second
+    
+    assert asyncio.run(scenario()) == (b"body", b"body")
+    assert len(builds) == 1
+
+
+def test_evicts_least_recently_used_versions():
+    built = []
+    
+    def builder(version: str):
+        async def build() -> bytes:
+            built.append(version)
+            return version.encode()
+        return build
+    
+    async def scenario():
+        cache = VersionedBodyCache(max_entries=2)
+        await cache.get_or_build("v1", builder("v1"))
+        await cache.get_or_build("v2", builder("v2"))
+        # Usar v1 la deja como la más reciente: v2 sale al entrar v3
+        await cache.get_or_build("v1", builder("v1"))
+        await cache.get_or_build("v3", builder("v3"))
+        await cache.get_or_build("v1", builder("v1"))
+        await cache.get_or_build("v2", builder("v2"))
+    
+    asyncio.run(scenario())
+    assert built == ["v1", "v2", "v3", "v2"]
+
+
+def test_failed_build_is_not_cached():
+    attempts = 0
+    
+    async def build() -> bytes:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("base de datos no disponible")
+        return b"ok"
+    
+    async def scenario():
+        cache = VersionedBodyCache()
+        with pytest.raises(RuntimeError):
+            await cache.get_or_build("v1", build)
+        return await cache.get_or_build("v1", build)
+    
+    assert asyncio.run(scenario()) == b"ok"
+    assert attempts == 2
\ No newline at end of file
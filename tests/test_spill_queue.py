@@ -0,0 +1,124 @@
+from app.images_collector.infrastructure.messaging.spill_queue import SpillQueue
+
+
+def _segment_files(queue: SpillQueue):
+    return sorted(queue.directory.glob("segment-*.log"))
+
+
+def test_append_and_read_batch_in_order(tmp_path):
+    queue = SpillQueue(str(tmp_path))
+    for i in range(5):
+        assert queue.append("images", {"n": i})
+    
+    records = queue.read_batch(3)
+    
+    assert [record.message["n"] for record in records] == [0, 1, 2]
+    assert all(record.topic == "images" for record in records)
+    # Leer no consume: la siguiente lectura empieza en el mismo punto
+    assert [record.message["n"] for record in queue.read_batch(10)] == [0, 1, 2, 3, 4]
+    queue.close()
+
+
+def test_commit_advances_cursor_and_survives_reopen(tmp_path):
+    queue = SpillQueue(str(tmp_path))
+    for i in range(4):
+        queue.append("images", {"n": i})
+    
+    queue.commit(queue.read_batch(2)[-1].position)
+    assert [record.message["n"] for record in queue.read_batch(10)] == [2, 3]
+    queue.close()
+    
+    reopened = SpillQueue(str(tmp_path))
+    assert reopened.has_pending()
+    assert [record.message["n"] for record in reopened.read_batch(10)] == [2, 3]
+    reopened.close()
+
+
+def test_rotates_segments_and_deletes_consumed_ones(tmp_path):
+    queue = SpillQueue(str(tmp_path), segment_max_bytes=64)
+    for i in range(10):
+        queue.append("images", {"n": i, "padding": "x" * 20})
+    
+    assert len(_segment_files(queue)) > 2
+    records = queue.read_batch(100)
+    assert [record.message["n"] for record in records] == list(range(10))
+    
+    # Confirmar la mitad elimina los segmentos anteriores al cursor
+    segments_before = len(_segment_files(queue))
+    queue.commit(records[5].position)
+    assert len(_segment_files(queue)) < segments_before
+    assert [record.message["n"] for record in queue.read_batch(100)] == list(range(6, 10))
+    
+    # Confirmar todo deja la cola vacía y sin bytes en disco
+    queue.commit(records[-1].position)
+    assert not queue.has_pending()
+    assert queue.read_batch(100) == []
+    assert queue.stats()["bytes"] == 0
+    queue.close()
+
+
+def test_drops_events_when_full(tmp_path):
+    queue = SpillQueue(str(tmp_path), max_total_bytes=100)
+    
+    assert queue.append("images", {"n": 0})
+    stored = [queue.append("images", {"n": i, "padding": "x" * 40}) for i in range(1, 4)]
+    
+    assert not all(stored)
+    assert queue.stats()["dropped"] == stored.count(False)
+    assert queue.stats()["bytes"] <= 100
+    queue.close()
+
+
+def test_adopts_orphaned_slot(tmp_path):
+    crashed = SpillQueue(str(tmp_path))
+    crashed.append("images", {"n": 1})
+    crashed.close()
+    
+    # Un slot tomado no se adopta
+    owner = SpillQueue(str(tmp_path))
+    other = SpillQueue(str(tmp_path))
+    assert owner.slot == crashed.slot
+    assert other.adopt(owner.slot) is None
+    owner.close()
+    
+    assert other.orphan_slots() == [crashed.slot]
+    adopted = other.adopt(crashed.slot)
+    assert [record.message["n"] for record in adopted.read_batch(10)] == [1]
+    adopted.close()
+    other.close()
+
+class FailingFile:
+    """Segmento cuya escritura falla como con el disco lleno."""
+    
+    closed = False
+    
+    def __init__(self, size: int):
+        self.size = size
+    
+    def tell(self):
+        return self.size
+    
+    def write(self, data):
+        raise OSError(28, "No space left on device")
+    
+    def close(self):
+        self.closed = True
+
+
+def test_failed_write_leaves_queue_usable(tmp_path):
+    queue = SpillQueue(str(tmp_path))
+    queue.append("images", {"n": 1})
+    segment_file = queue._write_file
+    queue._write_file = FailingFile(segment_file.tell())
+    
+    try:
+        queue.append("images", {"n": 2})
+    except OSError:
+        pass
+    else:
+        raise AssertionError("se esperaba OSError")
+    segment_file.close()
+    
+    assert queue.append("images", {"n": 3})
+    assert [record.message["n"] for record in queue.read_batch(10)] == [1, 3]
+    queue.close()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.images_collector.domain.models.fetched_image import FetchedImage
+from app.images_collector.domain.models.image import Image
+from app.images_collector.domain.ports.image_repository import InvalidCursorError
+from app.images_collector.infrastructure.repositories.sqlite_image_repository import SQLiteImageRepository
+from app.images_collector.infrastructure.settings.config import settings
+
+
+class StubFetcher:
+    async def fetch(self, url: str) -> FetchedImage:
+        return FetchedImage(content=b"\xff\xd8\xff\xe0", content_type="image/jpeg")
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path / "images.db"))
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path / "storage"))
+    return SQLiteImageRepository(fetcher=StubFetcher())
+
+
+def _insert(db_path: str, image_id: str, created_at: str) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO images (id, url, created_at) VALUES (?, ?, ?)",
+        (image_id, f"https://images.example.com/{image_id}.jpg", created_at)
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_unknown_cursor_is_rejected(repository):
+    _insert(repository.db_path, "a", "2024-01-01T00:00:00.000000+00:00")
+    
+    with pytest.raises(InvalidCursorError):
+        asyncio.run(repository.get_page(10, "missing"))
+    with pytest.raises(InvalidCursorError):
+        asyncio.run(repository.search("images", 10, "missing"))
+
+
+def test_pages_follow_created_at_then_id(repository):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i, image_id in enumerate(["c", "a", "b"]):
+        _insert(repository.db_path, image_id, (base + timedelta(seconds=i // 2)).isoformat(timespec="microseconds"))
+    
+    first = asyncio.run(repository.get_page(2))
+    rest = asyncio.run(repository.get_page(10, first[-1].id))
+    
+    # "b" es la más reciente; "c" y "a" empatan y se ordenan por ID
+    assert [image.id for image in first + rest] == ["b", "c", "a"]
+
+
+def test_legacy_naive_timestamps_are_normalized(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "images.db")
+    monkeypatch.setattr(settings, "sqlite_db_path", db_path)
+    monkeypatch.setattr(settings, "storage_path", str(tmp_path / "storage"))
+    SQLiteImageRepository(fetcher=object())
+    # Mismo instante: a igualdad de fecha el orden lo decide el ID
+    _insert(db_path, "z-legacy", "2024-01-01T12:00:00")
+    _insert(db_path, "a-new", "2024-01-01T12:00:00+00:00")
+    
+    # Al reabrir la base de datos las filas antiguas pasan al formato UTC
+    repository = SQLiteImageRepository(fetcher=object())
+    images = asyncio.run(repository.get_all())
+    
+    assert [image.id for image in images] == ["z-legacy", "a-new"]
+    assert images[0].created_at == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def test_image_version_changes_when_the_image_is_saved_again(repository):
+    image = Image(id="a", url="https://images.example.com/a.jpg", file_name="a.jpg")
+    
+    async def scenario():
+        assert await repository.image_version("a") is None
+        await repository.save(image)
+        first = await repository.image_version("a")
+        await repository.save(image)
+        return first, await repository.image_version("a")
+    
+    first, second = asyncio.run(scenario())
+    assert first is not None
+    assert second != first
\ No newline at end of file